@@ -4,29 +4,36 @@ FastAPI endpoint for ad generation fallback
 Can be deployed as a Supabase Edge Function or standalone API
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional
 import json
 import os
+import re
+import time
 import uuid
 from datetime import datetime
+from email.utils import formatdate
 
 from ad_generator_fallback import generate_ads, detect_business_type
 from export_csv_fix import (
     CampaignExportRequest,
-    CSVExportResponse,
+    StreamingCSVExport,
     export_campaign_to_csv,
-    estimate_export_size
+    estimate_export_size,
+    load_export_report
 )
+from export_executor import get_export_executor
+from export_job_store import EXPORT_PROGRESS_INTERVAL, get_export_job_store, job_progress, summarize_issues
+from export_payloads import PayloadError, parse_campaign_payload
 
 # Threshold for async processing (rows)
 ASYNC_EXPORT_THRESHOLD = 1000
 
-# Storage for async exports (in production, use Redis or database)
-async_exports = {}
+# Block size when sending (part of) a finished export file
+FILE_CHUNK_SIZE = 64 * 1024
 
 app = FastAPI(title="Adiology Ad Generator Fallback API")
 
@@ -95,62 +102,164 @@ async def generate_ads_endpoint(request: AdGenerationRequest):
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "service": "ad_generator_fallback"}
+    return {"status": "healthy", "service": "ad_generator_fallback", "exports": get_export_executor().stats()}
+
+
+@app.on_event("shutdown")
+def shutdown_export_executor():
+    get_export_executor().shutdown()
 
 
 def process_async_export(job_id: str, request: CampaignExportRequest):
-    """Background task to process large CSV exports"""
+    """Background task to process large CSV exports (streamed into the job's result file)"""
+    store = get_export_job_store()
+    path = store.result_path(job_id)
+    part_path = path + '.part'
+    started = time.monotonic()
     try:
-        result = export_campaign_to_csv(request)
-        async_exports[job_id] = {
-            'status': 'completed' if result.success else 'failed',
-            'result': result,
-            'completed_at': datetime.now().isoformat()
-        }
+        export = StreamingCSVExport(request, write_report=False)
+        last_report = started
+        with open(part_path, 'w', encoding='utf-8', newline='') as f:
+            for chunk in export:
+                f.write(chunk)
+                now = time.monotonic()
+                if now - last_report >= EXPORT_PROGRESS_INTERVAL:
+                    store.update(job_id, rows_written=export.row_count, elapsed_s=now - started,
+                                 progress_at=time.time())
+                    last_report = now
+        report = export.report()
+        
+        if report.validation_errors:
+            os.remove(part_path)
+            store.update(
+                job_id,
+                status='failed',
+                error=f'Export failed: {len(report.validation_errors)} validation error(s)',
+                validation_errors=summarize_issues(report.validation_errors),
+                error_count=len(report.validation_errors),
+                completed_at=datetime.now().isoformat()
+            )
+            return
+        
+        os.replace(part_path, path)
+        store.update(
+            job_id,
+            status='completed',
+            filename=report.filename,
+            row_count=report.row_count,
+            rows_written=report.row_count,
+            elapsed_s=time.monotonic() - started,
+            progress_at=time.time(),
+            warning_count=len(report.warnings),
+            size_bytes=os.path.getsize(path),
+            completed_at=datetime.now().isoformat()
+        )
     except Exception as e:
-        async_exports[job_id] = {
-            'status': 'failed',
-            'error': str(e),
-            'completed_at': datetime.now().isoformat()
-        }
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        store.update(
+            job_id,
+            status='failed',
+            error=str(e),
+            completed_at=datetime.now().isoformat()
+        )
+
+
+def start_export_job(job_id: str, request: CampaignExportRequest):
+    """
+    Run process_async_export in a worker process when the job store is shared
+    across processes, otherwise in a thread of this one. A job whose worker
+    dies is marked failed.
+    """
+    store = get_export_job_store()
+    job = get_export_executor().submit_job(process_async_export, job_id, request, processes=store.persistent)
+    
+    def record_crash(future):
+        if future.exception() is not None:
+            store.update(job_id, status='failed', error=str(future.exception()),
+                         completed_at=datetime.now().isoformat())
+    
+    job.add_done_callback(record_crash)
+    return job
 
 
 @app.post("/export-csv")
-async def export_csv_endpoint(request: CampaignExportRequest, background_tasks: BackgroundTasks):
+async def export_csv_endpoint(request: CampaignExportRequest, stream: bool = False):
     """
     Export campaign to Google Ads Editor CSV format with full validation
     For large exports (>1000 rows), processes asynchronously
+
+    With ?stream=true any size is sent immediately as a chunked download;
+    validation results go to the sidecar report at GET /export-csv/report/{export_id}
+    """
+    return await run_campaign_export(request, stream)
+
+
+@app.post("/export-csv/fast")
+async def export_csv_fast_endpoint(http_request: Request, stream: bool = False):
+    """
+    /export-csv for large bodies: decoded off the event loop (orjson when installed)
+    into a slot-backed CampaignPayload instead of the Pydantic model. Ad groups of
+    background jobs are checked as the export reaches them; streamed and small
+    exports answer now, so theirs are all checked first (a bad one is a 422)
+    """
+    body = await http_request.body()
+    executor = get_export_executor()
+    try:
+        request = await executor.run(parse_campaign_payload, body)
+        estimated_rows = await executor.run(estimate_export_size, request)
+        if stream or estimated_rows <= ASYNC_EXPORT_THRESHOLD:
+            await executor.run(request.ad_groups.validate)
+    except PayloadError as e:
+        raise HTTPException(status_code=422, detail=e.errors())
+    return await run_campaign_export(request, stream, estimated_rows)
+
+
+async def run_campaign_export(request, stream: bool = False, estimated_rows: Optional[int] = None):
+    """
+    Shared body of /export-csv and /export-csv/fast (request: CampaignExportRequest
+    or CampaignPayload; estimated_rows when the caller already has it)
     """
     try:
-        # Estimate export size
-        estimated_rows = estimate_export_size(request)
+        if stream:
+            export = StreamingCSVExport(request)
+            return StreamingResponse(
+                iter(export),
+                media_type="text/csv; charset=utf-8",
+                headers={
+                    "Content-Disposition": f'attachment; filename="{export.filename}"',
+                    "X-Export-Id": export.export_id,
+                    "X-Export-Report": f"/export-csv/report/{export.export_id}"
+                }
+            )
+
+        # Estimate export size (walks every ad group: off the event loop)
+        if estimated_rows is None:
+            estimated_rows = await get_export_executor().run(estimate_export_size, request)
         
         # Check if export should be async
         if estimated_rows > ASYNC_EXPORT_THRESHOLD:
             # Generate job ID
             job_id = str(uuid.uuid4())
             
-            # Start background task
-            background_tasks.add_task(process_async_export, job_id, request)
+            # Record the job before the task can update it
+            get_export_job_store().create(job_id, estimated_rows=estimated_rows)
             
-            # Return async response
-            async_exports[job_id] = {
-                'status': 'processing',
-                'estimated_rows': estimated_rows,
-                'started_at': datetime.now().isoformat()
-            }
+            # Start background job
+            start_export_job(job_id, request)
             
             return {
                 "success": True,
                 "async": True,
                 "job_id": job_id,
-                "message": f"Large export detected ({estimated_rows} rows). Processing in background. Check saved campaigns in 2 minutes to download.",
+                "message": f"Large export detected ({estimated_rows} rows). Processing in background; progress and ETA are available from the status URL.",
                 "estimated_rows": estimated_rows,
-                "estimated_time_minutes": 2
+                "status_url": f"/export-csv/{job_id}/status",
+                "download_url": f"/export-csv/{job_id}"
             }
         
-        # Small export - process synchronously
-        result = export_campaign_to_csv(request)
+        # Small export - process in the export thread pool, off the event loop
+        result = await get_export_executor().run(export_campaign_to_csv, request)
         
         # If successful, return CSV file
         if result.success and result.csv_content:
@@ -166,6 +275,8 @@ async def export_csv_endpoint(request: CampaignExportRequest, background_tasks:
         # If validation failed, return JSON with errors
         return result
         
+    except PayloadError as e:
+        raise HTTPException(status_code=422, detail=e.errors())
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -173,39 +284,139 @@ async def export_csv_endpoint(request: CampaignExportRequest, background_tasks:
         )
 
 
-@app.get("/export-csv/{job_id}")
-async def get_async_export(job_id: str):
-    """Get status or result of async CSV export"""
-    if job_id not in async_exports:
+@app.get("/export-csv/report/{export_id}")
+async def get_export_report(export_id: str):
+    """Validation report of a streamed export (available once the stream has ended)"""
+    report = load_export_report(export_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Export report not found")
+    return report
+
+
+def parse_byte_range(range_header: Optional[str], size: int):
+    """
+    (start, end) inclusive for a single `bytes=` range, None to send the whole
+    file (no/unsupported/multi-range header), "unsatisfiable" for a range
+    starting past the end
+    """
+    match = re.fullmatch(r'\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*', range_header or '')
+    if not match or match.group(1) == match.group(2) == '':
+        return None
+    first, last = match.groups()
+    if first == '':
+        # suffix range: the last N bytes
+        length = int(last)
+        return (max(0, size - length), size - 1) if length and size else "unsatisfiable"
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if last and int(last) < start:
+        return None
+    return (start, end) if start < size else "unsatisfiable"
+
+
+def file_range_response(path: str, filename: str, range_header: Optional[str] = None,
+                        if_range: Optional[str] = None, headers: Optional[dict] = None) -> Response:
+    """
+    Finished export file with single-range support (206 / 416) so interrupted
+    downloads can resume; If-Range must match the ETag or Last-Modified date,
+    otherwise the whole file is sent
+    """
+    stat = os.stat(path)
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    last_modified = formatdate(stat.st_mtime, usegmt=True)
+    headers = {**(headers or {}), "Accept-Ranges": "bytes", "ETag": etag, "Last-Modified": last_modified}
+    
+    byte_range = parse_byte_range(range_header, stat.st_size)
+    if if_range is not None and if_range.strip() not in (etag, last_modified):
+        byte_range = None
+    if byte_range is None:
+        return FileResponse(path, media_type="text/csv; charset=utf-8", filename=filename,
+                            headers=headers, stat_result=stat)
+    if byte_range == "unsatisfiable":
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{stat.st_size}"})
+    
+    start, end = byte_range
+    
+    def send_range():
+        with open(path, 'rb') as f:
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                block = f.read(min(FILE_CHUNK_SIZE, remaining))
+                if not block:
+                    break
+                remaining -= len(block)
+                yield block
+    
+    return StreamingResponse(
+        send_range(),
+        status_code=206,
+        media_type="text/csv; charset=utf-8",
+        headers={
+            **headers,
+            "Content-Range": f"bytes {start}-{end}/{stat.st_size}",
+            "Content-Length": str(end - start + 1),
+            "Content-Disposition": f'attachment; filename="{filename}"'
+        }
+    )
+
+
+@app.get("/export-csv/{job_id}/status")
+async def get_async_export_status(job_id: str):
+    """Status of a background export: rows written, rows/sec and ETA from measured throughput"""
+    export_info = get_export_job_store().get(job_id)
+    if export_info is None:
         raise HTTPException(status_code=404, detail="Export job not found")
     
-    export_info = async_exports[job_id]
+    status = {"job_id": job_id, "status": export_info['status'], **job_progress(export_info)}
+    if export_info['status'] == 'completed':
+        status.update(
+            row_count=export_info.get('row_count', 0),
+            size_bytes=export_info.get('size_bytes'),
+            download_url=f"/export-csv/{job_id}"
+        )
+    elif export_info['status'] == 'failed':
+        status.update(error=export_info.get('error', 'Unknown error'),
+                      error_count=export_info.get('error_count', 0))
+    return status
+
+
+@app.get("/export-csv/{job_id}")
+async def get_async_export(job_id: str,
+                           range_header: Optional[str] = Header(None, alias="Range"),
+                           if_range: Optional[str] = Header(None, alias="If-Range")):
+    """Get status or result of async CSV export (the file honours Range requests)"""
+    store = get_export_job_store()
+    export_info = store.get(job_id)
+    if export_info is None:
+        raise HTTPException(status_code=404, detail="Export job not found")
     
     if export_info['status'] == 'processing':
         return {
             "status": "processing",
-            "message": "Export is still being processed. Please check again in a moment."
+            "message": "Export is still being processed. Please check again in a moment.",
+            **job_progress(export_info)
         }
     
     if export_info['status'] == 'failed':
         return {
             "status": "failed",
-            "error": export_info.get('error', 'Unknown error')
+            "error": export_info.get('error', 'Unknown error'),
+            "validation_errors": export_info.get('validation_errors', []),
+            "error_count": export_info.get('error_count', 0)
         }
     
     # Export completed
-    result = export_info['result']
-    if result.success and result.csv_content:
-        return Response(
-            content=result.csv_content,
-            media_type="text/csv; charset=utf-8",
-            headers={
-                "Content-Disposition": f'attachment; filename="{result.filename}"',
-                "Content-Type": "text/csv; charset=utf-8"
-            }
-        )
-    
-    return result
+    path = store.result_path(job_id)
+    if not os.path.exists(path):
+        raise HTTPException(status_code=410, detail="Export file has expired")
+    return file_range_response(
+        path,
+        export_info['filename'],
+        range_header,
+        if_range,
+        headers={"X-Row-Count": str(export_info.get('row_count', 0))}
+    )
 
 
 @app.get("/")
@@ -217,6 +428,11 @@ async def root():
         "endpoints": {
             "POST /generate": "Generate ads for services or products",
             "POST /export-csv": "Export campaign to Google Ads Editor CSV",
+            "POST /export-csv?stream=true": "Stream the CSV in chunks (constant memory)",
+            "POST /export-csv/fast": "Same as /export-csv with fast JSON decoding and lazy validation",
+            "GET /export-csv/{job_id}": "Status or file of a background export (supports Range)",
+            "GET /export-csv/{job_id}/status": "Progress, rows/sec and ETA of a background export",
+            "GET /export-csv/report/{export_id}": "Validation report of a streamed export",
             "GET /health": "Health check"
         }
     }
@@ -5,12 +5,17 @@ Generates proper Google Ads for services and products when main generation fails
 """
 
 import json
+import os
 import re
 import sys
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 from urllib.parse import urlparse, urljoin
 import random
 
+KEYWORD_CACHE_SIZE = int(os.environ.get('AD_KEYWORD_CACHE_SIZE', '8192'))  # normalized keyword forms
+AD_COPY_CACHE_SIZE = int(os.environ.get('AD_COPY_CACHE_SIZE', '16384'))  # rendered headline/description sets
+
 # ============================================================================
 # BUSINESS TYPE DETECTION
 # ============================================================================
@@ -111,9 +116,7 @@ def clean_keyword(keyword: str) -> str:
 
 def format_dki_keyword(keyword: str) -> str:
     """Format keyword for DKI: {KeyWord:Default Text}"""
-    cleaned = clean_keyword(keyword)
-    title_cased = to_title_case(cleaned)
-    return f"{{KeyWord:{title_cased}}}"
+    return normalize_keyword(keyword)[2]
 
 
 def truncate_text(text: str, max_length: int) -> str:
@@ -128,237 +131,283 @@ def truncate_text(text: str, max_length: int) -> str:
     return truncated + '...'
 
 
+# ============================================================================
+# COMPILED TEMPLATES
+# ============================================================================
+
+# Template slots: {kw} title-cased keyword, {dki} {KeyWord:...} form of it,
+# {name} business name, {location}, {in_location} " in <location>" or ""
+_SLOT_PATTERN = re.compile(r'\{(kw|dki|name|location|in_location)\}')
+
+
+class Template:
+    """Ad copy template split once into literal and slot parts"""
+
+    __slots__ = ('parts', 'slots')
+
+    def __init__(self, text: str):
+        # re.split with one group alternates literal, slot, literal, ...
+        pieces = _SLOT_PATTERN.split(text)
+        self.parts = pieces
+        self.slots = pieces[1::2]
+
+    def render(self, values: Dict[str, str]) -> str:
+        parts = self.parts[:]
+        parts[1::2] = [values[slot] for slot in self.slots]
+        return ''.join(parts)
+
+
+class TemplateSet:
+    """
+    Headlines or descriptions for one business type: sections of templates,
+    each rendered only when its required field (business_name / location) is
+    set, then truncated to `max_length`, deduplicated, and kept when at least
+    `min_length` long, up to `limit` entries.
+    """
+
+    def __init__(self, max_length: int, min_length: int, limit: int, sections: List[Tuple[Optional[str], List[str]]]):
+        self.max_length = max_length
+        self.min_length = min_length
+        self.limit = limit
+        self.sections = [(required, [Template(text) for text in texts]) for required, texts in sections]
+        slots = {slot for _, templates in self.sections for template in templates for slot in template.slots}
+        required = {required for required, _ in sections}
+        self.uses_name = 'name' in slots or 'business_name' in required
+        self.uses_location = bool(slots & {'location', 'in_location'}) or 'location' in required
+
+    def cached(self, keyword: str, business_name: str = '', location: str = '') -> Tuple[str, ...]:
+        """Cached render; fields the set doesn't use are left out of the cache key"""
+        return _render_copy(self, keyword, business_name if self.uses_name else '', location if self.uses_location else '')
+
+    def render(self, keyword: str, business_name: str = '', location: str = '') -> Tuple[str, ...]:
+        _, title_kw, dki_kw = normalize_keyword(keyword)
+        values = {
+            'kw': title_kw,
+            'dki': dki_kw,
+            'name': business_name,
+            'location': location,
+            'in_location': f' in {location}' if location else '',
+        }
+        present = {'business_name': business_name, 'location': location}
+        unique = []
+        seen = set()
+        for required, templates in self.sections:
+            if required and not present[required]:
+                continue
+            for template in templates:
+                truncated = truncate_text(template.render(values), self.max_length)
+                if truncated not in seen and len(truncated) >= self.min_length:
+                    unique.append(truncated)
+                    seen.add(truncated)
+        return tuple(unique[:self.limit])
+
+
+@lru_cache(maxsize=KEYWORD_CACHE_SIZE)
+def normalize_keyword(keyword: str) -> Tuple[str, str, str]:
+    """(cleaned, title-cased, DKI) forms of a keyword: clean_keyword, to_title_case of that, format_dki_keyword"""
+    clean_kw = clean_keyword(keyword)
+    title_kw = to_title_case(clean_kw)
+    return clean_kw, title_kw, f"{{KeyWord:{title_kw}}}"
+
+
 # ============================================================================
 # SERVICE AD GENERATION
 # ============================================================================
 
+SERVICE_HEADLINES = TemplateSet(30, 10, 15, [
+    (None, [
+        "Professional {kw}",
+        "Expert {kw} Services",
+        "Licensed {kw}",
+        "Trusted {kw} Experts",
+        "Quality {kw} Service",
+        "Affordable {kw}",
+        "Fast {kw} Service",
+        "Reliable {kw}",
+        "Same Day {kw}",
+        "24/7 {kw} Available",
+    ]),
+    ('business_name', [
+        "{name} - {kw}",
+        "{name} Experts",
+    ]),
+    ('location', [
+        "{kw} in {location}",
+        "Local {kw} Near You",
+        "{location} {kw} Pros",
+    ]),
+    # DKI variations
+    (None, [
+        "{dki} - Official Site",
+        "Get {dki} Help",
+        "Book {dki} Now",
+        "Call for {dki}",
+        "Top Rated {dki}",
+    ]),
+])
+
+SERVICE_DESCRIPTIONS = TemplateSet(90, 30, 4, [
+    (None, [
+        "Professional {kw} services you can trust. Licensed, insured & satisfaction guaranteed. Free estimates available.",
+        "Looking for reliable {kw}? We provide fast, affordable services{in_location}. Call now or book online!",
+        "Expert {kw} at fair prices. Our certified technicians deliver quality workmanship. Same-day service available.",
+        "Trusted {kw} professionals{in_location}. From repairs to installations, we handle it all. 5-star rated.",
+        "Get quality {kw} services with licensed professionals. Fast response times. Free quotes. Available 7 days a week.",
+    ]),
+    ('business_name', [
+        "{name}: Your local {kw} experts. Quality service, fair pricing, guaranteed satisfaction. Call today!",
+    ]),
+])
+
+
 def generate_service_headlines(keyword: str, business_name: str = '', location: str = '') -> List[str]:
     """Generate service-focused headlines"""
-    clean_kw = clean_keyword(keyword)
-    title_kw = to_title_case(clean_kw)
-    
-    headlines = [
-        f"Professional {title_kw}",
-        f"Expert {title_kw} Services",
-        f"Licensed {title_kw}",
-        f"Trusted {title_kw} Experts",
-        f"Quality {title_kw} Service",
-        f"Affordable {title_kw}",
-        f"Fast {title_kw} Service",
-        f"Reliable {title_kw}",
-        f"Same Day {title_kw}",
-        f"24/7 {title_kw} Available",
-    ]
-    
-    if business_name:
-        headlines.extend([
-            f"{business_name} - {title_kw}",
-            f"{business_name} Experts",
-        ])
-    
-    if location:
-        headlines.extend([
-            f"{title_kw} in {location}",
-            f"Local {title_kw} Near You",
-            f"{location} {title_kw} Pros",
-        ])
-    
-    # Add DKI variations
-    dki_kw = format_dki_keyword(keyword)
-    headlines.extend([
-        f"{dki_kw} - Official Site",
-        f"Get {dki_kw} Help",
-        f"Book {dki_kw} Now",
-        f"Call for {dki_kw}",
-        f"Top Rated {dki_kw}",
-    ])
-    
-    # Truncate to 30 chars and remove duplicates
-    unique_headlines = []
-    seen = set()
-    for h in headlines:
-        truncated = truncate_text(h, 30)
-        if truncated not in seen and len(truncated) >= 10:
-            unique_headlines.append(truncated)
-            seen.add(truncated)
-    
-    return unique_headlines[:15]
+    return list(SERVICE_HEADLINES.cached(keyword, business_name, location))
 
 
 def generate_service_descriptions(keyword: str, business_name: str = '', location: str = '', base_url: str = '') -> List[str]:
     """Generate service-focused descriptions"""
-    clean_kw = clean_keyword(keyword)
-    title_kw = to_title_case(clean_kw)
-    
-    descriptions = [
-        f"Professional {title_kw} services you can trust. Licensed, insured & satisfaction guaranteed. Free estimates available.",
-        f"Looking for reliable {title_kw}? We provide fast, affordable services{f' in {location}' if location else ''}. Call now or book online!",
-        f"Expert {title_kw} at fair prices. Our certified technicians deliver quality workmanship. Same-day service available.",
-        f"Trusted {title_kw} professionals{f' in {location}' if location else ''}. From repairs to installations, we handle it all. 5-star rated.",
-        f"Get quality {title_kw} services with licensed professionals. Fast response times. Free quotes. Available 7 days a week.",
-    ]
-    
-    if business_name:
-        descriptions.append(
-            f"{business_name}: Your local {title_kw} experts. Quality service, fair pricing, guaranteed satisfaction. Call today!"
-        )
-    
-    # Truncate to 90 chars
-    unique_descriptions = []
-    seen = set()
-    for d in descriptions:
-        truncated = truncate_text(d, 90)
-        if truncated not in seen and len(truncated) >= 30:
-            unique_descriptions.append(truncated)
-            seen.add(truncated)
-    
-    return unique_descriptions[:4]
+    return list(SERVICE_DESCRIPTIONS.cached(keyword, business_name, location))
 
 
 # ============================================================================
 # PRODUCT AD GENERATION
 # ============================================================================
 
+PRODUCT_HEADLINES = TemplateSet(30, 10, 15, [
+    (None, [
+        "Shop {kw} Deals",
+        "Buy {kw} Online",
+        "{kw} - Best Prices",
+        "{kw} Sale - Save Now",
+        "Quality {kw} Products",
+        "Top Rated {kw}",
+        "Official {kw} Store",
+        "Genuine {kw} Products",
+        "Free Shipping on {kw}",
+        "{kw} - Next Day Delivery",
+    ]),
+    ('business_name', [
+        "{name} - {kw}",
+        "Shop {kw} at {name}",
+    ]),
+    # DKI variations
+    (None, [
+        "Buy {dki} Online",
+        "Shop {dki} Deals",
+        "{dki} - Best Prices",
+        "Order {dki} Today",
+        "Get {dki} Now",
+    ]),
+])
+
+PRODUCT_DESCRIPTIONS = TemplateSet(90, 30, 4, [
+    (None, [
+        "Shop {kw} at unbeatable prices. Best prices guaranteed. Free shipping on orders over $50. Easy returns. Buy with confidence!",
+        "Looking for {kw}? Browse our huge selection at competitive prices. Customer reviews, fast delivery & hassle-free returns.",
+        "Get the best {kw} deals online. Quality products, verified sellers, secure checkout. Order now & save up to 30%!",
+        "{kw} - Your trusted destination. Compare models, read reviews & find the perfect fit. Price match guarantee available.",
+        "Quality {kw} with fast shipping and easy returns. Shop our latest collection. Secure checkout. Order today!",
+    ]),
+    ('business_name', [
+        "{name} - Your trusted {kw} store. Quality products, verified sellers, secure checkout. Shop now!",
+    ]),
+])
+
+
 def generate_product_headlines(keyword: str, business_name: str = '') -> List[str]:
     """Generate product-focused headlines"""
-    clean_kw = clean_keyword(keyword)
-    title_kw = to_title_case(clean_kw)
-    
-    headlines = [
-        f"Shop {title_kw} Deals",
-        f"Buy {title_kw} Online",
-        f"{title_kw} - Best Prices",
-        f"{title_kw} Sale - Save Now",
-        f"Quality {title_kw} Products",
-        f"Top Rated {title_kw}",
-        f"Official {title_kw} Store",
-        f"Genuine {title_kw} Products",
-        f"Free Shipping on {title_kw}",
-        f"{title_kw} - Next Day Delivery",
-    ]
-    
-    if business_name:
-        headlines.extend([
-            f"{business_name} - {title_kw}",
-            f"Shop {title_kw} at {business_name}",
-        ])
-    
-    # Add DKI variations
-    dki_kw = format_dki_keyword(keyword)
-    headlines.extend([
-        f"Buy {dki_kw} Online",
-        f"Shop {dki_kw} Deals",
-        f"{dki_kw} - Best Prices",
-        f"Order {dki_kw} Today",
-        f"Get {dki_kw} Now",
-    ])
-    
-    # Truncate to 30 chars and remove duplicates
-    unique_headlines = []
-    seen = set()
-    for h in headlines:
-        truncated = truncate_text(h, 30)
-        if truncated not in seen and len(truncated) >= 10:
-            unique_headlines.append(truncated)
-            seen.add(truncated)
-    
-    return unique_headlines[:15]
+    return list(PRODUCT_HEADLINES.cached(keyword, business_name))
 
 
 def generate_product_descriptions(keyword: str, business_name: str = '', base_url: str = '') -> List[str]:
     """Generate product-focused descriptions"""
-    clean_kw = clean_keyword(keyword)
-    title_kw = to_title_case(clean_kw)
-    
-    descriptions = [
-        f"Shop {title_kw} at unbeatable prices. Best prices guaranteed. Free shipping on orders over $50. Easy returns. Buy with confidence!",
-        f"Looking for {title_kw}? Browse our huge selection at competitive prices. Customer reviews, fast delivery & hassle-free returns.",
-        f"Get the best {title_kw} deals online. Quality products, verified sellers, secure checkout. Order now & save up to 30%!",
-        f"{title_kw} - Your trusted destination. Compare models, read reviews & find the perfect fit. Price match guarantee available.",
-        f"Quality {title_kw} with fast shipping and easy returns. Shop our latest collection. Secure checkout. Order today!",
-    ]
-    
-    if business_name:
-        descriptions.append(
-            f"{business_name} - Your trusted {title_kw} store. Quality products, verified sellers, secure checkout. Shop now!"
-        )
-    
-    # Truncate to 90 chars
-    unique_descriptions = []
-    seen = set()
-    for d in descriptions:
-        truncated = truncate_text(d, 90)
-        if truncated not in seen and len(truncated) >= 30:
-            unique_descriptions.append(truncated)
-            seen.add(truncated)
-    
-    return unique_descriptions[:4]
+    return list(PRODUCT_DESCRIPTIONS.cached(keyword, business_name))
 
 
 # ============================================================================
 # EMERGENCY AD GENERATION
 # ============================================================================
 
+EMERGENCY_HEADLINES = TemplateSet(30, 10, 15, [
+    (None, [
+        "24/7 Emergency {kw}",
+        "{kw} - Open Now",
+        "Urgent {kw} Help",
+        "Fast {kw} Response",
+        "{kw} in 30 Minutes",
+        "Same Hour {kw}",
+        "Emergency {kw} Fix",
+        "Immediate {kw} Help",
+        "Licensed Emergency {kw}",
+        "Trusted 24/7 {kw}",
+    ]),
+    # DKI variations
+    (None, [
+        "Emergency {dki} Help",
+        "24/7 {dki} Available",
+        "Call Now for {dki}",
+    ]),
+])
+
+EMERGENCY_DESCRIPTIONS = TemplateSet(90, 30, 4, [
+    (None, [
+        "{kw} emergency? We're here 24/7! Rapid response for all urgent issues. Call now - we're on our way!",
+        "Don't panic! Our emergency {kw} team is available around the clock. Fast arrival, expert repairs, fair pricing.",
+        "24/7 emergency {kw} services{in_location}. We respond in 30 minutes or less. Call now!",
+        "{kw} emergency? Licensed professionals ready to solve your crisis day or night. No extra fees!",
+    ]),
+])
+
+
 def generate_emergency_headlines(keyword: str, business_name: str = '') -> List[str]:
     """Generate emergency-focused headlines"""
-    clean_kw = clean_keyword(keyword)
-    title_kw = to_title_case(clean_kw)
-    
-    headlines = [
-        f"24/7 Emergency {title_kw}",
-        f"{title_kw} - Open Now",
-        f"Urgent {title_kw} Help",
-        f"Fast {title_kw} Response",
-        f"{title_kw} in 30 Minutes",
-        f"Same Hour {title_kw}",
-        f"Emergency {title_kw} Fix",
-        f"Immediate {title_kw} Help",
-        f"Licensed Emergency {title_kw}",
-        f"Trusted 24/7 {title_kw}",
-    ]
-    
-    # Add DKI variations
-    dki_kw = format_dki_keyword(keyword)
-    headlines.extend([
-        f"Emergency {dki_kw} Help",
-        f"24/7 {dki_kw} Available",
-        f"Call Now for {dki_kw}",
-    ])
-    
-    # Truncate to 30 chars
-    unique_headlines = []
-    seen = set()
-    for h in headlines:
-        truncated = truncate_text(h, 30)
-        if truncated not in seen and len(truncated) >= 10:
-            unique_headlines.append(truncated)
-            seen.add(truncated)
-    
-    return unique_headlines[:15]
+    return list(EMERGENCY_HEADLINES.cached(keyword, business_name))
 
 
 def generate_emergency_descriptions(keyword: str, business_name: str = '', location: str = '') -> List[str]:
     """Generate emergency-focused descriptions"""
-    clean_kw = clean_keyword(keyword)
-    title_kw = to_title_case(clean_kw)
-    
-    descriptions = [
-        f"{title_kw} emergency? We're here 24/7! Rapid response for all urgent issues. Call now - we're on our way!",
-        f"Don't panic! Our emergency {title_kw} team is available around the clock. Fast arrival, expert repairs, fair pricing.",
-        f"24/7 emergency {title_kw} services{f' in {location}' if location else ''}. We respond in 30 minutes or less. Call now!",
-        f"{title_kw} emergency? Licensed professionals ready to solve your crisis day or night. No extra fees!",
-    ]
-    
-    # Truncate to 90 chars
-    unique_descriptions = []
-    seen = set()
-    for d in descriptions:
-        truncated = truncate_text(d, 90)
-        if truncated not in seen and len(truncated) >= 30:
-            unique_descriptions.append(truncated)
-            seen.add(truncated)
-    
-    return unique_descriptions[:4]
+    return list(EMERGENCY_DESCRIPTIONS.cached(keyword, business_name, location))
+
+
+# ============================================================================
+# AD COPY CACHE
+# ============================================================================
+
+# (headlines, descriptions) template sets per business type ('local' uses service copy)
+AD_COPY_TEMPLATES = {
+    'product': (PRODUCT_HEADLINES, PRODUCT_DESCRIPTIONS),
+    'emergency': (EMERGENCY_HEADLINES, EMERGENCY_DESCRIPTIONS),
+    'service': (SERVICE_HEADLINES, SERVICE_DESCRIPTIONS),
+}
+
+
+@lru_cache(maxsize=AD_COPY_CACHE_SIZE)
+def _render_copy(templates: TemplateSet, keyword: str, business_name: str, location: str) -> Tuple[str, ...]:
+    # Cached renders are tuples; the generate_* functions hand out list copies
+    return templates.render(keyword, business_name, location)
+
+
+@lru_cache(maxsize=AD_COPY_CACHE_SIZE)
+def ad_copy(keyword: str, business_type: str, business_name: str = '', location: str = '') -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    (headlines, descriptions) for a keyword, cached per (keyword, business_type,
+    business_name, location). Same copy as the generate_*_headlines /
+    generate_*_descriptions pair for the type; tuples, so cached sets can't be
+    modified by callers.
+    """
+    headlines, descriptions = AD_COPY_TEMPLATES.get(business_type, AD_COPY_TEMPLATES['service'])
+    return (
+        headlines.cached(keyword, business_name, location),
+        descriptions.cached(keyword, business_name, location),
+    )
+
+
+def clear_ad_copy_caches() -> None:
+    """Drop cached keyword forms and rendered copy (e.g. after changing templates)"""
+    normalize_keyword.cache_clear()
+    _render_copy.cache_clear()
+    ad_copy.cache_clear()
 
 
 # ============================================================================
@@ -372,7 +421,7 @@ def generate_final_url(base_url: str, keyword: str) -> str:
     
     try:
         parsed = urlparse(base_url)
-        clean_kw = clean_keyword(keyword).lower().replace(' ', '-')
+        clean_kw = normalize_keyword(keyword)[0].lower().replace(' ', '-')
         # Remove special characters
         clean_kw = re.sub(r'[^a-z0-9\-]', '', clean_kw)
         
@@ -392,7 +441,7 @@ def generate_final_url(base_url: str, keyword: str) -> str:
 
 def generate_display_paths(keyword: str, business_type: str) -> Tuple[str, str]:
     """Generate display URL paths (max 15 chars each)"""
-    clean_kw = clean_keyword(keyword).lower()
+    clean_kw = normalize_keyword(keyword)[0].lower()
     
     if business_type == 'product':
         paths = [
@@ -464,16 +513,8 @@ def generate_ads(
         # Select keyword for this ad (cycle through if multiple)
         keyword = keywords[i % len(keywords)]
         
-        # Generate headlines and descriptions based on type
-        if business_type == 'product':
-            headlines = generate_product_headlines(keyword, business_name)
-            descriptions = generate_product_descriptions(keyword, business_name, base_url)
-        elif business_type == 'emergency':
-            headlines = generate_emergency_headlines(keyword, business_name)
-            descriptions = generate_emergency_descriptions(keyword, business_name, location)
-        else:  # service or local
-            headlines = generate_service_headlines(keyword, business_name, location)
-            descriptions = generate_service_descriptions(keyword, business_name, location, base_url)
+        # Headlines and descriptions based on type (cached per keyword, read only)
+        headlines, descriptions = ad_copy(keyword, business_type, business_name, location)
         
         # Generate URLs
         final_url = generate_final_url(base_url, keyword)
@@ -17,15 +17,24 @@ import os
 import re
 import time
 import json
+import heapq
+import sqlite3
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from difflib import SequenceMatcher
+from functools import lru_cache
 from urllib.parse import quote_plus
-from typing import List, Optional
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from typing import Callable, Dict, FrozenSet, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+import redis
+from fastapi import FastAPI, HTTPException, Header
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from fastapi.responses import JSONResponse, StreamingResponse
-from celery import Celery
+from celery import Celery, chord, group
 from celery.result import AsyncResult
 
 # ------------ CONFIG -------------
@@ -33,6 +42,31 @@ REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
 CELERY_BROKER_URL = REDIS_URL
 CELERY_RESULT_BACKEND = REDIS_URL
 
+# Autocomplete fan-out: concurrency, pacing and per-request timeout
+SUGGEST_URL = os.environ.get("SUGGEST_URL", "https://suggestqueries.google.com/complete/search")
+AUTOCOMPLETE_CONCURRENCY = int(os.environ.get("AUTOCOMPLETE_CONCURRENCY", "16"))
+AUTOCOMPLETE_RATE = float(os.environ.get("AUTOCOMPLETE_RATE", "20"))  # requests/sec, <= 0 disables pacing
+AUTOCOMPLETE_BURST = int(os.environ.get("AUTOCOMPLETE_BURST", "40"))
+AUTOCOMPLETE_TIMEOUT = float(os.environ.get("AUTOCOMPLETE_TIMEOUT", "6"))
+AUTOCOMPLETE_POOL_SIZE = int(os.environ.get("AUTOCOMPLETE_POOL_SIZE", "32"))  # keep-alive connections per host
+AUTOCOMPLETE_RETRIES = int(os.environ.get("AUTOCOMPLETE_RETRIES", "2"))
+AUTOCOMPLETE_BACKOFF = float(os.environ.get("AUTOCOMPLETE_BACKOFF", "0.2"))  # seconds, doubled per retry
+
+# Autocomplete response cache: in-process LRU + optional SQLite tier shared by workers on a host
+AUTOCOMPLETE_CACHE_TTL = float(os.environ.get("AUTOCOMPLETE_CACHE_TTL", "21600"))  # seconds
+AUTOCOMPLETE_CACHE_SIZE = int(os.environ.get("AUTOCOMPLETE_CACHE_SIZE", "50000"))  # entries, 0 disables
+AUTOCOMPLETE_CACHE_PATH = os.environ.get("AUTOCOMPLETE_CACHE_PATH")  # e.g. /var/cache/adiology/suggest.db
+AUTOCOMPLETE_CACHE_DISK_SIZE = int(os.environ.get("AUTOCOMPLETE_CACHE_DISK_SIZE", "1000000"))
+
+# depth="deep": recursive expansion of the best suggestions (seed -> suggestion -> suggestion + a..z)
+DEEP_REQUEST_BUDGET = int(os.environ.get("DEEP_REQUEST_BUDGET", "300"))  # suggest calls per job
+DEEP_MAX_DEPTH = int(os.environ.get("DEEP_MAX_DEPTH", "2"))  # prefixes at depth < this are expanded; seed is 0
+DEEP_WAVE_SIZE = int(os.environ.get("DEEP_WAVE_SIZE", "4"))  # prefixes expanded concurrently per wave
+
+# Incremental keyword results: Redis stream per job, consumed by the SSE endpoint
+KEYWORD_STREAM_TTL = int(os.environ.get("KEYWORD_STREAM_TTL", "3600"))  # seconds
+KEYWORD_STREAM_TIMEOUT = float(os.environ.get("KEYWORD_STREAM_TIMEOUT", "300"))  # max SSE connection time
+
 # path to uploaded screenshot (user-supplied file)
 SCREENSHOT_PATH = "/mnt/data/Screenshot 2025-11-24 at 9.13.41 AM.png"
 
@@ -80,6 +114,22 @@ class KeywordRequest(BaseModel):
     commercial_mods_count: Optional[int] = 12
     match_types: Optional[List[str]] = ["broad", "phrase", "exact"]
     negative_keywords: Optional[List[str]] = []
+    negative_match: Optional[str] = "substring"  # substring | google
+    request_budget: Optional[int] = None  # depth="deep": max upstream suggest calls
+
+class BatchKeywordRequest(BaseModel):
+    seeds: List[str]
+    geo: Optional[str] = None
+    depth: Optional[str] = "medium"
+    max_results: Optional[int] = 200  # per seed, and for the merged view
+    include_related: Optional[bool] = True
+    commercial_mods_count: Optional[int] = 12
+    negative_keywords: Optional[List[str]] = []
+    negative_match: Optional[str] = "substring"
+    request_budget: Optional[int] = None  # depth="deep": max upstream suggest calls per seed
+    chunk_size: Optional[int] = 10  # seeds per Celery task
+
+MAX_BATCH_SEEDS = int(os.environ.get("MAX_BATCH_SEEDS", "500"))
 
 # ------------- Generation logic (adapted & compact) -------------
 HEADERS = {
@@ -100,32 +150,267 @@ INTENT_PATTERNS = {
     "purchase": ["buy", "price", "cost", "deal", "discount", "offer"]
 }
 
-def fetch_google_autocomplete(seed: str, geo: Optional[str] = None) -> List[str]:
+class TokenBucket:
+    """
+    Thread-safe token bucket that paces outbound suggest requests.
+    Allows bursts of up to `capacity` requests, refilled at `rate` tokens/sec.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = float(rate)
+        self.capacity = max(1, int(capacity))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self) -> float:
+        """Take a token if one is available; otherwise return seconds until the next one."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self) -> None:
+        wait = self._take()
+        while wait > 0:
+            time.sleep(wait)
+            wait = self._take()
+
+# shared by every fetch in this process (replaces the old fixed sleeps)
+suggest_rate_limiter = TokenBucket(AUTOCOMPLETE_RATE, AUTOCOMPLETE_BURST)
+
+class AutocompleteCache:
+    """
+    (query, geo) -> suggestions cache in front of the suggest endpoint.
+
+    Tier 1 is an in-process LRU bounded by `max_entries`. Tier 2 is an optional
+    SQLite file (`path`) so Celery workers on the same host share results; it is
+    bounded by `max_disk_entries`, oldest-expiring rows evicted first.
+    Entries expire after `ttl` seconds in both tiers.
+    """
+
+    _PRUNE_EVERY = 256
+
+    def __init__(self, ttl: float, max_entries: int, path: Optional[str] = None,
+                 max_disk_entries: int = 1000000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.path = path
+        self.max_disk_entries = max_disk_entries
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._mem: "OrderedDict[Tuple[str, str], Tuple[float, Tuple[str, ...]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._db_pid = None
+        self._writes = 0
+
+    def _conn(self):
+        # reopen after fork: Celery prefork children must not share the parent's handle
+        if self._db is None or self._db_pid != os.getpid():
+            db = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS autocomplete_cache ("
+                " query TEXT NOT NULL, geo TEXT NOT NULL, suggestions TEXT NOT NULL,"
+                " expires_at REAL NOT NULL, PRIMARY KEY (query, geo))"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS autocomplete_cache_expiry ON autocomplete_cache (expires_at)")
+            db.commit()
+            self._db, self._db_pid = db, os.getpid()
+        return self._db
+
+    def _remember(self, key, expires_at: float, suggestions: Tuple[str, ...]) -> None:
+        if self.max_entries <= 0:
+            return
+        self._mem[key] = (expires_at, suggestions)
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_entries:
+            self._mem.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, query: str, geo: Optional[str] = None) -> Optional[List[str]]:
+        key = (query, geo or "")
+        now = time.time()
+        with self._lock:
+            entry = self._mem.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._mem.move_to_end(key)
+                    self.hits += 1
+                    return list(entry[1])
+                del self._mem[key]
+            if self.path:
+                row = self._conn().execute(
+                    "SELECT suggestions, expires_at FROM autocomplete_cache WHERE query = ? AND geo = ?", key
+                ).fetchone()
+                if row and row[1] > now:
+                    suggestions = tuple(json.loads(row[0]))
+                    self._remember(key, row[1], suggestions)
+                    self.disk_hits += 1
+                    return list(suggestions)
+            self.misses += 1
+            return None
+
+    def set(self, query: str, geo: Optional[str], suggestions: List[str]) -> None:
+        key = (query, geo or "")
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._remember(key, expires_at, tuple(suggestions))
+            if self.path:
+                db = self._conn()
+                db.execute(
+                    "INSERT OR REPLACE INTO autocomplete_cache (query, geo, suggestions, expires_at) VALUES (?, ?, ?, ?)",
+                    (key[0], key[1], json.dumps(list(suggestions)), expires_at),
+                )
+                self._writes += 1
+                if self._writes % self._PRUNE_EVERY == 0:
+                    self._prune_disk(db)
+                db.commit()
+
+    def _prune_disk(self, db) -> None:
+        db.execute("DELETE FROM autocomplete_cache WHERE expires_at <= ?", (time.time(),))
+        (count,) = db.execute("SELECT COUNT(*) FROM autocomplete_cache").fetchone()
+        excess = count - self.max_disk_entries
+        if excess > 0:
+            db.execute(
+                "DELETE FROM autocomplete_cache WHERE rowid IN "
+                "(SELECT rowid FROM autocomplete_cache ORDER BY expires_at LIMIT ?)", (excess,)
+            )
+            self.evictions += excess
+
+    def clear(self) -> None:
+        with self._lock:
+            self._mem.clear()
+            if self.path:
+                db = self._conn()
+                db.execute("DELETE FROM autocomplete_cache")
+                db.commit()
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._mem),
+                "disk": bool(self.path),
+            }
+
+autocomplete_cache = AutocompleteCache(
+    ttl=AUTOCOMPLETE_CACHE_TTL,
+    max_entries=AUTOCOMPLETE_CACHE_SIZE,
+    path=AUTOCOMPLETE_CACHE_PATH,
+    max_disk_entries=AUTOCOMPLETE_CACHE_DISK_SIZE,
+)
+
+# Connection pools are per process: Celery tasks in one worker reuse them,
+# prefork children build their own instead of sharing sockets with the parent.
+_suggest_session = None
+_suggest_session_pid = None
+_session_lock = threading.Lock()
+
+def _suggest_retry() -> Retry:
+    return Retry(
+        total=AUTOCOMPLETE_RETRIES,
+        read=0,  # a read timeout already spent the per-request budget; don't retry it
+        backoff_factor=AUTOCOMPLETE_BACKOFF,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False,
+    )
+
+def get_suggest_session() -> requests.Session:
+    """Keep-alive requests.Session with a bounded pool and retry/backoff for suggest calls."""
+    global _suggest_session, _suggest_session_pid
+    with _session_lock:
+        if _suggest_session is None or _suggest_session_pid != os.getpid():
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=AUTOCOMPLETE_POOL_SIZE,
+                                  max_retries=_suggest_retry())
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update(HEADERS)
+            _suggest_session, _suggest_session_pid = session, os.getpid()
+        return _suggest_session
+
+def _suggest_url(query: str, geo: Optional[str]) -> str:
+    url = f"{SUGGEST_URL}?client=firefox&q={quote_plus(query)}"
+    if geo:
+        url += f"&gl={geo}"
+    return url
+
+def _parse_suggestions(data) -> List[str]:
+    suggestions = data[1] if isinstance(data, list) and len(data) > 1 else []
+    return [s for s in suggestions if isinstance(s, str)]
+
+def _request_suggestions(query: str, geo: Optional[str], timeout: Optional[float]) -> List[str]:
+    """Single uncached request to the suggest endpoint. Raises on network/HTTP errors."""
+    suggest_rate_limiter.acquire()
+    resp = get_suggest_session().get(_suggest_url(query, geo), timeout=timeout or AUTOCOMPLETE_TIMEOUT)
+    resp.raise_for_status()
+    return _parse_suggestions(resp.json())
+
+def fetch_google_autocomplete(seed: str, geo: Optional[str] = None,
+                              timeout: Optional[float] = None) -> List[str]:
     """
     Uses Google's public suggestqueries endpoint for simple autocomplete.
     This is best-effort; in prod replace with a paid SERP API for reliability.
+    Answers are cached per (query, geo); failures are not cached.
     """
+    cached = autocomplete_cache.get(seed, geo)
+    if cached is not None:
+        return cached
     try:
-        q = quote_plus(seed)
-        url = f"https://suggestqueries.google.com/complete/search?client=firefox&q={q}"
-        if geo:
-            url += f"&gl={geo}"
-        resp = requests.get(url, headers=HEADERS, timeout=6)
-        resp.raise_for_status()
-        data = resp.json()
-        suggestions = data[1] if isinstance(data, list) and len(data) > 1 else []
-        return [s for s in suggestions if isinstance(s, str)]
+        suggestions = _request_suggestions(seed, geo, timeout)
     except Exception:
         return []
+    autocomplete_cache.set(seed, geo, suggestions)
+    return suggestions
+
+def iter_autocomplete_many(queries: Iterable[str], geo: Optional[str] = None,
+                           concurrency: Optional[int] = None,
+                           timeout: Optional[float] = None) -> Iterator[Tuple[str, List[str]]]:
+    """
+    Fan out autocomplete lookups over a bounded thread pool.
+    Yields (query, suggestions) pairs in completion order; duplicate queries are fetched once.
+    """
+    queries = list(dict.fromkeys(queries))
+    if not queries:
+        return
+    workers = max(1, min(concurrency or AUTOCOMPLETE_CONCURRENCY, len(queries)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(fetch_google_autocomplete, q, geo, timeout): q for q in queries}
+        for fut in as_completed(futures):
+            yield futures[fut], fut.result()
 
-def a_to_z_expansion(seed: str, geo: Optional[str]=None, letters: str="abcdefghijklmnopqrstuvwxyz0123456789"):
+def fetch_autocomplete_many(queries: Iterable[str], geo: Optional[str] = None,
+                            concurrency: Optional[int] = None,
+                            timeout: Optional[float] = None) -> Dict[str, List[str]]:
+    """Concurrent autocomplete for many queries. Returns {query: suggestions} in input order."""
+    queries = list(dict.fromkeys(queries))
+    found = dict(iter_autocomplete_many(queries, geo, concurrency, timeout))
+    return {q: found[q] for q in queries}
+
+A2Z_LETTERS = "abcdefghijklmnopqrstuvwxyz0123456789"
+
+def a_to_z_expansion(seed: str, geo: Optional[str]=None, letters: str=A2Z_LETTERS,
+                     concurrency: Optional[int] = None, timeout: Optional[float] = None):
     out = set()
-    for ch in letters:
-        query = f"{seed} {ch}"
-        suggestions = fetch_google_autocomplete(query, geo)
-        for s in suggestions:
-            out.add(s)
-        time.sleep(0.06)  # polite pacing
+    queries = [f"{seed} {ch}" for ch in letters]
+    for _, suggestions in iter_autocomplete_many(queries, geo, concurrency, timeout):
+        out.update(suggestions)
     return list(out)
 
 def normalize_kw(k: str) -> str:
@@ -152,63 +437,488 @@ def heuristic_score(keyword: str, seed: str) -> int:
     score = (base_sim * 0.6 + comm * 0.2 + length_factor * 0.2)
     return int(round(score * 100))
 
+class PatternAutomaton:
+    """
+    Aho-Corasick automaton over a fixed table of (pattern, label) pairs.
+    scan(text) returns the labels of every pattern occurring as a substring of
+    text in a single pass over its characters, independent of the table size.
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, Hashable]]):
+        goto: List[Dict[str, int]] = [{}]
+        out: List[Set[Hashable]] = [set()]
+        self._always: Set[Hashable] = set()  # "" is a substring of everything
+        for pattern, label in patterns:
+            if not pattern:
+                self._always.add(label)
+                continue
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append(set())
+                state = nxt
+            out[state].add(label)
+
+        # failure links, breadth first so shallower states are final before deeper ones use them
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0) if state else 0
+                out[nxt] |= out[fail[nxt]]
+        self._goto = goto
+        self._fail = fail
+        self._out: List[FrozenSet[Hashable]] = [frozenset(o) for o in out]
+
+    def scan(self, text: str) -> Set[Hashable]:
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set(self._always)
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found |= out[state]
+        return found
+
+    def search(self, text: str) -> bool:
+        """True if any pattern occurs in text (stops at the first hit)."""
+        if self._always:
+            return True
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                return True
+        return False
+
+COMMERCIAL_TAG = "__commercial__"
+
+@lru_cache(maxsize=1)
+def keyword_tagger() -> PatternAutomaton:
+    """One automaton for INTENT_PATTERNS and COMMERCIAL_MODIFIERS, built on first use."""
+    table = [(p, name) for name, patterns in INTENT_PATTERNS.items() for p in patterns]
+    table += [(mod, COMMERCIAL_TAG) for mod in COMMERCIAL_MODIFIERS]
+    return PatternAutomaton(table)
+
+def classify_keyword(keyword: str) -> Tuple[List[str], bool]:
+    """Intent tags (INTENT_PATTERNS order, or ["general"]) and commercial flag in one pass."""
+    labels = keyword_tagger().scan(keyword.lower())
+    tags = [name for name in INTENT_PATTERNS if name in labels]
+    return tags or ["general"], COMMERCIAL_TAG in labels
+
+class SeedScorer:
+    """
+    Batch heuristic_score for one seed. Scores are identical to heuristic_score.
+
+    SequenceMatcher(None, keyword, seed).ratio() is recomputed with a kernel
+    specialised for this case: the seed's char -> positions index is built once,
+    there is no junk (difflib only auto-junks sequences of 200+ chars, which fall
+    back to difflib here), and only the matched-character total is tracked
+    instead of building Match blocks. Commercial modifiers come from keyword_tagger().
+    """
+
+    def __init__(self, seed: str):
+        self.seed = seed.lower()
+        self._seed_len = len(self.seed)
+        self._fallback = self._seed_len >= 200
+        positions: Dict[str, List[int]] = {}
+        for j, ch in enumerate(self.seed):
+            positions.setdefault(ch, []).append(j)
+        self._b2j = {ch: tuple(js) for ch, js in positions.items()}
+
+    def _matched_chars(self, a: str, alo: int = 0, ahi: Optional[int] = None,
+                       blo: int = 0, bhi: Optional[int] = None) -> int:
+        # difflib.get_matching_blocks: longest match (earliest in a, then in b),
+        # then recurse on both sides; the sum of block sizes is all ratio() needs
+        b2j_get = self._b2j.get
+        total = 0
+        stack = [(alo, len(a) if ahi is None else ahi, blo, self._seed_len if bhi is None else bhi)]
+        while stack:
+            alo, ahi, blo, bhi = stack.pop()
+            besti, bestj, bestsize = alo, blo, 0
+            j2len = {}
+            for i in range(alo, ahi):
+                newj2len = {}
+                for j in b2j_get(a[i], ()):
+                    if j < blo:
+                        continue
+                    if j >= bhi:
+                        break
+                    k = newj2len[j] = j2len.get(j - 1, 0) + 1
+                    if k > bestsize:
+                        besti, bestj, bestsize = i - k + 1, j - k + 1, k
+                j2len = newj2len
+            if bestsize:
+                total += bestsize
+                if alo < besti and blo < bestj:
+                    stack.append((alo, besti, blo, bestj))
+                if besti + bestsize < ahi and bestj + bestsize < bhi:
+                    stack.append((besti + bestsize, ahi, bestj + bestsize, bhi))
+        return total
+
+    def similarity(self, k: str) -> float:
+        if self._fallback:
+            return similarity(k, self.seed)
+        length = len(k) + self._seed_len
+        return 2.0 * self._matched_chars(k) / length if length else 1.0
+
+    def score(self, keyword: str) -> int:
+        k = keyword.lower()
+        return self._combine(self.similarity(k), COMMERCIAL_TAG in keyword_tagger().scan(k), k)
+
+    @staticmethod
+    def _combine(base_sim: float, commercial: bool, k: str) -> int:
+        comm = 1.0 if commercial else 0.0
+        words = len(k.split())
+        if words <= 2:
+            length_factor = 0.95
+        elif words <= 4:
+            length_factor = 1.0
+        elif words <= 7:
+            length_factor = 0.9
+        else:
+            length_factor = 0.75
+        score = (base_sim * 0.6 + comm * 0.2 + length_factor * 0.2)
+        return int(round(score * 100))
+
+    def score_many(self, keywords: Iterable[str]) -> List[int]:
+        """
+        score() for many keywords, in input order. Distinct lowercased keywords are
+        visited in sorted order so neighbours share prefixes, and per-prefix state
+        is kept on a stack: the top-level longest-match scan against the seed and
+        the commercial-modifier automaton run once per shared prefix, not once per
+        keyword. The pieces left and right of the longest match are matched
+        against the seed through a memo shared by the whole batch.
+        """
+        lowered = [k.lower() for k in keywords]
+        if self._fallback:
+            return [self.score(k) for k in lowered]
+        tagger = keyword_tagger()
+        goto, fail, out = tagger._goto, tagger._fail, tagger._out
+        commercial_always = COMMERCIAL_TAG in tagger._always
+        b2j_get = self._b2j.get
+        seed_len = self._seed_len
+
+        # stack[i]: state after the first i chars of the current keyword
+        # (j2len, besti, bestj, bestsize, automaton state, commercial modifier seen)
+        stack = [({}, 0, 0, 0, 0, commercial_always)]
+        prev = ""
+
+        # matched chars of a keyword piece against a seed range; pieces recur across keywords
+        sub_memo: Dict[Tuple[str, int, int], int] = {}
+
+        def sub_matched(piece: str, blo: int, bhi: int) -> int:
+            key = (piece, blo, bhi)
+            total = sub_memo.get(key)
+            if total is None:
+                total = sub_memo[key] = self._matched_chars(piece, 0, len(piece), blo, bhi)
+            return total
+        scores: Dict[str, int] = {}
+        for k in sorted(set(lowered)):
+            common = 0
+            limit = min(len(prev), len(k))
+            while common < limit and prev[common] == k[common]:
+                common += 1
+            del stack[common + 1:]
+            j2len, besti, bestj, bestsize, state, commercial = stack[-1]
+            for i in range(common, len(k)):
+                ch = k[i]
+                newj2len = {}
+                for j in b2j_get(ch, ()):
+                    size = newj2len[j] = j2len.get(j - 1, 0) + 1
+                    if size > bestsize:
+                        besti, bestj, bestsize = i - size + 1, j - size + 1, size
+                j2len = newj2len
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(ch, 0)
+                commercial = commercial or COMMERCIAL_TAG in out[state]
+                stack.append((j2len, besti, bestj, bestsize, state, commercial))
+            prev = k
+
+            matched = bestsize
+            if bestsize:
+                if besti and bestj:
+                    matched += sub_matched(k[:besti], 0, bestj)
+                if besti + bestsize < len(k) and bestj + bestsize < seed_len:
+                    matched += sub_matched(k[besti + bestsize:], bestj + bestsize, seed_len)
+            length = len(k) + seed_len
+            base_sim = 2.0 * matched / length if length else 1.0
+            scores[k] = self._combine(base_sim, commercial, k)
+        return [scores[k] for k in lowered]
+
+def score_keywords(keywords: Iterable[str], seed: str) -> List[int]:
+    """heuristic_score for many keywords against one seed, in input order."""
+    return SeedScorer(seed).score_many(keywords)
+
 def detect_intent(keyword: str) -> List[str]:
-    tags = []
-    k = keyword.lower()
-    for name, patterns in INTENT_PATTERNS.items():
-        for p in patterns:
-            if p in k:
-                tags.append(name)
-                break
-    return tags or ["general"]
+    return classify_keyword(keyword)[0]
+
+NEGATIVE_MATCH_MODES = ("substring", "google")
+
+class NegativeKeywordIndex:
+    """
+    Compiled negative keyword matcher, built once and reused across jobs.
+
+    mode="substring" keeps the original behaviour: a candidate is negative when
+    any normalized negative occurs anywhere in it (one Aho-Corasick pass).
+
+    mode="google" applies Google Ads negative semantics on whole words:
+      broad   term     every word of the negative appears in the candidate, any order
+      phrase  "term"   the words appear in the candidate contiguously and in order
+      exact   [term]   the candidate is exactly the negative
+    A leading "-" (Google Ads Editor notation) is accepted and ignored.
+    """
+
+    _END = object()
+
+    def __init__(self, negatives: Iterable[str], mode: str = "substring"):
+        if mode not in NEGATIVE_MATCH_MODES:
+            raise ValueError(f"unknown negative match mode: {mode}")
+        self.mode = mode
+        negatives = [n for n in negatives if n]
+        if mode == "substring":
+            self._automaton = PatternAutomaton((normalize_kw(n), True) for n in negatives)
+            return
+
+        self._exact: Set[str] = set()
+        self._phrase_trie: Dict = {}
+        self._broad: Dict[str, List[FrozenSet[str]]] = {}
+        for raw in negatives:
+            term = raw.strip()
+            if term.startswith("-"):
+                term = term[1:].strip()
+            if len(term) > 1 and term[0] == "[" and term[-1] == "]":
+                self._exact.add(normalize_kw(term[1:-1]))
+            elif len(term) > 1 and term[0] == '"' and term[-1] == '"':
+                words = normalize_kw(term[1:-1]).split()
+                if words:
+                    node = self._phrase_trie
+                    for w in words:
+                        node = node.setdefault(w, {})
+                    node[self._END] = True
+            else:
+                words = frozenset(normalize_kw(term).split())
+                if words:
+                    # keyed on the longest word: usually the most selective one
+                    self._broad.setdefault(max(words, key=len), []).append(words)
+
+    def matches(self, keyword: str) -> bool:
+        """True if the (already normalized) keyword is excluded by any negative."""
+        if self.mode == "substring":
+            return self._automaton.search(keyword)
+        if keyword in self._exact:
+            return True
+        words = keyword.split()
+        if self._broad:
+            present = set(words)
+            for w in present:
+                for neg in self._broad.get(w, ()):
+                    if neg <= present:
+                        return True
+        if self._phrase_trie:
+            for start in range(len(words)):
+                node = self._phrase_trie
+                for w in words[start:]:
+                    node = node.get(w)
+                    if node is None:
+                        break
+                    if self._END in node:
+                        return True
+        return False
+
+    def filter(self, keywords: Iterable[str]) -> Set[str]:
+        matches = self.matches
+        return {k for k in keywords if not matches(k)}
+
+@lru_cache(maxsize=64)
+def _cached_negative_index(negatives: Tuple[str, ...], mode: str) -> NegativeKeywordIndex:
+    return NegativeKeywordIndex(negatives, mode)
+
+def get_negative_index(negative_keywords: Iterable[str], mode: str = "substring") -> NegativeKeywordIndex:
+    """Compiled index for a negative list; identical lists (e.g. one account's jobs) share one build."""
+    return _cached_negative_index(tuple(sorted(set(negative_keywords))), mode)
+
+def deep_expansion(seed: str, geo: Optional[str], scorer: "SeedScorer", budget: int,
+                   max_depth: int = DEEP_MAX_DEPTH, wave_size: int = DEEP_WAVE_SIZE,
+                   negative_index: Optional["NegativeKeywordIndex"] = None,
+                   on_suggestions: Optional[Callable[[List[str]], None]] = None) -> Dict:
+    """
+    Long-tail discovery: expand the seed (direct + A-Z), then keep expanding the
+    best-scoring suggestions found so far, up to `max_depth` levels.
+
+    The frontier is a max-heap on heuristic score (ties: discovery order), so runs are
+    deterministic for deterministic upstream answers. Each prefix is expanded at most
+    once, negatives are never expanded, and no more than `budget` suggest lookups are
+    made in total. Waves of `wave_size` prefixes are fetched concurrently.
+    Returns {"candidates": set, "expanded": [prefix, ...], "requests": int}.
+    """
+    candidates: Set[str] = set()
+    expanded: List[str] = []
+    seen_prefixes = {seed}
+    frontier: List[Tuple[int, int, int, str]] = [(-100, 0, 0, seed)]  # (-score, depth, order, prefix)
+    order = 1
+    requests_made = 0
+
+    while frontier and requests_made < budget:
+        wave: List[Tuple[int, List[str]]] = []
+        wave_queries: List[str] = []
+        while frontier and len(wave) < wave_size and requests_made + len(wave_queries) < budget:
+            _, depth, _, prefix = heapq.heappop(frontier)
+            remaining = budget - requests_made - len(wave_queries)
+            queries = [q for q in seed_queries(prefix) if q not in wave_queries][:remaining]
+            expanded.append(prefix)
+            wave.append((depth, queries))
+            wave_queries.extend(queries)
+
+        found = fetch_autocomplete_many(wave_queries, geo)
+        requests_made += len(wave_queries)
+        for depth, queries in wave:
+            for q in queries:
+                suggestions = found[q]
+                candidates.update(suggestions)
+                if on_suggestions and suggestions:
+                    on_suggestions(suggestions)
+                if depth + 1 >= max_depth:
+                    continue
+                for sug in suggestions:
+                    prefix = normalize_kw(sug)
+                    if prefix in seen_prefixes or (negative_index and negative_index.matches(prefix)):
+                        continue
+                    seen_prefixes.add(prefix)
+                    heapq.heappush(frontier, (-scorer.score(prefix), depth + 1, order, prefix))
+                    order += 1
+
+    return {"candidates": candidates, "expanded": expanded, "requests": requests_made}
 
 def generate_keywords_core(seed: str, geo: Optional[str]=None, max_results: int=200,
                            a2z: bool=True, use_related: bool=True, commercial_mods_count: int=12,
-                           negative_keywords: Optional[List[str]]=None):
+                           negative_keywords: Optional[List[str]]=None,
+                           negative_match: str="substring",
+                           on_batch: Optional[Callable[[Dict], None]]=None,
+                           depth: str="medium", request_budget: Optional[int]=None):
     """
     Core generation function. Returns list of dict results.
+    If on_batch is given it is called with each newly discovered, filtered and
+    scored set of keywords as autocomplete responses land, before ranking is done.
+    depth="deep" with use_related recursively expands the best suggestions
+    (see deep_expansion) within request_budget suggest calls.
     """
     negative_keywords = negative_keywords or []
     seed = normalize_kw(seed)
     candidates = set()
+    negative_index = get_negative_index(negative_keywords, negative_match) if negative_keywords else None
+    scorer = SeedScorer(seed)
+    streamed: Set[str] = set()
+
+    def emit(stage: str, found: Iterable[str]) -> None:
+        fresh = {normalize_kw(c) for c in found if c and len(c) > 1} - streamed
+        streamed.update(fresh)
+        if negative_index:
+            fresh = negative_index.filter(fresh)
+        fresh = [k for k in fresh if len(k) > 2 and not re.match(r'^[0-9]+$', k)]
+        if fresh:
+            batch = sorted(zip(scorer.score_many(fresh), fresh), key=lambda x: (x[0], -len(x[1])), reverse=True)
+            on_batch({
+                "stage": stage,
+                "keywords": [{"keyword": k, "score": sc, "intentTags": detect_intent(k)} for sc, k in batch],
+            })
 
-    # 1) direct autocomplete
-    candidates.update(fetch_google_autocomplete(seed, geo))
-    time.sleep(0.05)
+    deep = None
+    if depth == "deep" and use_related:
+        # 1-2) seed, its A-Z expansion and related suggestions, best-first
+        deep = deep_expansion(seed, geo, scorer, budget=request_budget or DEEP_REQUEST_BUDGET,
+                              negative_index=negative_index,
+                              on_suggestions=(lambda found: emit("deep", found)) if on_batch else None)
+        candidates.update(deep["candidates"])
+    else:
+        # 1) direct autocomplete + 2) a->z expansion, fanned out together
+        for _, suggestions in iter_autocomplete_many(seed_queries(seed, a2z), geo):
+            candidates.update(suggestions)
+            if on_batch:
+                emit("autocomplete", suggestions)
 
-    # 2) a->z expansion
-    if a2z:
-        candidates.update(a_to_z_expansion(seed, geo))
+    # 3) seed variants + commercial modifiers on top base candidates
+    add_seed_variants(candidates, seed, commercial_mods_count)
 
+    # 4) normalize and filter negatives
+    normalized = {normalize_kw(c) for c in candidates if c and len(c) > 1}
+    if negative_index:
+        normalized = negative_index.filter(normalized)
+
+    # 5) filter trivial tokens
+    normalized = {c for c in normalized if len(c) > 2 and not re.match(r'^[0-9]+$', c)}
+
+    # 6) score and prepare results (sorted: equal scores rank the same whatever the set order)
+    scored = ((scorer.score(k), k) for k in sorted(normalized))
+    out = rank_results(scored, max_results, raw_candidates=len(candidates))
+    if deep:
+        out["counts"]["upstream_requests"] = deep["requests"]
+        out["counts"]["expanded_prefixes"] = len(deep["expanded"])
+    return out
+
+def seed_queries(seed: str, a2z: bool = True) -> List[str]:
+    """Autocomplete queries for one seed: the seed itself, then seed + a..z, 0..9."""
+    return [seed] + ([f"{seed} {ch}" for ch in A2Z_LETTERS] if a2z else [])
+
+def add_seed_variants(candidates: Set[str], seed: str, commercial_mods_count: int) -> None:
     candidates.add(seed)
     candidates.add(f"{seed} services")
     candidates.add(f"{seed} near me")
 
-    # 3) commercial modifiers applied to top base candidates (limit to avoid explosion)
+    # commercial modifiers applied to top base candidates (limit to avoid explosion)
     base_list = list(candidates)[:150]
     for c in base_list:
         for mod in COMMERCIAL_MODIFIERS[:max(1, min(commercial_mods_count, len(COMMERCIAL_MODIFIERS)))]:
             candidates.add(f"{c} {mod}")
             candidates.add(f"{mod} {c}")
 
-    # 4) normalize and filter negatives
-    normalized = {normalize_kw(c) for c in candidates if c and len(c) > 1}
-    if negative_keywords:
-        neg_patterns = [normalize_kw(n) for n in negative_keywords if n]
-        def is_negative(k):
-            return any(np in k for np in neg_patterns)
-        normalized = {k for k in normalized if not is_negative(k)}
+class TopKRanker:
+    """
+    Streaming top-k over (score, keyword) pairs in O(k) memory.
+    Order matches sorted(pairs, key=lambda x: (x[0], -len(x[1])), reverse=True)[:k]:
+    higher score first, then shorter keyword, then earlier arrival.
+    """
 
-    # 5) filter trivial tokens
-    normalized = {c for c in normalized if len(c) > 2 and not re.match(r'^[0-9]+$', c)}
+    def __init__(self, k: int):
+        self.k = max(0, k)
+        self.seen = 0
+        self._heap: List[Tuple[int, int, int, str]] = []  # min-heap, root is the current worst
 
-    # 6) score and prepare results
-    scored = []
-    for k in normalized:
-        sc = heuristic_score(k, seed)
-        scored.append((sc, k))
-    scored.sort(key=lambda x: (x[0], -len(x[1])), reverse=True)
-    top = scored[:max_results]
+    def push(self, score: int, keyword: str) -> None:
+        item = (score, -len(keyword), -self.seen, keyword)
+        self.seen += 1
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, item)
+        elif self._heap and item > self._heap[0]:
+            heapq.heapreplace(self._heap, item)
+
+    def extend(self, pairs: Iterable[Tuple[int, str]]) -> None:
+        for score, keyword in pairs:
+            self.push(score, keyword)
+
+    def top(self) -> List[Tuple[int, str]]:
+        return [(item[0], item[3]) for item in sorted(self._heap, reverse=True)]
+
+def rank_results(scored: Iterable[Tuple[int, str]], max_results: int, raw_candidates: int) -> Dict:
+    """Rank (score, keyword) pairs and build the API result dict for the top max_results."""
+    ranker = TopKRanker(max_results)
+    ranker.extend(scored)
+    top = ranker.top()
 
     results = []
     for idx, (s, k) in enumerate(top):
@@ -230,37 +940,195 @@ def generate_keywords_core(seed: str, geo: Optional[str]=None, max_results: int=
     return {
         "results": results,
         "counts": {
-            "raw_candidates": len(candidates),
-            "unique_normalized": len(normalized),
+            "raw_candidates": raw_candidates,
+            "unique_normalized": ranker.seen,
             "returned": len(results)
         }
     }
 
+def generate_keywords_batch_core(seeds: List[str], geo: Optional[str]=None, max_results: int=200,
+                                 a2z: bool=True, use_related: bool=True, commercial_mods_count: int=12,
+                                 negative_keywords: Optional[List[str]]=None,
+                                 negative_match: str="substring",
+                                 depth: str="medium", request_budget: Optional[int]=None,
+                                 with_normalized: bool=False) -> Dict:
+    """
+    Generate keywords for many seeds at once.
+    All seeds' autocomplete queries go out as one fan-out (identical queries fetched once),
+    and normalization / negative checks are memoized across seeds, so overlapping
+    candidates are processed once. Each seed's candidates are then scored against
+    that seed. Returns {"seeds": {seed: result}, "merged": [...], "counts": {...}}.
+    depth="deep" with use_related expands each seed as generate_keywords_core does
+    (deep_expansion, request_budget suggest calls per seed) instead of the shared fan-out.
+    with_normalized adds "normalized": the distinct normalized candidates behind
+    counts["unique_normalized"], so chunked jobs can count them across chunks.
+    """
+    seeds = list(dict.fromkeys(normalize_kw(s) for s in seeds if s and s.strip()))
+    negative_index = get_negative_index(negative_keywords, negative_match) if negative_keywords else None
+
+    deep = {}
+    if depth == "deep" and use_related:
+        for seed in seeds:
+            deep[seed] = deep_expansion(seed, geo, SeedScorer(seed), budget=request_budget or DEEP_REQUEST_BUDGET,
+                                        negative_index=negative_index)
+        queries, suggestions = {}, {}
+    else:
+        queries = {seed: seed_queries(seed, a2z) for seed in seeds}
+        suggestions = fetch_autocomplete_many([q for qs in queries.values() for q in qs], geo)
+
+    normalized_of: Dict[str, str] = {}
+    kept: Dict[str, bool] = {}
+
+    def keep(k: str) -> bool:
+        ok = kept.get(k)
+        if ok is None:
+            ok = kept[k] = (len(k) > 2 and not re.match(r'^[0-9]+$', k)
+                            and not (negative_index and negative_index.matches(k)))
+        return ok
+
+    per_seed = {}
+    for seed in seeds:
+        candidates = set()
+        if deep:
+            # built as generate_keywords_core builds it: add_seed_variants picks in set order
+            candidates.update(deep[seed]["candidates"])
+        for q in queries.get(seed, ()):
+            candidates.update(suggestions[q])
+        add_seed_variants(candidates, seed, commercial_mods_count)
+
+        normalized = set()
+        for c in candidates:
+            if c and len(c) > 1:
+                k = normalized_of.get(c)
+                if k is None:
+                    k = normalized_of[c] = normalize_kw(c)
+                if keep(k):
+                    normalized.add(k)
+        scorer = SeedScorer(seed)
+        scored = ((scorer.score(k), k) for k in sorted(normalized))
+        per_seed[seed] = rank_results(scored, max_results, raw_candidates=len(candidates))
+        if deep:
+            per_seed[seed]["counts"]["upstream_requests"] = deep[seed]["requests"]
+            per_seed[seed]["counts"]["expanded_prefixes"] = len(deep[seed]["expanded"])
+
+    out = {
+        "seeds": per_seed,
+        "merged": merge_seed_results(per_seed, max_results),
+        "counts": {
+            "seeds": len(seeds),
+            "queries": sum(d["requests"] for d in deep.values()) if deep else len(suggestions),
+            "unique_normalized": len(kept),
+        },
+    }
+    if with_normalized:
+        out["normalized"] = list(kept)
+    return out
+
+def merge_seed_results(per_seed: Dict[str, Dict], max_results: int) -> List[Dict]:
+    """One list across seeds: each keyword once, with its best score and every seed that produced it."""
+    merged: Dict[str, Dict] = {}
+    for seed, out in per_seed.items():
+        for r in out["results"]:
+            entry = merged.get(r["keyword"])
+            if entry is None:
+                entry = merged[r["keyword"]] = {**r, "seeds": []}
+            elif r["score"] > entry["score"]:
+                entry.update({**r, "seeds": entry["seeds"]})
+            entry["seeds"].append(seed)
+    ranked = sorted(merged.values(), key=lambda r: (r["score"], -len(r["keyword"])), reverse=True)[:max_results]
+    for idx, r in enumerate(ranked):
+        r["id"] = f"{idx}-{r['keyword'].replace(' ', '_')}"
+    return ranked
+
+# ------------- Keyword result streams -------------
+_redis_client = None
+_redis_client_pid = None
+
+def get_redis():
+    global _redis_client, _redis_client_pid
+    if _redis_client is None or _redis_client_pid != os.getpid():
+        _redis_client = redis.Redis.from_url(REDIS_URL, decode_responses=True)
+        _redis_client_pid = os.getpid()
+    return _redis_client
+
+def keyword_stream_key(job_id: str) -> str:
+    return f"keywords:stream:{job_id}"
+
+def publish_keyword_event(job_id: str, event: str, data: Dict) -> None:
+    """Append an event (batch | done | error) to the job's Redis stream. Best-effort."""
+    try:
+        r = get_redis()
+        key = keyword_stream_key(job_id)
+        r.xadd(key, {"event": event, "data": json.dumps(data)}, maxlen=10000, approximate=True)
+        r.expire(key, KEYWORD_STREAM_TTL)
+    except redis.RedisError:
+        pass
+
 # ------------- Celery task -------------
 @celery_app.task(bind=True)
 def celery_generate_keywords(self, payload):
     """
     Celery worker task wrapper that calls generate_keywords_core.
     The payload is the dict of KeywordRequest.
+    Partial batches go to the job's Redis stream (see /api/keywords/{job_id}/stream)
+    and progress counters to the task's PROGRESS meta.
     """
-    # optionally update state messages to show progress
-    # self.update_state(state='PROGRESS', meta={'stage': 'starting'})
+    job_id = self.request.id
+    progress = {"stage": "starting", "batches": 0, "streamed": 0}
+    self.update_state(state="PROGRESS", meta=progress)
+
+    def on_batch(batch):
+        progress["stage"] = batch["stage"]
+        progress["batches"] += 1
+        progress["streamed"] += len(batch["keywords"])
+        publish_keyword_event(job_id, "batch", batch)
+        self.update_state(state="PROGRESS", meta=progress)
+
     seed = payload.get("seed")
     geo = payload.get("geo")
     max_results = payload.get("max_results", 200)
     commercial_mods_count = payload.get("commercial_mods_count", 12)
     negative_keywords = payload.get("negative_keywords", [])
     # perform generation (this may take a while)
-    out = generate_keywords_core(seed=seed, geo=geo, max_results=max_results,
-                                 a2z=True, use_related=payload.get("include_related", True),
-                                 commercial_mods_count=commercial_mods_count,
-                                 negative_keywords=negative_keywords)
+    try:
+        out = generate_keywords_core(seed=seed, geo=geo, max_results=max_results,
+                                     a2z=True, use_related=payload.get("include_related", True),
+                                     commercial_mods_count=commercial_mods_count,
+                                     negative_keywords=negative_keywords,
+                                     negative_match=payload.get("negative_match") or "substring",
+                                     on_batch=on_batch,
+                                     depth=payload.get("depth") or "medium",
+                                     request_budget=payload.get("request_budget"))
+    except Exception as e:
+        publish_keyword_event(job_id, "error", {"error": str(e)})
+        raise
+    publish_keyword_event(job_id, "done", out)
     return out
 
+@celery_app.task
+def celery_generate_keywords_chunk(seeds, params):
+    """One chunk of a batch job: shared expansion + per-seed scoring for `seeds`."""
+    return generate_keywords_batch_core(seeds, with_normalized=True, **params)
+
+@celery_app.task
+def celery_merge_keyword_chunks(chunk_results, max_results):
+    """Chord callback: combine chunk outputs into one batch result with a merged view."""
+    per_seed = {}
+    normalized: Set[str] = set()
+    counts = {"seeds": 0, "queries": 0, "chunks": len(chunk_results)}
+    for chunk in chunk_results:
+        per_seed.update(chunk["seeds"])
+        normalized.update(chunk["normalized"])
+        for key in ("seeds", "queries"):
+            counts[key] += chunk["counts"][key]
+    counts["unique_normalized"] = len(normalized)  # chunks share candidates; count each once
+    return {"seeds": per_seed, "merged": merge_seed_results(per_seed, max_results), "counts": counts}
+
 # --------------- API endpoints ---------------
 @app.get("/health")
 def health():
-    return {"status": "ok", "screenshot_sample": SCREENSHOT_PATH}
+    return {"status": "ok", "screenshot_sample": SCREENSHOT_PATH,
+            "autocomplete_cache": autocomplete_cache.stats()}
 
 @app.post("/api/keywords", status_code=202)
 def api_keywords(req: KeywordRequest, sync: Optional[int] = 0):
@@ -271,6 +1139,8 @@ def api_keywords(req: KeywordRequest, sync: Optional[int] = 0):
     # basic validation
     if not req.seed or not req.seed.strip():
         raise HTTPException(status_code=400, detail="seed is required")
+    if req.negative_match and req.negative_match not in NEGATIVE_MATCH_MODES:
+        raise HTTPException(status_code=400, detail=f"negative_match must be one of {', '.join(NEGATIVE_MATCH_MODES)}")
 
     payload = req.dict()
     # If sync requested (small runs), run local function (no Celery)
@@ -283,13 +1153,54 @@ def api_keywords(req: KeywordRequest, sync: Optional[int] = 0):
                                      a2z=(payload_small.get("depth","medium") != "short"),
                                      use_related=payload_small.get("include_related", True),
                                      commercial_mods_count=payload_small.get("commercial_mods_count", 12),
-                                     negative_keywords=payload_small.get("negative_keywords", []))
+                                     negative_keywords=payload_small.get("negative_keywords", []),
+                                     negative_match=payload_small.get("negative_match") or "substring",
+                                     depth=payload_small.get("depth") or "medium",
+                                     request_budget=payload_small.get("request_budget"))
         return JSONResponse(content=res)
 
     # enqueue Celery job
     task = celery_generate_keywords.apply_async(args=[payload])
     return {"job_id": task.id, "status": "queued"}
 
+@app.post("/api/keywords/batch", status_code=202)
+def api_keywords_batch(req: BatchKeywordRequest, sync: Optional[int] = 0):
+    """
+    Generate keywords for many seeds in one job.
+    Seeds are split into chunks of `chunk_size`; each chunk shares autocomplete fetches and
+    dedupe work and runs as one Celery task, and a chord merges the chunks. The returned
+    job_id works with the usual /status and /result endpoints. ?sync=1 runs inline.
+    """
+    seeds = [s for s in req.seeds if s and s.strip()]
+    if not seeds:
+        raise HTTPException(status_code=400, detail="seeds is required")
+    if len(seeds) > MAX_BATCH_SEEDS:
+        raise HTTPException(status_code=400, detail=f"at most {MAX_BATCH_SEEDS} seeds per batch")
+    if req.negative_match and req.negative_match not in NEGATIVE_MATCH_MODES:
+        raise HTTPException(status_code=400, detail=f"negative_match must be one of {', '.join(NEGATIVE_MATCH_MODES)}")
+
+    max_results = req.max_results or 200
+    params = {
+        "geo": req.geo,
+        "max_results": max_results,
+        "a2z": req.depth != "short",
+        "use_related": req.include_related if req.include_related is not None else True,
+        "commercial_mods_count": req.commercial_mods_count or 12,
+        "negative_keywords": req.negative_keywords or [],
+        "negative_match": req.negative_match or "substring",
+        "depth": req.depth or "medium",
+        "request_budget": req.request_budget,
+    }
+    if int(sync):
+        params["max_results"] = min(500, max_results)
+        return JSONResponse(content=generate_keywords_batch_core(seeds, **params))
+
+    size = max(1, req.chunk_size or 10)
+    chunks = [seeds[i:i + size] for i in range(0, len(seeds), size)]
+    job = chord(group(celery_generate_keywords_chunk.s(chunk, params) for chunk in chunks))(
+        celery_merge_keyword_chunks.s(max_results))
+    return {"job_id": job.id, "status": "queued", "seeds": len(seeds), "chunks": len(chunks)}
+
 @app.get("/api/keywords/{job_id}/status")
 def api_job_status(job_id: str):
     """
@@ -307,6 +1218,40 @@ def api_job_status(job_id: str):
             response["meta"] = res.info
     return JSONResponse(content=response)
 
+@app.get("/api/keywords/{job_id}/stream")
+def api_job_stream(job_id: str, last_event_id: Optional[str] = Header(None)):
+    """
+    Server-Sent Events feed of a job's results as they are generated.
+    Events: `batch` (newly found scored keywords), then `done` (the full result) or `error`.
+    Reconnecting clients resume after Last-Event-ID.
+    """
+    key = keyword_stream_key(job_id)
+
+    def stream():
+        last_id = last_event_id or "0-0"
+        deadline = time.monotonic() + KEYWORD_STREAM_TIMEOUT
+        while time.monotonic() < deadline:
+            try:
+                entries = get_redis().xread({key: last_id}, count=100, block=1000)
+            except redis.RedisError as e:
+                yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
+                return
+            if not entries:
+                if AsyncResult(job_id, app=celery_app).state == "FAILURE":
+                    yield f"event: error\ndata: {json.dumps({'error': 'job failed'})}\n\n"
+                    return
+                yield ": keep-alive\n\n"
+                continue
+            for _, messages in entries:
+                for msg_id, fields in messages:
+                    last_id = msg_id
+                    yield f"id: {msg_id}\nevent: {fields['event']}\ndata: {fields['data']}\n\n"
+                    if fields["event"] in ("done", "error"):
+                        return
+
+    return StreamingResponse(stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 @app.get("/api/keywords/{job_id}/result")
 def api_job_result(job_id: str):
     """
@@ -338,7 +1283,8 @@ def api_export_google_ads(req: ExportRequest):
         for kw in req.keywords:
             campaign = req.campaign_name
             adgroup = req.adgroup_prefix
-            crit = f"\"{kw.replace('\"','\"\"')}\""  # escape quotes
+            escaped = kw.replace('"', '""')
+            crit = f'"{escaped}"'  # escape quotes
             mtype = req.match_type
             maxcpc = ""  # set by user or estimation logic
             status = "Enabled"
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+CSV export benchmarks
+Times and peak memory (tracemalloc) for large synthetic campaigns
+
+Run: cd backend && python bench_export.py [name ...]
+"""
+
+import csv
+import io
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+import ad_generator_fallback
+from csv_export_adapter import (
+    AD_FIELD_ALIASES,
+    export_frontend_to_csv,
+    map_ad,
+    map_frontend_to_backend,
+    resolve_ad_fields,
+)
+from export_api_handler import ExportRequestModel
+from export_fixtures import large_frontend_payload, large_request, zip_campaign_payload
+from export_payloads import orjson, parse_frontend_payload
+from export_csv_fix import (
+    GOOGLE_ADS_EDITOR_HEADERS,
+    CampaignExportRequest,
+    RowEncoder,
+    StreamingCSVExport,
+    create_ad_row,
+    export_campaign_to_csv,
+    generate_csv_content,
+    generate_csv_rows,
+    validate_csv_content,
+)
+
+
+FULL_ZIP_CAMPAIGN_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "10k-zip-campaign.csv")
+
+
+def measure(fn):
+    """Run fn once; return (result, seconds, peak MiB)"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def _dict_rows_export(request: CampaignExportRequest) -> str:
+    # previous layout: one 52-key dict per row, copied again for csv.DictWriter
+    rows = [dict(zip(GOOGLE_ADS_EDITOR_HEADERS, row)) for row in generate_csv_rows(request, [])]
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=GOOGLE_ADS_EDITOR_HEADERS, extrasaction='ignore', lineterminator='\r\n')
+    writer.writeheader()
+    for row in rows:
+        writer.writerow({header: row.get(header, '') for header in GOOGLE_ADS_EDITOR_HEADERS})
+    return '\ufeff' + output.getvalue()
+
+
+def bench_row_layout() -> None:
+    """52-key dict rows vs positional list rows written with csv.writer"""
+    print("== row layout ==")
+    request = large_request()
+    legacy, legacy_s, legacy_mb = measure(lambda: _dict_rows_export(request))
+    current, current_s, current_mb = measure(lambda: generate_csv_content(generate_csv_rows(request, [])))
+    assert current == legacy
+    rows = current.count('\r\n') - 1
+    print(f"{'dict rows':>12}: {legacy_s:6.2f}s  peak {legacy_mb:7.1f} MiB  ({rows} rows)")
+    print(f"{'list rows':>12}: {current_s:6.2f}s  peak {current_mb:7.1f} MiB")
+
+
+def _legacy_ad_loop(request: CampaignExportRequest) -> tuple:
+    # previous ad loop: rescan the whole (growing) error list for every ad
+    # returns (ads kept, fatal errors found by the last rescan)
+    errors, kept, fatal_errors = [], 0, []
+    for adgroup in request.ad_groups:
+        for ad in adgroup["ads"]:
+            create_ad_row(request.campaign_name, adgroup["name"], ad, errors)
+            fatal_errors = [e for e in errors if e.severity == 'error' and e.field in ['Final URL', 'Headlines', 'Descriptions']]
+            if not any(e.field in ['Final URL', 'Headlines', 'Descriptions'] for e in errors[-3:]):
+                kept += 1
+    return kept, len(fatal_errors)
+
+
+def bench_ad_validation() -> None:
+    """Ad loop with truncation warnings on every ad: full error-list rescan vs per-row results"""
+    print("== ad validation ==")
+    for ad_groups in (1000, 4000):
+        request = large_request(ad_groups=ad_groups, keywords=0, ads=5, zips=0)
+        for ad_group in request.ad_groups:
+            for ad in ad_group["ads"]:
+                ad["headline4"] = "A headline well over the thirty character limit"
+        started = time.perf_counter()
+        kept, fatal = _legacy_ad_loop(request)
+        legacy = time.perf_counter() - started
+        assert kept == ad_groups * 5 and fatal == 0  # truncation warnings only: every ad kept
+        started = time.perf_counter()
+        rows = generate_csv_rows(request, [])
+        current = time.perf_counter() - started
+        print(f"{ad_groups * 5:>6} ads: rescan {legacy:6.2f}s  per-row {current:6.2f}s  ({len(rows)} rows)")
+
+
+def _split_line_post_check(content: str) -> bool:
+    # previous post-check: split on CRLF and run a new csv.reader per line
+    lines = content.split('\r\n')
+    return all(len(next(csv.reader([line]))) == len(GOOGLE_ADS_EDITOR_HEADERS) for line in lines if line.strip())
+
+
+def bench_validation() -> None:
+    """Encode + per-line re-parse vs encode with in-writer checks (debug single-pass re-parse shown too)"""
+    print("== export validation ==")
+    request = large_request()
+    rows = generate_csv_rows(request, [])
+
+    def legacy():
+        return _split_line_post_check(generate_csv_content(rows))
+
+    def debug():
+        return validate_csv_content(generate_csv_content(rows))[0]
+
+    for label, fn in (("per-line", legacy), ("in-writer", lambda: generate_csv_content(rows)), ("debug pass", debug)):
+        _, elapsed, _ = measure(fn)
+        print(f"{label:>12}: {elapsed:6.2f}s  ({len(rows)} rows)")
+
+
+def bench_encoder() -> None:
+    """Rows/sec encoding builder rows: csv.writer over all 52 fields vs RowEncoder layouts"""
+    print("== row encoder ==")
+    request = large_request(ad_groups=2000, zips=0)
+    rows = generate_csv_rows(request, [])
+
+    def with_csv_writer():
+        output = io.StringIO()
+        writerow = csv.writer(output, lineterminator='\r\n').writerow
+        for row in rows:
+            writerow(row)
+        return output.getvalue()
+
+    def with_encoder():
+        encode = RowEncoder(request.campaign_name).encode
+        return ''.join(map(encode, rows))
+
+    expected = with_csv_writer()
+    for label, fn in (("csv.writer", with_csv_writer), ("RowEncoder", with_encoder)):
+        best = float("inf")
+        for _ in range(3):
+            started = time.perf_counter()
+            content = fn()
+            best = min(best, time.perf_counter() - started)
+        assert content == expected
+        print(f"{label:>12}: {len(rows) / best:12,.0f} rows/sec  ({len(rows)} rows)")
+    whole = generate_csv_content(rows)
+    assert generate_csv_content(rows, campaign_name=request.campaign_name) == whole
+
+
+def bench_parallel() -> None:
+    """export_campaign_to_csv on 5k ad groups: serial vs sharded across worker processes"""
+    print(f"== parallel export ({os.cpu_count()} CPUs) ==")
+    request = large_request(ad_groups=5000)
+    serial = None
+    for workers in (0, 2, 4, 8):
+        started = time.perf_counter()
+        result = export_campaign_to_csv(request, workers=workers)
+        elapsed = time.perf_counter() - started
+        serial = serial or result.csv_content
+        assert result.csv_content == serial
+        print(f"{workers or 'serial':>8} workers: {elapsed:6.2f}s  ({result.row_count} rows)")
+
+
+def _per_zip_locations(targeting: dict) -> dict:
+    # previous adapter output: one {'type', 'code'} dict per ZIP, one 52-column row each
+    return {"locations": [{"type": "ZIP", "code": str(z).strip()} for z in targeting["zipCodes"] if z and str(z).strip()]}
+
+
+def bench_locations() -> None:
+    """10k ZIP campaign (from 10k-zip-campaign.csv): per-ZIP dicts + rows vs bulk code lists + pre-encoded chunks"""
+    print("== bulk locations ==")
+    payload = zip_campaign_payload(FULL_ZIP_CAMPAIGN_CSV)
+
+    def legacy():
+        request = map_frontend_to_backend(**dict(payload, location_targeting=None))
+        request.location_targeting = _per_zip_locations(payload["location_targeting"])
+        return export_campaign_to_csv(request)
+
+    def bulk():
+        return export_campaign_to_csv(map_frontend_to_backend(**payload))
+
+    for label, fn in (("per-ZIP rows", legacy), ("bulk", bulk)):
+        result, elapsed, peak = measure(fn)
+        print(f"{label:>14}: {elapsed:6.3f}s  peak {peak:6.1f} MiB  ({result.row_count} rows)")
+    assert legacy().csv_content == bulk().csv_content
+
+
+def _scanning_adapter_ads(ad_groups: list, generated_ads: list) -> list:
+    # previous adapter loop: scan every generated ad for every ad group, map ALL_AD_GROUPS ads per group
+    out = []
+    for ad_group in ad_groups:
+        group_ads = [ad for ad in generated_ads if ad.get('adGroup') in (ad_group['name'], 'ALL_AD_GROUPS')]
+        group_ads = [ad for ad in group_ads if not ad.get('extensionType')]
+        out.append([mapped for mapped in map(map_ad, group_ads) if mapped is not None])
+    return out
+
+
+def bench_adapter() -> None:
+    """map_frontend_to_backend as ad groups x ads grow: per-group scan vs one-pass group index"""
+    print("== adapter ad mapping ==")
+    for groups in (500, 1000, 2000):
+        ad_groups = [{"name": f"Ad Group {g}", "keywords": [f"kw {g}"]} for g in range(groups)]
+        generated_ads = [{"adGroup": f"Ad Group {i % groups}", "headline1": f"Headline {i}",
+                          "description1": "Description", "finalUrl": "https://example.com"}
+                         for i in range(groups * 5)]
+        generated_ads += [{"adGroup": "ALL_AD_GROUPS", "headline1": "Shared", "description1": "Ad",
+                           "finalUrl": "https://example.com"}] * 3
+        started = time.perf_counter()
+        scanned = _scanning_adapter_ads(ad_groups, generated_ads)
+        legacy = time.perf_counter() - started
+        started = time.perf_counter()
+        request = map_frontend_to_backend("Bench", ad_groups, generated_ads)
+        current = time.perf_counter() - started
+        assert [ad_group["ads"] for ad_group in request.ad_groups] == scanned
+        print(f"{groups:>5} groups x {len(generated_ads):>6} ads: scan {legacy:6.2f}s  index {current:6.3f}s")
+
+
+def _probing_ad_fields(ad: dict) -> dict:
+    # previous normalization: probe every spelling of every field with a nested get_field
+    def get_field(ad_obj, *keys):
+        for key in keys:
+            if key in ad_obj and ad_obj[key]:
+                return str(ad_obj[key]).strip()
+        return ''
+    fields = {field: get_field(ad, *keys) for field, keys in AD_FIELD_ALIASES.items()}
+    if not fields['headline1'] and isinstance(ad.get('headlines'), list) and ad['headlines']:
+        fields.update({f'headline{n + 1}': str(ad['headlines'][n]).strip() if len(ad['headlines']) > n else ''
+                       for n in range(3)})
+    if not fields['description1'] and isinstance(ad.get('descriptions'), list) and ad['descriptions']:
+        fields.update({f'description{n + 1}': str(ad['descriptions'][n]).strip() if len(ad['descriptions']) > n else ''
+                       for n in range(2)})
+    return fields
+
+
+def bench_alias_resolver() -> None:
+    """Per-ad cost of normalizing frontend ad fields: probing every alias vs compiled alias table"""
+    print("== ad field aliases ==")
+    shapes = {
+        "camelCase": {"adGroup": "G", "type": "rsa", "headline1": "Plumber Near You", "headline2": "Licensed",
+                      "headline3": "Call Now", "description1": "Fast service.", "description2": "24/7.",
+                      "finalUrl": "https://example.com", "path1": "plumbing"},
+        "snake_case": {"ad_group": "G", "headline_1": "Plumber", "headline_2": "Licensed", "description_1": "Fast.",
+                       "final_url": "https://example.com", "path_1": "plumbing", "path_2": "near-me"},
+        "arrays": {"adGroup": "G", "headlines": ["Plumber", "Licensed", "Call Now", "Save 10%"],
+                   "descriptions": ["Fast service.", "24/7."], "finalUrl": "https://example.com"},
+    }
+    ads = 20000
+    for label, ad in shapes.items():
+        assert resolve_ad_fields(ad) == _probing_ad_fields(ad)
+        timings = []
+        for fn in (_probing_ad_fields, resolve_ad_fields):
+            started = time.perf_counter()
+            for _ in range(ads):
+                fn(ad)
+            timings.append((time.perf_counter() - started) / ads * 1e6)
+        print(f"{label:>12}: probing {timings[0]:6.2f} us/ad  compiled {timings[1]:6.2f} us/ad")
+
+
+def bench_direct() -> None:
+    """Frontend payload to CSV: request + row list, request + one-pass encode, direct (no request)"""
+    print("== frontend payload to CSV ==")
+    for label, payload in (("10k ZIP campaign", zip_campaign_payload(FULL_ZIP_CAMPAIGN_CSV)), ("2000 ad groups", large_frontend_payload())):
+        def row_list():
+            request = map_frontend_to_backend(**payload)
+            return generate_csv_content(generate_csv_rows(request, []), campaign_name=request.campaign_name)
+
+        def via_request():
+            return export_campaign_to_csv(map_frontend_to_backend(**payload)).csv_content
+
+        def direct():
+            return export_frontend_to_csv(**payload).csv_content
+
+        print(label)
+        expected = None
+        for name, fn in (("row list", row_list), ("request", via_request), ("direct", direct)):
+            content, _, peak = measure(fn)
+            expected = expected or content
+            assert content == expected
+            started = time.perf_counter()  # timed untraced: tracemalloc slows generator-heavy code more
+            fn()
+            elapsed = time.perf_counter() - started
+            print(f"{name:>12}: {elapsed:6.2f}s  peak {peak:7.1f} MiB")
+
+
+def bench_ingest() -> None:
+    """Decode + validate a ~50MB /api/export-csv body: stdlib json + ExportRequestModel vs export_payloads"""
+    print(f"== payload ingestion (orjson {'installed' if orjson else 'not installed'}) ==")
+    payload = large_frontend_payload(ad_groups=25000, keywords=40)
+    body = json.dumps(payload).encode()
+
+    def model():
+        return ExportRequestModel(**json.loads(body))
+
+    def fast():
+        return parse_frontend_payload(body)
+
+    for label, fn in (("json + model", model), ("fast", fast)):
+        best = float("inf")
+        for _ in range(3):
+            started = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - started)
+        print(f"{label:>14}: {best:6.3f}s  ({len(body) / 2 ** 20:.0f} MiB body)")
+
+
+def bench_fallback_copy() -> None:
+    """Bulk fallback ad generation, 2000 keywords x 3 business types: cold caches (every set rendered) vs warm (lookups)"""
+    print("== fallback ad copy ==")
+    keywords = [f"{service} {area} {n}" for n in range(250)
+                for service in ("plumber", "water heater repair", "ac install", "roof leak")
+                for area in ("near me", "downtown")]
+    rounds = []
+    for label in ("cold", "warm"):
+        if label == "cold":
+            ad_generator_fallback.clear_ad_copy_caches()
+        random.seed(0)  # display paths of long keywords are picked at random
+        started = time.perf_counter()
+        ads = [ad_generator_fallback.generate_ads([keyword], business_type, "ABC Plumbing", "Austin", num_ads=1)
+               for keyword in keywords for business_type in ("service", "product", "emergency")]
+        elapsed = time.perf_counter() - started
+        rounds.append(ads)
+        print(f"{label:>12}: {elapsed:6.3f}s  {elapsed / len(ads) * 1e6:6.1f} us/ad  ({len(keywords)} keywords)")
+    assert rounds[0] == rounds[1]
+
+
+def bench_streaming() -> None:
+    """Whole-file export_campaign_to_csv vs chunked StreamingCSVExport (chunks discarded as sent)"""
+    print("== streaming export ==")
+    request = large_request()
+    result, full_s, full_mb = measure(lambda: export_campaign_to_csv(request))
+
+    def drain():
+        export = StreamingCSVExport(request, write_report=False)
+        size = sum(len(chunk) for chunk in export)
+        return size, export.row_count
+
+    (size, rows), stream_s, stream_mb = measure(drain)
+    assert size == len(result.csv_content) and rows == result.row_count
+    print(f"{'whole file':>12}: {full_s:6.2f}s  peak {full_mb:7.1f} MiB  ({rows} rows)")
+    print(f"{'streamed':>12}: {stream_s:6.2f}s  peak {stream_mb:7.1f} MiB")
+
+
+BENCHMARKS = {
+    "rows": bench_row_layout,
+    "stream": bench_streaming,
+    "validate": bench_validation,
+    "ads": bench_ad_validation,
+    "parallel": bench_parallel,
+    "locations": bench_locations,
+    "encoder": bench_encoder,
+    "adapter": bench_adapter,
+    "aliases": bench_alias_resolver,
+    "direct": bench_direct,
+    "ingest": bench_ingest,
+    "fallback": bench_fallback_copy,
+}
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
+        print()
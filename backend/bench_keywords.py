@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Keyword generator benchmarks
+Uses suggest_stub.py as a local stand-in for the suggest endpoint
+
+Run: cd backend && python bench_keywords.py [name ...]
+"""
+
+import random
+import sys
+import time
+
+import requests
+
+import backend
+from suggest_stub import SuggestStubServer
+
+SEEDS = ["plumber", "electrician", "roofer", "hvac repair", "locksmith"]
+
+
+def _fresh_generator_state(stub_url: str) -> None:
+    backend.SUGGEST_URL = stub_url
+    backend.suggest_rate_limiter = backend.TokenBucket(0, 1)
+    backend.autocomplete_cache = backend.AutocompleteCache(ttl=0, max_entries=0)
+    backend._suggest_session = None
+
+
+def bench_connection_pool() -> None:
+    """Connections opened and wall time per seed: pooled session vs one-shot requests.get"""
+    print("== connection pool: direct + A-Z expansion per seed ==")
+    with SuggestStubServer() as stub:
+        _fresh_generator_state(stub.url)
+        get_session = backend.get_suggest_session
+        pooled = get_session()
+
+        for label, session in (("requests.get", requests), ("pooled session", pooled)):
+            backend.get_suggest_session = lambda: session
+            conns_before, started = stub.connection_count, time.perf_counter()
+            for seed in SEEDS:
+                backend.fetch_google_autocomplete(seed)
+                backend.a_to_z_expansion(seed, concurrency=8)
+            elapsed = time.perf_counter() - started
+            conns = (stub.connection_count - conns_before) / len(SEEDS)
+            print(f"{label:>16}: {conns:6.1f} connections/seed  {elapsed / len(SEEDS) * 1000:7.1f} ms/seed")
+        backend.get_suggest_session = get_session
+
+
+def _candidates(n: int, seed: str, prefixed: bool = False) -> list:
+    # prefixed: autocomplete-shaped, every candidate starts with the seed
+    rng = random.Random(n)
+    words = seed.split() + ["near", "me", "cost", "best", "emergency", "drain", "water", "heater",
+                            "install", "local", "24", "hour", "licensed", "cheap", "repair"]
+    head = f"{seed} " if prefixed else ""
+    return list({head + " ".join(rng.choice(words) for _ in range(rng.randint(1, 7))) + f" {i}" for i in range(n)})
+
+
+def bench_scoring() -> None:
+    """heuristic_score per keyword vs SeedScorer.score_many (prefix-shared scan over sorted candidates)"""
+    print("== heuristic scoring ==")
+    seed = "plumber service"
+    for n, prefixed in ((10_000, False), (100_000, False), (100_000, True)):
+        cands = _candidates(n, seed, prefixed)
+        started = time.perf_counter()
+        ref = [backend.heuristic_score(k, seed) for k in cands]
+        per_kw = time.perf_counter() - started
+        started = time.perf_counter()
+        batched = backend.score_keywords(cands, seed)
+        batch = time.perf_counter() - started
+        assert batched == ref
+        label = "seed-prefixed" if prefixed else "random"
+        print(f"{len(cands):>7} {label:>13} candidates: heuristic_score {per_kw:6.2f}s  "
+              f"score_keywords {batch:6.2f}s  ({per_kw / batch:4.1f}x)")
+
+
+def bench_negatives() -> None:
+    """5k negatives x 50k candidates: per-candidate any() scan vs compiled index"""
+    print("== negative keyword filtering ==")
+    rng = random.Random(5)
+    vocab = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 9))) for _ in range(20_000)]
+    negatives = [" ".join(rng.sample(vocab, rng.randint(1, 2))) for _ in range(5_000)]
+    candidates = {" ".join(rng.sample(vocab, rng.randint(2, 5))) for _ in range(50_000)}
+
+    neg_patterns = [backend.normalize_kw(n) for n in negatives]
+    started = time.perf_counter()
+    legacy = {k for k in candidates if not any(np in k for np in neg_patterns)}
+    scan = time.perf_counter() - started
+    print(f"{'any() scan':>22}: {scan:6.2f}s")
+
+    for mode in backend.NEGATIVE_MATCH_MODES:
+        started = time.perf_counter()
+        index = backend.NegativeKeywordIndex(negatives, mode)
+        built = time.perf_counter() - started
+        kept = index.filter(candidates)
+        total = time.perf_counter() - started
+        if mode == "substring":
+            assert kept == legacy
+        print(f"{mode + ' index':>22}: {total:6.2f}s (build {built:.2f}s)  kept {len(kept)}/{len(candidates)}")
+
+
+BENCHMARKS = {
+    "pool": bench_connection_pool,
+    "score": bench_scoring,
+    "negatives": bench_negatives,
+}
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
+        print()
@@ -4,39 +4,133 @@ CSV Export Adapter - Mapping Functions
 Converts Campaign Builder 1 frontend data format to backend export request format
 """
 
-from typing import Dict, List, Any, Optional
-from export_csv_fix import CampaignExportRequest
+import heapq
+import logging
+from typing import Dict, Iterator, List, Any, Optional, Tuple
+from export_csv_fix import CampaignExportRequest, CSVExportResponse, export_rows_to_csv, iter_campaign_rows
 
+logger = logging.getLogger(__name__)
 
-def map_frontend_to_backend(
-    campaign_name: str,
+
+# Backend ad field -> frontend key spellings, in precedence order (first non-empty value wins)
+AD_FIELD_ALIASES: Dict[str, Tuple[str, ...]] = {
+    **{f'headline{n}': (f'headline{n}', f'headline_{n}', f'Headline{n}', f'Headline {n}') for n in range(1, 16)},
+    **{f'description{n}': (f'description{n}', f'description_{n}', f'Description{n}', f'Description {n}') for n in range(1, 5)},
+    'finalUrl': ('finalUrl', 'final_url', 'finalURL', 'Final URL', 'FinalURL'),
+    'path1': ('path1', 'path_1', 'Path1', 'Path 1'),
+    'path2': ('path2', 'path_2', 'Path2', 'Path 2'),
+}
+
+
+def _compile_aliases(aliases: Dict[str, Tuple[str, ...]]) -> Dict[str, Tuple[str, int]]:
+    """Frontend key -> (backend field, precedence rank)"""
+    table = {}
+    for field, keys in aliases.items():
+        for rank, key in enumerate(keys):
+            table.setdefault(key, (field, rank))
+    return table
+
+
+_ALIAS_TABLE = _compile_aliases(AD_FIELD_ALIASES)
+_EMPTY_FIELDS = dict.fromkeys(AD_FIELD_ALIASES, '')
+
+
+def resolve_ad_fields(ad: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Every AD_FIELD_ALIASES field of a frontend ad in one pass over its keys:
+    the highest-precedence spelling with a truthy value, as a stripped string
+    ('' when absent), then headline1-3 / description1-2 from the `headlines` /
+    `descriptions` arrays when the first one is still empty.
+    """
+    table = _ALIAS_TABLE
+    chosen = {}
+    for key, value in ad.items():
+        target = table.get(key)
+        if target is not None and value:
+            field, rank = target
+            current = chosen.get(field)
+            if current is None or rank < current[0]:
+                chosen[field] = (rank, value)
+    
+    fields = dict(_EMPTY_FIELDS)
+    for field, (_, value) in chosen.items():
+        fields[field] = str(value).strip()
+    
+    # Headlines / descriptions sent as arrays
+    for prefix, array_key, count in (('headline', 'headlines', 3), ('description', 'descriptions', 2)):
+        values = ad.get(array_key)
+        if not fields[f'{prefix}1'] and isinstance(values, list) and values:
+            for n in range(count):
+                fields[f'{prefix}{n + 1}'] = str(values[n]).strip() if len(values) > n else ''
+    return fields
+
+
+def map_ad(ad: Dict[str, Any], ad_group_name: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Backend form of one frontend ad, or None for an ad without headlines or
+    descriptions (logged against ad_group_name, the group it is mapped into)
+    """
+    # Check if ad has any content - skip completely empty ads
+    has_headlines = any([
+        ad.get('headline1'), ad.get('headline2'), ad.get('headline3'),
+        ad.get('headlines') and len(ad.get('headlines', [])) > 0
+    ])
+    has_descriptions = any([
+        ad.get('description1'), ad.get('description2'),
+        ad.get('descriptions') and len(ad.get('descriptions', [])) > 0
+    ])
+    
+    # Skip ads that have no content at all (they're likely placeholders)
+    if not has_headlines and not has_descriptions:
+        group = ad_group_name if ad_group_name is not None else ad.get('adGroup')
+        logger.warning(f"Skipping empty ad in group '{group}' - ad has no headlines or descriptions. Ad keys: {list(ad.keys())}")
+        return None
+    
+    return {'type': ad.get('type', 'rsa').lower(), **resolve_ad_fields(ad)}
+
+
+def index_ads_by_group(
+    generated_ads: List[Dict[str, Any]],
+    all_ad_groups_value: str = "ALL_AD_GROUPS"
+) -> Tuple[Dict[Any, List[int]], List[int]]:
+    """
+    One pass over generated_ads: positions of the ads assigned to each ad group,
+    and positions of the ads shared by every group (adGroup == all_ad_groups_value).
+    Extension-only ads (extensionType set) are left out.
+    """
+    by_group: Dict[Any, List[int]] = {}
+    shared: List[int] = []
+    for position, ad in enumerate(generated_ads):
+        if ad.get('extensionType'):
+            continue
+        group = ad.get('adGroup')
+        if group == all_ad_groups_value:
+            shared.append(position)
+        else:
+            by_group.setdefault(group, []).append(position)
+    return by_group, shared
+
+
+def iter_mapped_ad_groups(
     ad_groups: List[Dict[str, Any]],
     generated_ads: List[Dict[str, Any]],
     all_ad_groups_value: str = "ALL_AD_GROUPS",
-    location_targeting: Optional[Dict[str, Any]] = None,
-    budget: Optional[float] = None,
-    bidding_strategy: str = "MANUAL_CPC",
     negative_keywords: Optional[List[str]] = None
-) -> CampaignExportRequest:
+) -> Iterator[Dict[str, Any]]:
     """
-    Map Campaign Builder 1 frontend data structure to backend export request
-    
-    Args:
-        campaign_name: Campaign name
-        ad_groups: List of ad groups with keywords
-        generated_ads: List of all generated ads (may reference ad groups or ALL_AD_GROUPS)
-        all_ad_groups_value: Value used to indicate ads apply to all groups
-        location_targeting: Location targeting data
-        budget: Campaign budget
-        bidding_strategy: Bidding strategy type
-        negative_keywords: Global negative keywords
-    
-    Returns:
-        CampaignExportRequest ready for export
+    Backend ad group dicts (name, keywords, ads, negativeKeywords, defaultMaxCPC)
+    for the named frontend ad groups, one at a time
     """
+    # Index ads by ad group once; each ad is mapped at most once, on first use
+    # (an empty shared ad is logged against the first group it is mapped into)
+    ads_by_group, shared_positions = index_ads_by_group(generated_ads, all_ad_groups_value)
+    mapped_by_position: Dict[int, Optional[Dict[str, Any]]] = {}
+    shared_ads = None
     
-    # Map ad groups with their ads
-    mapped_ad_groups = []
+    def mapped_at(position: int, ad_group_name: str) -> Optional[Dict[str, Any]]:
+        if position not in mapped_by_position:
+            mapped_by_position[position] = map_ad(generated_ads[position], ad_group_name)
+        return mapped_by_position[position]
     
     for ad_group in ad_groups:
         ad_group_name = ad_group.get('name', '').strip()
@@ -51,91 +145,17 @@ def map_frontend_to_backend(
         elif not isinstance(keywords, list):
             keywords = []
         
-        # Get ads for this ad group
+        # Get ads for this ad group, in generated_ads order
         # Ads can be assigned to specific group or ALL_AD_GROUPS
-        group_ads = [
-            ad for ad in generated_ads
-            if ad.get('adGroup') == ad_group_name or ad.get('adGroup') == all_ad_groups_value
-        ]
-        
-        # Filter out extension-only ads (they have extensionType)
-        group_ads = [ad for ad in group_ads if not ad.get('extensionType')]
-        
-        # Map ads to backend format
-        mapped_ads = []
-        for ad in group_ads:
-            # Check if ad has any content - skip completely empty ads
-            has_headlines = any([
-                ad.get('headline1'), ad.get('headline2'), ad.get('headline3'),
-                ad.get('headlines') and len(ad.get('headlines', [])) > 0
-            ])
-            has_descriptions = any([
-                ad.get('description1'), ad.get('description2'),
-                ad.get('descriptions') and len(ad.get('descriptions', [])) > 0
-            ])
-            
-            # Skip ads that have no content at all (they're likely placeholders)
-            if not has_headlines and not has_descriptions:
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.warning(f"Skipping empty ad in group '{ad_group_name}' - ad has no headlines or descriptions. Ad keys: {list(ad.keys())}")
-                continue
-            # Handle both camelCase and snake_case field names
-            # Also check for nested structures (e.g., ad.headlines[0])
-            def get_field(ad_obj, *keys):
-                """Get field value trying multiple key variations"""
-                for key in keys:
-                    if key in ad_obj and ad_obj[key]:
-                        return str(ad_obj[key]).strip()
-                return ''
-            
-            # Try multiple field name variations
-            headline1 = get_field(ad, 'headline1', 'headline_1', 'Headline1', 'Headline 1')
-            headline2 = get_field(ad, 'headline2', 'headline_2', 'Headline2', 'Headline 2')
-            headline3 = get_field(ad, 'headline3', 'headline_3', 'Headline3', 'Headline 3')
-            
-            # Check if headlines are in an array
-            if not headline1 and 'headlines' in ad and isinstance(ad['headlines'], list) and len(ad['headlines']) > 0:
-                headlines_list = ad['headlines']
-                headline1 = str(headlines_list[0]).strip() if len(headlines_list) > 0 else ''
-                headline2 = str(headlines_list[1]).strip() if len(headlines_list) > 1 else ''
-                headline3 = str(headlines_list[2]).strip() if len(headlines_list) > 2 else ''
-            
-            description1 = get_field(ad, 'description1', 'description_1', 'Description1', 'Description 1')
-            description2 = get_field(ad, 'description2', 'description_2', 'Description2', 'Description 2')
-            
-            # Check if descriptions are in an array
-            if not description1 and 'descriptions' in ad and isinstance(ad['descriptions'], list) and len(ad['descriptions']) > 0:
-                descriptions_list = ad['descriptions']
-                description1 = str(descriptions_list[0]).strip() if len(descriptions_list) > 0 else ''
-                description2 = str(descriptions_list[1]).strip() if len(descriptions_list) > 1 else ''
-            
-            mapped_ad = {
-                'type': ad.get('type', 'rsa').lower(),
-                'headline1': headline1,
-                'headline2': headline2,
-                'headline3': headline3,
-                'headline4': get_field(ad, 'headline4', 'headline_4', 'Headline4', 'Headline 4'),
-                'headline5': get_field(ad, 'headline5', 'headline_5', 'Headline5', 'Headline 5'),
-                'headline6': get_field(ad, 'headline6', 'headline_6', 'Headline6', 'Headline 6'),
-                'headline7': get_field(ad, 'headline7', 'headline_7', 'Headline7', 'Headline 7'),
-                'headline8': get_field(ad, 'headline8', 'headline_8', 'Headline8', 'Headline 8'),
-                'headline9': get_field(ad, 'headline9', 'headline_9', 'Headline9', 'Headline 9'),
-                'headline10': get_field(ad, 'headline10', 'headline_10', 'Headline10', 'Headline 10'),
-                'headline11': get_field(ad, 'headline11', 'headline_11', 'Headline11', 'Headline 11'),
-                'headline12': get_field(ad, 'headline12', 'headline_12', 'Headline12', 'Headline 12'),
-                'headline13': get_field(ad, 'headline13', 'headline_13', 'Headline13', 'Headline 13'),
-                'headline14': get_field(ad, 'headline14', 'headline_14', 'Headline14', 'Headline 14'),
-                'headline15': get_field(ad, 'headline15', 'headline_15', 'Headline15', 'Headline 15'),
-                'description1': description1,
-                'description2': description2,
-                'description3': get_field(ad, 'description3', 'description_3', 'Description3', 'Description 3'),
-                'description4': get_field(ad, 'description4', 'description_4', 'Description4', 'Description 4'),
-                'finalUrl': get_field(ad, 'finalUrl', 'final_url', 'finalURL', 'Final URL', 'FinalURL'),
-                'path1': get_field(ad, 'path1', 'path_1', 'Path1', 'Path 1'),
-                'path2': get_field(ad, 'path2', 'path_2', 'Path2', 'Path 2'),
-            }
-            mapped_ads.append(mapped_ad)
+        own_positions = ads_by_group.get(ad_group_name)
+        if own_positions:
+            positions = heapq.merge(own_positions, shared_positions)
+            mapped_ads = [ad for ad in (mapped_at(p, ad_group_name) for p in positions) if ad is not None]
+        else:
+            # the same mapped ALL_AD_GROUPS ads (list and dicts) for every group without its own ads
+            if shared_ads is None:
+                shared_ads = [ad for ad in (mapped_at(p, ad_group_name) for p in shared_positions) if ad is not None]
+            mapped_ads = shared_ads
         
         # Get negative keywords for this ad group
         group_negative_keywords = ad_group.get('negativeKeywords', [])
@@ -144,70 +164,122 @@ def map_frontend_to_backend(
         elif not isinstance(group_negative_keywords, list):
             group_negative_keywords = []
         
-        # Add global negative keywords if provided
+        # Add global negative keywords if provided (the payload's own list is left as is)
         if negative_keywords:
-            group_negative_keywords.extend(negative_keywords)
+            group_negative_keywords = group_negative_keywords + list(negative_keywords)
         
-        mapped_ad_groups.append({
+        yield {
             'name': ad_group_name,
             'keywords': keywords,
             'ads': mapped_ads,
             'negativeKeywords': list(set(group_negative_keywords)),  # Remove duplicates
             'defaultMaxCPC': ad_group.get('defaultMaxCPC') or ad_group.get('default_max_cpc')
-        })
-    
-    # Map location targeting
-    mapped_location_targeting = None
+        }
+
+
+def map_location_targeting(location_targeting: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Frontend location targeting as compact per-type code lists ({'bulk': {...}});
+    codes are stripped and de-duplicated when the rows are encoded
+    """
     if location_targeting:
-        locations = []
+        bulk = {}
         
         # Country
         if location_targeting.get('country'):
-            locations.append({
-                'type': 'COUNTRY',
-                'code': location_targeting['country']
-            })
+            bulk['COUNTRY'] = [location_targeting['country']]
         
         # States
         if location_targeting.get('states'):
-            for state in location_targeting['states']:
-                if state and str(state).strip():
-                    locations.append({
-                        'type': 'STATE',
-                        'code': str(state).strip()
-                    })
+            bulk['STATE'] = location_targeting['states']
         
         # Cities
         if location_targeting.get('cities'):
-            for city in location_targeting['cities']:
-                if city and str(city).strip():
-                    locations.append({
-                        'type': 'CITY',
-                        'code': str(city).strip()
-                    })
+            bulk['CITY'] = location_targeting['cities']
         
         # ZIP codes
-        if location_targeting.get('zipCodes') or location_targeting.get('zip_codes'):
-            zips = location_targeting.get('zipCodes') or location_targeting.get('zip_codes', [])
-            for zip_code in zips:
-                if zip_code and str(zip_code).strip():
-                    locations.append({
-                        'type': 'ZIP',
-                        'code': str(zip_code).strip()
-                    })
+        zips = location_targeting.get('zipCodes') or location_targeting.get('zip_codes')
+        if zips:
+            bulk['ZIP'] = zips
         
-        if locations:
-            mapped_location_targeting = {'locations': locations}
+        if bulk:
+            return {'bulk': bulk}
+    return None
+
+
+def map_frontend_to_backend(
+    campaign_name: str,
+    ad_groups: List[Dict[str, Any]],
+    generated_ads: List[Dict[str, Any]],
+    all_ad_groups_value: str = "ALL_AD_GROUPS",
+    location_targeting: Optional[Dict[str, Any]] = None,
+    budget: Optional[float] = None,
+    bidding_strategy: str = "MANUAL_CPC",
+    negative_keywords: Optional[List[str]] = None
+) -> CampaignExportRequest:
+    """
+    Map Campaign Builder 1 frontend data structure to backend export request
+    
+    Args:
+        campaign_name: Campaign name
+        ad_groups: List of ad groups with keywords
+        generated_ads: List of all generated ads (may reference ad groups or ALL_AD_GROUPS)
+        all_ad_groups_value: Value used to indicate ads apply to all groups
+        location_targeting: Location targeting data
+        budget: Campaign budget
+        bidding_strategy: Bidding strategy type
+        negative_keywords: Global negative keywords
+    
+    Returns:
+        CampaignExportRequest ready for export
+    """
     
     return CampaignExportRequest(
         campaign_name=campaign_name or 'Campaign 1',
-        ad_groups=mapped_ad_groups,
-        location_targeting=mapped_location_targeting,
+        ad_groups=list(iter_mapped_ad_groups(ad_groups, generated_ads, all_ad_groups_value, negative_keywords)),
+        location_targeting=map_location_targeting(location_targeting),
         budget=budget,
         bidding_strategy=bidding_strategy or 'MANUAL_CPC'
     )
 
 
+def export_frontend_to_csv(
+    campaign_name: str,
+    ad_groups: List[Dict[str, Any]],
+    generated_ads: List[Dict[str, Any]],
+    all_ad_groups_value: str = "ALL_AD_GROUPS",
+    location_targeting: Optional[Dict[str, Any]] = None,
+    budget: Optional[float] = None,
+    bidding_strategy: str = "MANUAL_CPC",
+    negative_keywords: Optional[List[str]] = None,
+    debug_validate: Optional[bool] = None
+) -> CSVExportResponse:
+    """
+    export_campaign_to_csv(map_frontend_to_backend(...)) without building the
+    request: ad groups are mapped one at a time while their rows are generated
+    and encoded, so neither the mapped campaign nor its rows are held in memory.
+    Same output and validation results; raises ValueError for inputs the
+    request model would reject.
+    """
+    campaign_name = campaign_name or 'Campaign 1'
+    if not campaign_name.strip() or len(campaign_name) > 255:
+        raise ValueError('Campaign name must be 1-255 characters and not blank')
+    if not any(ad_group.get('name', '').strip() for ad_group in ad_groups):
+        raise ValueError('At least one named ad group is required')
+    campaign_name = campaign_name.strip()
+    
+    validation_errors = []
+    rows = iter_campaign_rows(
+        campaign_name,
+        iter_mapped_ad_groups(ad_groups, generated_ads, all_ad_groups_value, negative_keywords),
+        validation_errors,
+        budget=float(budget) if budget is not None else None,
+        bidding_strategy=bidding_strategy or 'MANUAL_CPC',
+        location_targeting=map_location_targeting(location_targeting)
+    )
+    return export_rows_to_csv(campaign_name, rows, validation_errors, debug_validate)
+
+
 def map_simple_format(
     campaign_name: str,
     ad_groups_data: List[Dict[str, Any]],
@@ -231,7 +303,8 @@ def map_simple_format(
             "locations": [
                 {"type": "COUNTRY", "code": "US"},
                 {"type": "CITY", "code": "New York"}
-            ]
+            ],
+            "bulk": {"ZIP": ["10001", "10002"]}
         }
     }
     """
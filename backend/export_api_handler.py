@@ -5,17 +5,22 @@ Can be used as standalone or integrated into existing FastAPI app
 """
 
 from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel, Field
+from functools import partial
 from typing import List, Dict, Any, Optional
 import logging
 
 from export_csv_fix import (
     CampaignExportRequest,
     CSVExportResponse,
-    export_campaign_to_csv
+    StreamingCSVExport,
+    export_campaign_to_csv,
+    load_export_report
 )
-from csv_export_adapter import map_frontend_to_backend
+from csv_export_adapter import export_frontend_to_csv, map_frontend_to_backend
+from export_executor import get_export_executor
+from export_payloads import PayloadError, parse_frontend_payload
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -36,31 +41,76 @@ class ExportRequestModel(BaseModel):
     all_ad_groups_value: Optional[str] = "ALL_AD_GROUPS"
 
 
+def streaming_csv_response(export: StreamingCSVExport, report_url: str) -> StreamingResponse:
+    """Chunked CSV download; the validation report is written to a sidecar when the stream ends"""
+    return StreamingResponse(
+        iter(export),
+        media_type="text/csv; charset=utf-8",
+        headers={
+            "Content-Disposition": f'attachment; filename="{export.filename}"',
+            "X-Export-Id": export.export_id,
+            "X-Export-Report": report_url
+        }
+    )
+
+
+def build_streaming_export(frontend_campaign: Dict[str, Any]) -> StreamingCSVExport:
+    """StreamingCSVExport for map_frontend_to_backend keyword arguments"""
+    return StreamingCSVExport(map_frontend_to_backend(**frontend_campaign))
+
+
 @router.post("/export-csv", response_model=None)
-async def export_csv_handler(request: ExportRequestModel):
+async def export_csv_handler(request: ExportRequestModel, stream: bool = False):
     """
     Export campaign to Google Ads Editor CSV format
     
     Accepts Campaign Builder 1 frontend format and converts to backend format
     Returns CSV file on success, JSON with errors on validation failure
+
+    With ?stream=true the CSV is generated and sent in chunks (constant memory);
+    ads with validation errors are skipped and reported at X-Export-Report
+    """
+    frontend_campaign = dict(
+        campaign_name=request.campaign_name,
+        ad_groups=request.ad_groups,
+        generated_ads=request.generated_ads or [],
+        all_ad_groups_value=request.all_ad_groups_value or "ALL_AD_GROUPS",
+        location_targeting=request.location_targeting,
+        budget=request.budget,
+        bidding_strategy=request.bidding_strategy or "MANUAL_CPC",
+        negative_keywords=request.negative_keywords or []
+    )
+    return await export_frontend_campaign(frontend_campaign, stream)
+
+
+@router.post("/export-csv/fast", response_model=None)
+async def export_csv_fast_handler(request: Request, stream: bool = False):
+    """
+    /export-csv for large bodies: decoded off the event loop (orjson when installed)
+    into a slot-backed FrontendPayload instead of ExportRequestModel; ad groups and
+    generated ads are checked as the export reaches them
     """
     try:
-        logger.info(f"CSV export requested for campaign: {request.campaign_name}")
-        
-        # Map frontend format to backend format
-        export_request = map_frontend_to_backend(
-            campaign_name=request.campaign_name,
-            ad_groups=request.ad_groups,
-            generated_ads=request.generated_ads or [],
-            all_ad_groups_value=request.all_ad_groups_value or "ALL_AD_GROUPS",
-            location_targeting=request.location_targeting,
-            budget=request.budget,
-            bidding_strategy=request.bidding_strategy or "MANUAL_CPC",
-            negative_keywords=request.negative_keywords or []
-        )
+        payload = await get_export_executor().run(parse_frontend_payload, await request.body())
+    except PayloadError as e:
+        raise HTTPException(status_code=422, detail=e.errors())
+    return await export_frontend_campaign(payload.export_kwargs(), stream)
+
+
+async def export_frontend_campaign(frontend_campaign: Dict[str, Any], stream: bool = False):
+    """Shared body of /export-csv and /export-csv/fast (map_frontend_to_backend keyword arguments)"""
+    try:
+        logger.info(f"CSV export requested for campaign: {frontend_campaign['campaign_name']}")
         
-        # Generate CSV
-        result = export_campaign_to_csv(export_request)
+        if stream:
+            # Map frontend format to backend format before the first byte is sent (every ad group
+            # is checked, so a bad one is still a 422); CPU-bound, so in the export thread pool
+            export = await get_export_executor().run(build_streaming_export, frontend_campaign)
+            logger.info(f"Streaming CSV export {export.export_id}, filename: {export.filename}")
+            return streaming_csv_response(export, f"/api/export-csv/report/{export.export_id}")
+
+        # Map, generate and encode in one pass (CPU-bound: export thread pool, off the event loop)
+        result = await get_export_executor().run(partial(export_frontend_to_csv, **frontend_campaign))
         
         # If successful, return CSV file
         if result.success and result.csv_content:
@@ -88,6 +138,8 @@ async def export_csv_handler(request: ExportRequestModel):
             message=result.message
         )
         
+    except PayloadError as e:
+        raise HTTPException(status_code=422, detail=e.errors())
     except Exception as e:
         logger.error(f"CSV export error: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -105,7 +157,7 @@ async def export_csv_direct(request: CampaignExportRequest):
     try:
         logger.info(f"Direct CSV export requested for campaign: {request.campaign_name}")
         
-        result = export_campaign_to_csv(request)
+        result = await get_export_executor().run(export_campaign_to_csv, request)
         
         if result.success and result.csv_content:
             return Response(
@@ -127,6 +179,15 @@ async def export_csv_direct(request: CampaignExportRequest):
         )
 
 
+@router.get("/export-csv/report/{export_id}")
+async def export_csv_report(export_id: str):
+    """Validation report of a streamed export (available once the stream has ended)"""
+    report = load_export_report(export_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Export report not found")
+    return report
+
+
 # Example usage in FastAPI app:
 # from fastapi import FastAPI
 # from export_api_handler import router
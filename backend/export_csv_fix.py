@@ -10,12 +10,24 @@ Addresses all 6 CSV generation issues:
 6. Robust field counting (no regex)
 """
 
+import atexit
 import csv
 import io
-from typing import List, Dict, Optional, Any
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from operator import itemgetter
+from typing import List, Dict, Iterable, Iterator, Optional, Any
 from pydantic import BaseModel, Field, validator
 from datetime import datetime
 
+from export_job_store import EXPORT_JOB_TTL
+
 # ============================================================================
 # GOOGLE ADS EDITOR HEADERS (Exact order required)
 # ============================================================================
@@ -75,6 +87,37 @@ GOOGLE_ADS_EDITOR_HEADERS = [
     'Operation',
 ]
 
+# Column positions. Rows are fixed-position lists aligned with GOOGLE_ADS_EDITOR_HEADERS
+# (one list per row instead of a 52-key dict).
+HEADER_INDEX = {header: i for i, header in enumerate(GOOGLE_ADS_EDITOR_HEADERS)}
+NUM_COLUMNS = len(GOOGLE_ADS_EDITOR_HEADERS)
+
+COL_ROW_TYPE = HEADER_INDEX['Row Type']
+COL_CAMPAIGN = HEADER_INDEX['Campaign']
+COL_CAMPAIGN_BUDGET = HEADER_INDEX['Campaign Budget']
+COL_BIDDING_STRATEGY = HEADER_INDEX['Bidding Strategy Type']
+COL_LOCATION_TYPE = HEADER_INDEX['Location Type']
+COL_LOCATION_CODE = HEADER_INDEX['Location Code']
+COL_ADGROUP = HEADER_INDEX['AdGroup']
+COL_ADGROUP_STATUS = HEADER_INDEX['AdGroup Status']
+COL_DEFAULT_MAX_CPC = HEADER_INDEX['Default Max CPC']
+COL_KEYWORD = HEADER_INDEX['Keyword']
+COL_MATCH_TYPE = HEADER_INDEX['Match Type']
+COL_KEYWORD_STATUS = HEADER_INDEX['Keyword Status']
+COL_KEYWORD_MAX_CPC = HEADER_INDEX['Keyword Max CPC']
+COL_KEYWORD_FINAL_URL = HEADER_INDEX['Keyword Final URL']
+COL_AD_TYPE = HEADER_INDEX['Ad Type']
+COL_AD_STATUS = HEADER_INDEX['Ad Status']
+COL_HEADLINE_1 = HEADER_INDEX['Headline 1']  # Headline 1..15 are contiguous
+COL_DESCRIPTION_1 = HEADER_INDEX['Description 1']  # Description 1..4 are contiguous
+COL_FINAL_URL = HEADER_INDEX['Final URL']
+COL_PATH1 = HEADER_INDEX['Path1']
+COL_PATH2 = HEADER_INDEX['Path2']
+COL_NEGATIVE_KEYWORD = HEADER_INDEX['Negative Keyword']
+COL_OPERATION = HEADER_INDEX['Operation']
+
+CSVRow = List[str]
+
 # ============================================================================
 # VALIDATION MODELS (Pydantic)
 # ============================================================================
@@ -102,6 +145,31 @@ class ValidationError(BaseModel):
     severity: str = "error"  # "error" or "warning"
 
 
+class RowValidation:
+    """
+    Errors and warnings raised while building one row, tagged with that row's
+    line in the CSV (header is line 1). error_count is kept as issues are added,
+    so the keep/drop decision for the row is O(1).
+    """
+    __slots__ = ('row_index', 'issues', 'error_count')
+
+    def __init__(self, row_index: Optional[int] = None):
+        self.row_index = row_index
+        self.issues: List[ValidationError] = []
+        self.error_count = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.error_count == 0
+
+    def error(self, field: str, message: str) -> None:
+        self.issues.append(ValidationError(row_index=self.row_index, field=field, message=message, severity='error'))
+        self.error_count += 1
+
+    def warning(self, field: str, message: str) -> None:
+        self.issues.append(ValidationError(row_index=self.row_index, field=field, message=message, severity='warning'))
+
+
 class CSVExportResponse(BaseModel):
     """Response model for CSV export"""
     success: bool
@@ -199,82 +267,47 @@ def parse_match_type(keyword: str) -> tuple:
 # CSV ROW GENERATION
 # ============================================================================
 
+def _campaign_template() -> CSVRow:
+    # Every row starts as the campaign's own row: statuses, type, budget type and
+    # default bidding strategy are repeated on all rows.
+    row = [''] * NUM_COLUMNS
+    row[COL_ROW_TYPE] = 'CAMPAIGN'
+    row[HEADER_INDEX['Campaign Status']] = 'ENABLED'
+    row[HEADER_INDEX['Campaign Type']] = 'SEARCH'
+    row[HEADER_INDEX['Budget Type']] = 'DAILY'
+    row[COL_BIDDING_STRATEGY] = 'MANUAL_CPC'
+    row[COL_OPERATION] = 'NEW'
+    return row
+
+
+_CAMPAIGN_ROW_TEMPLATE = _campaign_template()
+
+
 def create_campaign_row(campaign_name: str, budget: Optional[float] = None, 
-                       bidding_strategy: str = "MANUAL_CPC") -> Dict[str, str]:
+                       bidding_strategy: str = "MANUAL_CPC") -> CSVRow:
     """Create a CAMPAIGN row"""
-    return {
-        'Row Type': 'CAMPAIGN',
-        'Campaign': campaign_name,
-        'Campaign ID': '',
-        'Campaign Status': 'ENABLED',
-        'Campaign Type': 'SEARCH',
-        'Campaign Budget': str(budget) if budget else '',
-        'Budget Type': 'DAILY',
-        'Bidding Strategy Type': bidding_strategy,
-        'Start Date': '',
-        'End Date': '',
-        'Location Type': '',
-        'Location Code': '',
-        'AdGroup': '',
-        'AdGroup Status': '',
-        'Default Max CPC': '',
-        'Keyword': '',
-        'Match Type': '',
-        'Keyword Status': '',
-        'Keyword Max CPC': '',
-        'Keyword Final URL': '',
-        'Ad Type': '',
-        'Ad Status': '',
-        'Headline 1': '',
-        'Headline 2': '',
-        'Headline 3': '',
-        'Headline 4': '',
-        'Headline 5': '',
-        'Headline 6': '',
-        'Headline 7': '',
-        'Headline 8': '',
-        'Headline 9': '',
-        'Headline 10': '',
-        'Headline 11': '',
-        'Headline 12': '',
-        'Headline 13': '',
-        'Headline 14': '',
-        'Headline 15': '',
-        'Description 1': '',
-        'Description 2': '',
-        'Description 3': '',
-        'Description 4': '',
-        'Final URL': '',
-        'Final Mobile URL': '',
-        'Path1': '',
-        'Path2': '',
-        'Tracking Template': '',
-        'Custom Parameters': '',
-        'Asset Type': '',
-        'Asset Name': '',
-        'Asset URL': '',
-        'Negative Keyword': '',
-        'Operation': 'NEW',
-    }
+    row = _CAMPAIGN_ROW_TEMPLATE.copy()
+    row[COL_CAMPAIGN] = campaign_name
+    row[COL_CAMPAIGN_BUDGET] = str(budget) if budget else ''
+    row[COL_BIDDING_STRATEGY] = bidding_strategy
+    return row
 
 
 def create_adgroup_row(campaign_name: str, adgroup_name: str, 
-                      default_max_cpc: Optional[float] = None) -> Dict[str, str]:
+                      default_max_cpc: Optional[float] = None) -> CSVRow:
     """Create an ADGROUP row"""
     row = create_campaign_row(campaign_name)
-    row.update({
-        'Row Type': 'ADGROUP',
-        'AdGroup': adgroup_name,
-        'AdGroup Status': 'ENABLED',
-        'Default Max CPC': str(default_max_cpc) if default_max_cpc else '',
-    })
+    row[COL_ROW_TYPE] = 'ADGROUP'
+    row[COL_ADGROUP] = adgroup_name
+    row[COL_ADGROUP_STATUS] = 'ENABLED'
+    row[COL_DEFAULT_MAX_CPC] = str(default_max_cpc) if default_max_cpc else ''
     return row
 
 
 def create_keyword_row(campaign_name: str, adgroup_name: str, keyword: str,
                       match_type: Optional[str] = None,
                       max_cpc: Optional[float] = None,
-                      final_url: Optional[str] = None) -> Dict[str, str]:
+                      final_url: Optional[str] = None) -> CSVRow:
     """Create a KEYWORD row"""
     if match_type is None:
         match_type, keyword = parse_match_type(keyword)
@@ -282,22 +315,32 @@ def create_keyword_row(campaign_name: str, adgroup_name: str, keyword: str,
         keyword = parse_match_type(keyword)[1]  # Clean keyword
     
     row = create_campaign_row(campaign_name)
-    row.update({
-        'Row Type': 'KEYWORD',
-        'AdGroup': adgroup_name,
-        'Keyword': keyword,
-        'Match Type': match_type,
-        'Keyword Status': 'ENABLED',
-        'Keyword Max CPC': str(max_cpc) if max_cpc else '',
-        'Keyword Final URL': final_url or '',
-    })
+    row[COL_ROW_TYPE] = 'KEYWORD'
+    row[COL_ADGROUP] = adgroup_name
+    row[COL_KEYWORD] = keyword
+    row[COL_MATCH_TYPE] = match_type
+    row[COL_KEYWORD_STATUS] = 'ENABLED'
+    row[COL_KEYWORD_MAX_CPC] = str(max_cpc) if max_cpc else ''
+    row[COL_KEYWORD_FINAL_URL] = final_url or ''
     return row
 
 
-def create_ad_row(campaign_name: str, adgroup_name: str, ad: Dict[str, Any],
-                 validation_errors: List[ValidationError]) -> Dict[str, str]:
-    """Create an AD row with field length validation"""
+def create_negative_keyword_row(campaign_name: str, adgroup_name: str, keyword: str,
+                                match_type: str) -> CSVRow:
+    """Create a NEGATIVE_KEYWORD row"""
+    row = create_campaign_row(campaign_name)
+    row[COL_ROW_TYPE] = 'NEGATIVE_KEYWORD'
+    row[COL_ADGROUP] = adgroup_name
+    row[COL_NEGATIVE_KEYWORD] = keyword
+    row[COL_MATCH_TYPE] = match_type
+    return row
+
+
+def build_ad_row(campaign_name: str, adgroup_name: str, ad: Dict[str, Any],
+                 row_index: Optional[int] = None) -> tuple[CSVRow, RowValidation]:
+    """Create an AD row with field length validation; returns (row, its validation result)"""
     row = create_campaign_row(campaign_name)
+    result = RowValidation(row_index)
     
     # Determine ad type
     ad_type = ad.get('type', 'rsa').upper()
@@ -317,11 +360,7 @@ def create_ad_row(campaign_name: str, adgroup_name: str, ad: Dict[str, Any],
             original_len = len(headline)
             headline = truncate_headline(headline, 30)
             if len(headline) != original_len:
-                validation_errors.append(ValidationError(
-                    field=f'Headline {i}',
-                    message=f'Headline {i} truncated from {original_len} to 30 characters',
-                    severity='warning'
-                ))
+                result.warning(f'Headline {i}', f'Headline {i} truncated from {original_len} to 30 characters')
             headlines.append(headline)
         else:
             headlines.append('')
@@ -335,11 +374,7 @@ def create_ad_row(campaign_name: str, adgroup_name: str, ad: Dict[str, Any],
             original_len = len(description)
             description = truncate_description(description, 90)
             if len(description) != original_len:
-                validation_errors.append(ValidationError(
-                    field=f'Description {i}',
-                    message=f'Description {i} truncated from {original_len} to 90 characters',
-                    severity='warning'
-                ))
+                result.warning(f'Description {i}', f'Description {i} truncated from {original_len} to 90 characters')
             descriptions.append(description)
         else:
             descriptions.append('')
@@ -351,245 +386,611 @@ def create_ad_row(campaign_name: str, adgroup_name: str, ad: Dict[str, Any],
     # Validate final URL
     final_url = ad.get('finalUrl') or ad.get('final_url', '').strip()
     if not final_url:
-        validation_errors.append(ValidationError(
-            field='Final URL',
-            message='Final URL is required for ads',
-            severity='error'
-        ))
+        result.error('Final URL', 'Final URL is required for ads')
     
     # Validate minimum requirements
     non_empty_headlines = [h for h in headlines[:3] if h]
     non_empty_descriptions = [d for d in descriptions[:2] if d]
     
     if len(non_empty_headlines) < 3:
-        validation_errors.append(ValidationError(
-            field='Headlines',
-            message='At least 3 headlines are required for Responsive Search Ads',
-            severity='error'
-        ))
+        result.error('Headlines', 'At least 3 headlines are required for Responsive Search Ads')
     
     if len(non_empty_descriptions) < 2:
-        validation_errors.append(ValidationError(
-            field='Descriptions',
-            message='At least 2 descriptions are required for Responsive Search Ads',
-            severity='error'
-        ))
+        result.error('Descriptions', 'At least 2 descriptions are required for Responsive Search Ads')
     
     # Build row
-    row.update({
-        'Row Type': 'AD',
-        'AdGroup': adgroup_name,
-        'Ad Type': ad_type_str,
-        'Ad Status': 'ENABLED',
-        'Final URL': final_url,
-        'Path1': path1,
-        'Path2': path2,
-    })
-    
-    # Add headlines
-    for i, headline in enumerate(headlines, 1):
-        row[f'Headline {i}'] = headline
-    
-    # Add descriptions
-    for i, description in enumerate(descriptions, 1):
-        row[f'Description {i}'] = description
+    row[COL_ROW_TYPE] = 'AD'
+    row[COL_ADGROUP] = adgroup_name
+    row[COL_AD_TYPE] = ad_type_str
+    row[COL_AD_STATUS] = 'ENABLED'
+    row[COL_FINAL_URL] = final_url
+    row[COL_PATH1] = path1
+    row[COL_PATH2] = path2
     
+    # Add headlines and descriptions
+    row[COL_HEADLINE_1:COL_HEADLINE_1 + 15] = headlines
+    row[COL_DESCRIPTION_1:COL_DESCRIPTION_1 + 4] = descriptions
+    
+    return row, result
+
+
+def create_ad_row(campaign_name: str, adgroup_name: str, ad: Dict[str, Any],
+                 validation_errors: List[ValidationError]) -> CSVRow:
+    """Create an AD row with field length validation (issues appended to validation_errors)"""
+    row, result = build_ad_row(campaign_name, adgroup_name, ad)
+    validation_errors.extend(result.issues)
     return row
 
 
 def create_location_row(campaign_name: str, location_type: str, 
-                       location_code: str) -> Dict[str, str]:
+                       location_code: str) -> CSVRow:
     """Create a LOCATION targeting row"""
     row = create_campaign_row(campaign_name)
-    row.update({
-        'Row Type': 'LOCATION',
-        'Location Type': location_type.upper(),
-        'Location Code': str(location_code).strip(),
-    })
+    row[COL_ROW_TYPE] = 'LOCATION'
+    row[COL_LOCATION_TYPE] = location_type.upper()
+    row[COL_LOCATION_CODE] = str(location_code).strip()
     return row
 
 
+# Columns each builder fills per row. Every other column holds the same value on
+# all rows of that type within a campaign, which RowEncoder relies on.
+ROW_LAYOUT_COLUMNS = {
+    'ADGROUP': (COL_ADGROUP, COL_DEFAULT_MAX_CPC),
+    'KEYWORD': (COL_ADGROUP, COL_KEYWORD, COL_MATCH_TYPE, COL_KEYWORD_MAX_CPC, COL_KEYWORD_FINAL_URL),
+    'NEGATIVE_KEYWORD': (COL_ADGROUP, COL_NEGATIVE_KEYWORD, COL_MATCH_TYPE),
+    'AD': (COL_ADGROUP, COL_AD_TYPE, *range(COL_HEADLINE_1, COL_HEADLINE_1 + 15),
+           *range(COL_DESCRIPTION_1, COL_DESCRIPTION_1 + 4), COL_FINAL_URL, COL_PATH1, COL_PATH2),
+    'LOCATION': (COL_LOCATION_TYPE, COL_LOCATION_CODE),
+}
+
+
+def _layout_templates(campaign_name: str) -> Dict[str, CSVRow]:
+    # One row per layout as the builders make it, for the constant columns
+    return {
+        'ADGROUP': create_adgroup_row(campaign_name, ''),
+        'KEYWORD': create_keyword_row(campaign_name, '', '', ''),
+        'NEGATIVE_KEYWORD': create_negative_keyword_row(campaign_name, '', '', ''),
+        'AD': build_ad_row(campaign_name, '', {})[0],
+        'LOCATION': create_location_row(campaign_name, '', ''),
+    }
+
+
+# Bulk location targeting: location_targeting['bulk'] maps a location type to a
+# plain list of codes, e.g. {'ZIP': ['10001', ...], 'CITY': [...]}. Those rows are
+# encoded straight to CSV text, BULK_LOCATION_CHUNK rows per EncodedChunk.
+BULK_LOCATION_CHUNK = 1000
+
+_NEEDS_QUOTING = re.compile(r'[,"\r\n]')
+
+
+class EncodedChunk:
+    """Already-encoded CSV rows (CRLF-terminated); writers pass the text through"""
+    __slots__ = ('text', 'row_count')
+
+    def __init__(self, text: str, row_count: int):
+        self.text = text
+        self.row_count = row_count
+
+
+def row_count_of(row) -> int:
+    """Number of CSV rows a generated item stands for (EncodedChunk or single row)"""
+    return row.row_count if isinstance(row, EncodedChunk) else 1
+
+
+def _encode_fields(values: List[str]) -> str:
+    # csv.writer encoding of values, without the line terminator
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator='\r\n').writerow(values)
+    return buffer.getvalue()[:-2]
+
+
+def _encode_field(value: str) -> str:
+    # Same minimal quoting as csv.writer for a single field
+    if _NEEDS_QUOTING.search(value) is None:
+        return value
+    return '"' + value.replace('"', '""') + '"'
+
+
+class _QuotedFields(dict):
+    """value -> _encode_field(value), memoized up to max_entries (ad group names, match types, ...)"""
+
+    def __init__(self, max_entries: int = 65536):
+        super().__init__()
+        self.max_entries = max_entries
+
+    def __missing__(self, value: str) -> str:
+        quoted = _encode_field(value)
+        if len(self) < self.max_entries:
+            self[value] = quoted
+        return quoted
+
+
+def iter_bulk_location_chunks(campaign_name: str, bulk: Dict[str, List[Any]],
+                              chunk_rows: int = BULK_LOCATION_CHUNK) -> Iterator[EncodedChunk]:
+    """
+    LOCATION rows for compact {type: [code, ...]} targeting, in type order then
+    code order. Codes are stripped, empty ones skipped, and each code is emitted
+    once per type. Only the code column varies per row; the rest of the line is
+    encoded once per type.
+    """
+    for location_type, codes in bulk.items():
+        template = create_location_row(campaign_name, location_type, '')
+        prefix = _encode_fields(template[:COL_LOCATION_CODE]) + ','
+        suffix = ',' + _encode_fields(template[COL_LOCATION_CODE + 1:]) + '\r\n'
+        
+        seen = set()
+        lines = []
+        for code in codes:
+            code = str(code).strip() if code else ''
+            if not code or code in seen:
+                continue
+            seen.add(code)
+            lines.append(prefix + _encode_field(code) + suffix)
+            if len(lines) == chunk_rows:
+                yield EncodedChunk(''.join(lines), len(lines))
+                lines = []
+        if lines:
+            yield EncodedChunk(''.join(lines), len(lines))
+
+
 # ============================================================================
 # CSV GENERATION WITH PROPER FORMATTING
 # ============================================================================
 
-def generate_csv_rows(request: CampaignExportRequest, 
-                     validation_errors: List[ValidationError]) -> List[Dict[str, str]]:
-    """Generate all CSV rows from request"""
-    rows = []
+def iter_adgroup_rows(campaign_name: str, adgroup: Dict[str, Any],
+                      validation_errors: List[ValidationError], line: int):
+    """
+    Rows of one ad group: ADGROUP, keywords, ads, negatives. `line` is the CSV
+    line of the first row; the line after the last row is the generator's
+    return value (`line = yield from iter_adgroup_rows(...)`)
+    """
+    adgroup_name = adgroup.get('name', '').strip()
+    if not adgroup_name:
+        validation_errors.append(ValidationError(
+            field='AdGroup name',
+            message='AdGroup name is required',
+            severity='error'
+        ))
+        return line
     
-    # Campaign row
-    rows.append(create_campaign_row(
-        request.campaign_name,
-        request.budget,
-        request.bidding_strategy or "MANUAL_CPC"
-    ))
+    # AdGroup row
+    yield create_adgroup_row(
+        campaign_name,
+        adgroup_name,
+        adgroup.get('defaultMaxCPC')
+    )
+    line += 1
     
-    # Process ad groups
-    for adgroup in request.ad_groups:
-        adgroup_name = adgroup.get('name', '').strip()
-        if not adgroup_name:
-            validation_errors.append(ValidationError(
-                field='AdGroup name',
-                message='AdGroup name is required',
-                severity='error'
-            ))
-            continue
-        
-        # AdGroup row
-        rows.append(create_adgroup_row(
-            request.campaign_name,
-            adgroup_name,
-            adgroup.get('defaultMaxCPC')
-        ))
-        
-        # Keywords
-        keywords = adgroup.get('keywords', [])
-        for keyword in keywords:
-            if isinstance(keyword, str):
-                rows.append(create_keyword_row(
-                    request.campaign_name,
-                    adgroup_name,
-                    keyword
-                ))
-            elif isinstance(keyword, dict):
-                rows.append(create_keyword_row(
-                    request.campaign_name,
-                    adgroup_name,
-                    keyword.get('text', keyword.get('keyword', '')),
-                    keyword.get('matchType'),
-                    keyword.get('maxCPC'),
-                    keyword.get('finalURL')
-                ))
-        
-        # Ads
-        ads = adgroup.get('ads', [])
-        for ad in ads:
-            ad_row = create_ad_row(request.campaign_name, adgroup_name, ad, validation_errors)
-            # Only add row if no fatal errors
-            fatal_errors = [e for e in validation_errors if e.severity == 'error' and e.field in ['Final URL', 'Headlines', 'Descriptions']]
-            if not any(e.field in ['Final URL', 'Headlines', 'Descriptions'] for e in validation_errors[-3:]):
-                rows.append(ad_row)
-        
-        # Negative keywords
-        negative_keywords = adgroup.get('negativeKeywords', [])
-        for neg_kw in negative_keywords:
-            match_type, clean_kw = parse_match_type(neg_kw if isinstance(neg_kw, str) else neg_kw.get('text', ''))
-            if clean_kw:
-                row = create_campaign_row(request.campaign_name)
-                row.update({
-                    'Row Type': 'NEGATIVE_KEYWORD',
-                    'AdGroup': adgroup_name,
-                    'Negative Keyword': clean_kw,
-                    'Match Type': match_type,
-                })
-                rows.append(row)
+    # Keywords
+    keywords = adgroup.get('keywords', [])
+    for keyword in keywords:
+        if isinstance(keyword, str):
+            yield create_keyword_row(
+                campaign_name,
+                adgroup_name,
+                keyword
+            )
+            line += 1
+        elif isinstance(keyword, dict):
+            yield create_keyword_row(
+                campaign_name,
+                adgroup_name,
+                keyword.get('text', keyword.get('keyword', '')),
+                keyword.get('matchType'),
+                keyword.get('maxCPC'),
+                keyword.get('finalURL')
+            )
+            line += 1
     
-    # Location targeting
-    if request.location_targeting:
-        locations = request.location_targeting.get('locations', [])
+    # Ads
+    ads = adgroup.get('ads', [])
+    for ad in ads:
+        ad_row, result = build_ad_row(campaign_name, adgroup_name, ad, line)
+        validation_errors.extend(result.issues)
+        # Only add row if no fatal errors
+        if result.ok:
+            yield ad_row
+            line += 1
+    
+    # Negative keywords
+    negative_keywords = adgroup.get('negativeKeywords', [])
+    for neg_kw in negative_keywords:
+        match_type, clean_kw = parse_match_type(neg_kw if isinstance(neg_kw, str) else neg_kw.get('text', ''))
+        if clean_kw:
+            yield create_negative_keyword_row(
+                campaign_name,
+                adgroup_name,
+                clean_kw,
+                match_type
+            )
+            line += 1
+    
+    return line
+
+
+def iter_location_rows(campaign_name: str, location_targeting: Optional[Dict[str, Any]]) -> Iterator[CSVRow]:
+    """LOCATION rows for the campaign's location targeting ('bulk' codes as EncodedChunks)"""
+    if location_targeting:
+        locations = location_targeting.get('locations', [])
         for loc in locations:
             loc_type = loc.get('type', 'COUNTRY')
             loc_code = loc.get('code', loc.get('value', ''))
             if loc_code:
-                rows.append(create_location_row(
-                    request.campaign_name,
+                yield create_location_row(
+                    campaign_name,
                     loc_type,
                     loc_code
-                ))
+                )
+        
+        bulk = location_targeting.get('bulk')
+        if bulk:
+            yield from iter_bulk_location_chunks(campaign_name, bulk)
+
+
+def iter_campaign_rows(campaign_name: str, ad_groups: Iterable[Dict[str, Any]],
+                       validation_errors: List[ValidationError],
+                       budget: Optional[float] = None,
+                       bidding_strategy: Optional[str] = "MANUAL_CPC",
+                       location_targeting: Optional[Dict[str, Any]] = None) -> Iterator[CSVRow]:
+    """
+    Generate CSV rows one at a time (validation errors appended as they occur)
+    Ads with errors are left out; their issues carry the line the ad would have had.
+    ad_groups may be any iterable (consumed once), e.g. ad groups mapped on the fly
+    """
+    # Campaign row
+    yield create_campaign_row(
+        campaign_name,
+        budget,
+        bidding_strategy or "MANUAL_CPC"
+    )
+    line = 3  # CSV line of the next row; header is line 1, campaign line 2
+    
+    # Process ad groups
+    for adgroup in ad_groups:
+        line = yield from iter_adgroup_rows(campaign_name, adgroup, validation_errors, line)
     
-    return rows
+    # Location targeting
+    yield from iter_location_rows(campaign_name, location_targeting)
+
+
+def iter_csv_rows(request: CampaignExportRequest,
+                  validation_errors: List[ValidationError]) -> Iterator[CSVRow]:
+    """Generate CSV rows from request one at a time (see iter_campaign_rows)"""
+    return iter_campaign_rows(request.campaign_name, request.ad_groups, validation_errors,
+                              request.budget, request.bidding_strategy, request.location_targeting)
+
+
+def generate_csv_rows(request: CampaignExportRequest, 
+                     validation_errors: List[ValidationError]) -> List[CSVRow]:
+    """Generate all CSV rows from request"""
+    return list(iter_csv_rows(request, validation_errors))
+
+
+def row_values(row) -> CSVRow:
+    """Positional values for a row; dict rows (keyed by header) are still accepted"""
+    if isinstance(row, dict):
+        return [row.get(header, '') for header in GOOGLE_ADS_EDITOR_HEADERS]
+    return row
+
+
+def row_structure_error(values: CSVRow) -> Optional[str]:
+    """
+    Structural check done while encoding: exactly NUM_COLUMNS fields and a Row Type.
+    csv.writer quotes every str containing a delimiter, quote or line break, so
+    a row passing this check always reads back as NUM_COLUMNS fields.
+    """
+    if len(values) != NUM_COLUMNS:
+        return f'has {len(values)} fields, expected {NUM_COLUMNS}'
+    row_type = values[COL_ROW_TYPE]
+    if not row_type or not isinstance(row_type, str):
+        return f'has Row Type {row_type!r}, expected a row type name'
+    return None
+
+
+def coerce_fields(values: CSVRow) -> CSVRow:
+    """Fields as csv.writer writes them: None as '', other non-str values through str()"""
+    try:
+        ''.join(values)  # C-level type check of every field
+    except TypeError:
+        return ['' if value is None else value if isinstance(value, str) else str(value)
+                for value in values]
+    return values
+
+
+class RowEncoder:
+    """
+    CSV line encoder for the builder rows of one campaign.
+
+    For each ROW_LAYOUT_COLUMNS row type the constant columns (campaign name,
+    statuses, 'NEW', runs of empty columns) are quoted once into fragments;
+    a row is then the fragments interleaved with its few variable columns,
+    quoted with the same minimal quoting as csv.writer (memoized per value). Other row types
+    (CAMPAIGN) go through csv.writer. Output is byte-identical to csv.writer
+    for rows made by the create_*_row builders with this campaign name.
+    """
+
+    def __init__(self, campaign_name: str):
+        self._quoted = _QuotedFields().__getitem__
+        self._buffer = io.StringIO()
+        self._writerow = csv.writer(self._buffer, lineterminator='\r\n').writerow
+        self._layouts = {
+            row_type: self._compile(template, ROW_LAYOUT_COLUMNS[row_type])
+            for row_type, template in _layout_templates(campaign_name).items()
+        }
+
+    @staticmethod
+    def _compile(template: CSVRow, columns: tuple):
+        variable = set(columns)
+        tokens = [None if i in variable else _encode_field(value) for i, value in enumerate(template)]
+        # Fragments sit between variable columns; '{}' slots take the quoted values
+        line = ','.join('{}' if token is None else token.replace('{', '{{').replace('}', '}}')
+                        for token in tokens)
+        order = sorted(columns)
+        return line + '\r\n', itemgetter(*order)
+
+    def encode(self, row: CSVRow) -> str:
+        """CRLF-terminated CSV line for a row with NUM_COLUMNS str fields"""
+        layout = self._layouts.get(row[COL_ROW_TYPE])
+        if layout is None:
+            self._buffer.seek(0)
+            self._buffer.truncate(0)
+            self._writerow(row)
+            return self._buffer.getvalue()
+        line, getter = layout
+        values = getter(row)
+        if _NEEDS_QUOTING.search(''.join(values)) is None:  # nothing to quote (the common case)
+            return line.format(*values)
+        return line.format(*map(self._quoted, values))
+
+
+class CSVRowWriter:
+    """
+    csv.writer with CRLF line endings that validates each row as it is encoded.
+    Non-str fields are written as csv.writer writes them (coerce_fields).
+    Rows failing row_structure_error are not written; an error is recorded
+    instead, with row_index = the row's line in the file (header is row 1).
+    EncodedChunks are written as they are. With campaign_name, rows are
+    encoded by a RowEncoder (builder rows of that campaign only).
+    """
+
+    def __init__(self, output, errors: Optional[List[ValidationError]] = None, first_line: int = 2,
+                 campaign_name: Optional[str] = None):
+        self._output = output
+        self._writerow = csv.writer(output, lineterminator='\r\n').writerow  # CRLF for Windows/Google Ads Editor
+        if campaign_name is not None:
+            encode = RowEncoder(campaign_name).encode
+            self._writerow = lambda values: output.write(encode(values))
+        self.errors = errors if errors is not None else []
+        self.row_index = first_line - 1
+
+    def writeheader(self) -> None:
+        self._writerow(GOOGLE_ADS_EDITOR_HEADERS)
+
+    def writerow(self, row) -> bool:
+        if isinstance(row, EncodedChunk):
+            self._output.write(row.text)
+            self.row_index += row.row_count
+            return True
+        values = row_values(row)
+        self.row_index += 1
+        problem = row_structure_error(values)
+        if problem:
+            self.errors.append(ValidationError(
+                row_index=self.row_index,
+                field='Row',
+                message=f'Row {self.row_index} {problem}',
+                severity='error'
+            ))
+            return False
+        self._writerow(coerce_fields(values))
+        return True
 
 
-def generate_csv_content(rows: List[Dict[str, str]]) -> str:
+def generate_csv_content(rows: List[CSVRow], errors: Optional[List[ValidationError]] = None,
+                         campaign_name: Optional[str] = None) -> str:
     """
     Generate CSV content with proper formatting:
     - UTF-8 BOM
     - CRLF line endings
     - Proper quoting and escaping
+    Structurally invalid rows are skipped and reported in `errors`.
+    Pass campaign_name when rows come straight from the builders (faster RowEncoder path)
+    """
+    return encode_csv_rows(rows, errors, campaign_name)[0]
+
+
+def encode_csv_rows(rows: Iterable[CSVRow], errors: Optional[List[ValidationError]] = None,
+                    campaign_name: Optional[str] = None) -> tuple:
+    """
+    generate_csv_content in one pass over any row iterable: a generator is
+    encoded as it yields and no row list is kept. Returns (csv_content, row_count);
+    row_count includes rows rejected by the structure check.
     """
     output = io.StringIO()
-    writer = csv.DictWriter(
-        output,
-        fieldnames=GOOGLE_ADS_EDITOR_HEADERS,
-        extrasaction='ignore',  # Ignore extra fields not in headers
-        lineterminator='\r\n'  # CRLF for Windows/Google Ads Editor
-    )
+    writer = CSVRowWriter(output, errors, campaign_name=campaign_name)
     
     writer.writeheader()
+    row_count = 0
     for row in rows:
-        # Ensure all header fields exist in row
-        complete_row = {header: row.get(header, '') for header in GOOGLE_ADS_EDITOR_HEADERS}
-        writer.writerow(complete_row)
+        writer.writerow(row)
+        row_count += row_count_of(row)
     
     csv_content = output.getvalue()
     output.close()
     
     # Add UTF-8 BOM
-    return '\ufeff' + csv_content
+    return '\ufeff' + csv_content, row_count
 
 
 # ============================================================================
 # VALIDATION & POST-CHECK
 # ============================================================================
 
+# Re-parse every generated file after writing (rows are already checked as they are encoded)
+CSV_EXPORT_DEBUG_VALIDATE = os.environ.get('CSV_EXPORT_DEBUG_VALIDATE', '').lower() in ('1', 'true', 'yes')
+
+
 def validate_csv_content(csv_content: str) -> tuple[bool, List[ValidationError]]:
     """
-    Post-check CSV content using csv.reader (robust field counting)
+    Debug post-check: one streaming csv.reader pass over the finished content
+    (quoted fields may span lines). row_index is the record number, header = 1.
     Returns: (is_valid, errors)
     """
     errors = []
-    lines = csv_content.split('\r\n')
+    reader = csv.reader(io.StringIO(csv_content.lstrip('\ufeff'), newline=''))
     
-    if len(lines) < 2:  # Header + at least one row
+    row_count = 0
+    try:
+        for i, fields in enumerate(reader, start=1):
+            row_count = i
+            if len(fields) != len(GOOGLE_ADS_EDITOR_HEADERS):
+                errors.append(ValidationError(
+                    row_index=i,
+                    field='Header' if i == 1 else 'Row',
+                    message=f"{'Header' if i == 1 else f'Row {i}'} has {len(fields)} fields, expected {len(GOOGLE_ADS_EDITOR_HEADERS)}",
+                    severity='error'
+                ))
+    except csv.Error as e:
         errors.append(ValidationError(
-            field='CSV',
-            message='CSV must contain at least a header and one data row',
+            row_index=row_count + 1,
+            field='Row',
+            message=f'Row {row_count + 1} parsing error: {str(e)}',
             severity='error'
         ))
-        return False, errors
     
-    # Check header
-    header_line = lines[0]
-    reader = csv.reader([header_line])
-    header_fields = next(reader)
-    
-    if len(header_fields) != len(GOOGLE_ADS_EDITOR_HEADERS):
+    if row_count < 2:  # Header + at least one row
         errors.append(ValidationError(
-            field='Header',
-            message=f'Header has {len(header_fields)} fields, expected {len(GOOGLE_ADS_EDITOR_HEADERS)}',
+            field='CSV',
+            message='CSV must contain at least a header and one data row',
             severity='error'
         ))
     
-    # Check each row has correct field count
-    for i, line in enumerate(lines[1:], start=2):
-        if not line.strip():
-            continue
-        reader = csv.reader([line])
-        try:
-            fields = next(reader)
-            if len(fields) != len(GOOGLE_ADS_EDITOR_HEADERS):
-                errors.append(ValidationError(
-                    row_index=i,
-                    field='Row',
-                    message=f'Row {i} has {len(fields)} fields, expected {len(GOOGLE_ADS_EDITOR_HEADERS)}',
-                    severity='error'
-                ))
-        except Exception as e:
-            errors.append(ValidationError(
-                row_index=i,
-                field='Row',
-                message=f'Row {i} parsing error: {str(e)}',
-                severity='error'
-            ))
-    
     return len([e for e in errors if e.severity == 'error']) == 0, errors
 
 
+# ============================================================================
+# PARALLEL ROW GENERATION (opt-in)
+# ============================================================================
+
+# Worker processes for export_campaign_to_csv; 0/1 = generate rows serially
+CSV_EXPORT_WORKERS = int(os.environ.get('CSV_EXPORT_WORKERS', '0'))
+CSV_EXPORT_POOL = os.environ.get('CSV_EXPORT_POOL', 'process')  # "process" or "thread"
+CSV_EXPORT_SHARD_SIZE = int(os.environ.get('CSV_EXPORT_SHARD_SIZE', '250'))  # ad groups per worker task
+
+# Shard pools are created on first use and reused by every export in this process
+# (one per pool kind and worker count, normally just CSV_EXPORT_WORKERS)
+_shard_pools: Dict[tuple, Any] = {}
+_shard_pools_pid = None
+_shard_pools_lock = threading.Lock()
+
+
+def get_shard_pool(pool: str, workers: int):
+    """Long-lived ThreadPoolExecutor / ProcessPoolExecutor with `workers` workers for ad group shards"""
+    global _shard_pools_pid
+    with _shard_pools_lock:
+        if _shard_pools_pid != os.getpid():  # forked: the parent's pools are not ours
+            _shard_pools.clear()
+            _shard_pools_pid = os.getpid()
+        key = (pool, workers)
+        executor = _shard_pools.get(key)
+        if executor is None or getattr(executor, '_broken', False):
+            if pool == 'thread':
+                executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='csv-shard')
+            else:
+                executor = ProcessPoolExecutor(max_workers=workers)
+            _shard_pools[key] = executor
+        return executor
+
+
+@atexit.register
+def shutdown_shard_pools(wait: bool = False) -> None:
+    with _shard_pools_lock:
+        if _shard_pools_pid == os.getpid():
+            for executor in _shard_pools.values():
+                executor.shutdown(wait=wait, cancel_futures=not wait)
+        _shard_pools.clear()
+
+
+def encode_adgroup_shard(campaign_name: str, ad_groups: List[Dict[str, Any]]
+                         ) -> tuple[str, int, List[ValidationError], List[ValidationError]]:
+    """
+    Worker task: generate and encode a run of ad groups.
+    Returns (CRLF-terminated CSV text, rows generated, validation issues,
+    structural errors). row_index values are relative to the shard's first
+    row (0) and offset by the caller.
+    """
+    issues: List[ValidationError] = []
+    write_errors: List[ValidationError] = []
+    output = io.StringIO()
+    writer = CSVRowWriter(output, write_errors, first_line=0, campaign_name=campaign_name)
+    line = 0
+    for adgroup in ad_groups:
+        for row in iter_adgroup_rows(campaign_name, adgroup, issues, line):
+            writer.writerow(row)
+            line += 1
+    return output.getvalue(), line, issues, write_errors
+
+
+def generate_csv_content_parallel(request: CampaignExportRequest, validation_errors: List[ValidationError],
+                                  workers: int, write_errors: Optional[List[ValidationError]] = None,
+                                  pool: Optional[str] = None,
+                                  shard_size: Optional[int] = None) -> tuple[str, int]:
+    """
+    Same as generate_csv_content(generate_csv_rows(request, validation_errors), write_errors),
+    with ad groups sharded across a shared process (or thread) pool. Shards are stitched
+    back in ad group order and their issues re-numbered to absolute CSV lines,
+    so output and validation results match the serial path.
+    Returns: (csv_content, row_count)
+    """
+    write_errors = write_errors if write_errors is not None else []
+    pool = pool or CSV_EXPORT_POOL
+    shard_size = shard_size or CSV_EXPORT_SHARD_SIZE
+    shards = [request.ad_groups[i:i + shard_size] for i in range(0, len(request.ad_groups), shard_size)]
+    executor = get_shard_pool(pool, workers)
+    
+    output = io.StringIO()
+    writer = CSVRowWriter(output, write_errors, campaign_name=request.campaign_name)
+    writer.writeheader()
+    writer.writerow(create_campaign_row(
+        request.campaign_name,
+        request.budget,
+        request.bidding_strategy or "MANUAL_CPC"
+    ))
+    line = 3
+    
+    futures = [executor.submit(encode_adgroup_shard, request.campaign_name, shard) for shard in shards]
+    try:
+        for future in futures:  # submission order = ad group order
+            text, row_count, issues, shard_write_errors = future.result()
+            for issue in issues + shard_write_errors:
+                if issue.row_index is not None:
+                    issue.row_index += line
+            validation_errors.extend(issues)
+            write_errors.extend(shard_write_errors)
+            output.write(text)
+            line += row_count
+    finally:
+        for future in futures:
+            future.cancel()  # a shard failed: don't keep the shared pool busy with the rest
+    
+    writer.row_index = line - 1
+    for row in iter_location_rows(request.campaign_name, request.location_targeting):
+        writer.writerow(row)
+        line += row_count_of(row)
+    
+    return '\ufeff' + output.getvalue(), line - 2
+
+
 # ============================================================================
 # MAIN EXPORT FUNCTION
 # ============================================================================
 
+def export_filename(campaign_name: str) -> str:
+    """Download filename: campaign name reduced to safe characters + today's date"""
+    safe_name = ''.join(c for c in campaign_name if c.isalnum() or c in (' ', '-', '_')).strip()
+    return f"{safe_name}_{datetime.now().strftime('%Y%m%d')}.csv"
+
+
 def estimate_export_size(request: CampaignExportRequest) -> int:
     """
     Estimate the number of rows that will be generated
@@ -597,30 +998,71 @@ def estimate_export_size(request: CampaignExportRequest) -> int:
     """
     estimated_rows = 1  # Campaign row
     
-    for adgroup in request.ad_groups:
+    ad_groups = request.ad_groups
+    if hasattr(ad_groups, 'unchecked'):
+        # export_payloads.CheckedList: count without checking items (that happens during the export)
+        ad_groups = ad_groups.unchecked()
+    
+    for adgroup in ad_groups:
         estimated_rows += 1  # AdGroup row
-        estimated_rows += len(adgroup.get('keywords', []))  # Keywords
-        estimated_rows += len(adgroup.get('ads', []))  # Ads
-        estimated_rows += len(adgroup.get('negativeKeywords', []))  # Negative keywords
+        if not isinstance(adgroup, dict):
+            continue
+        for key in ('keywords', 'ads', 'negativeKeywords'):  # Keywords, ads, negative keywords
+            items = adgroup.get(key)
+            if isinstance(items, list):
+                estimated_rows += len(items)
     
     if request.location_targeting:
         estimated_rows += len(request.location_targeting.get('locations', []))
+        estimated_rows += sum(len(codes) for codes in (request.location_targeting.get('bulk') or {}).values())
     
     return estimated_rows
 
 
-def export_campaign_to_csv(request: CampaignExportRequest) -> CSVExportResponse:
+def export_campaign_to_csv(request: CampaignExportRequest,
+                           debug_validate: Optional[bool] = None,
+                           workers: Optional[int] = None) -> CSVExportResponse:
     """
     Main function to export campaign to CSV with full validation
+    Rows are checked as they are encoded; debug_validate (default:
+    CSV_EXPORT_DEBUG_VALIDATE) additionally re-parses the finished file.
+    workers > 1 (default: CSV_EXPORT_WORKERS) generates ad groups in parallel
     """
     validation_errors = []
-    warnings = []
+    workers = CSV_EXPORT_WORKERS if workers is None else workers
+    
+    def produce(post_errors):
+        if workers > 1 and len(request.ad_groups) > CSV_EXPORT_SHARD_SIZE:
+            # Generate and encode in worker processes (row structure checked there)
+            return generate_csv_content_parallel(request, validation_errors, workers, post_errors)
+        # Generate and encode rows in one pass, validating row structure as they are written
+        return encode_csv_rows(iter_csv_rows(request, validation_errors), post_errors, request.campaign_name)
+    
+    return _export_response(request.campaign_name, validation_errors, produce, debug_validate)
+
+
+def export_rows_to_csv(campaign_name: str, rows: Iterable[CSVRow],
+                       validation_errors: List[ValidationError],
+                       debug_validate: Optional[bool] = None) -> CSVExportResponse:
+    """
+    export_campaign_to_csv for rows produced elsewhere (e.g. straight from a
+    frontend payload): `rows` is consumed once, appending its validation issues
+    to validation_errors as it goes, and must be builder rows of campaign_name
+    """
+    def produce(post_errors):
+        return encode_csv_rows(rows, post_errors, campaign_name)
     
+    return _export_response(campaign_name, validation_errors, produce, debug_validate)
+
+
+def _export_response(campaign_name: str, validation_errors: List[ValidationError],
+                     produce, debug_validate: Optional[bool]) -> CSVExportResponse:
+    # produce(post_errors) -> (csv_content, row_count); fatal validation errors veto the file
     try:
-        # Generate rows
-        rows = generate_csv_rows(request, validation_errors)
+        post_errors = []
+        csv_content, row_count = produce(post_errors)
         
-        if not rows:
+        if not row_count:
             return CSVExportResponse(
                 success=False,
                 validation_errors=[ValidationError(
@@ -635,34 +1077,31 @@ def export_campaign_to_csv(request: CampaignExportRequest) -> CSVExportResponse:
         errors = [e for e in validation_errors if e.severity == 'error']
         warnings = [e for e in validation_errors if e.severity == 'warning']
         
-        # If fatal errors, don't generate CSV
+        # If fatal errors, don't return the CSV
         if errors:
             return CSVExportResponse(
                 success=False,
                 validation_errors=errors,
                 warnings=warnings,
-                row_count=len(rows),
+                row_count=row_count,
                 message=f'Export failed: {len(errors)} validation error(s)'
             )
         
-        # Generate CSV content
-        csv_content = generate_csv_content(rows)
+        # Debug: re-parse the whole file
+        if debug_validate if debug_validate is not None else CSV_EXPORT_DEBUG_VALIDATE:
+            post_errors.extend(validate_csv_content(csv_content)[1])
         
-        # Post-validate CSV content
-        is_valid, post_errors = validate_csv_content(csv_content)
-        if not is_valid:
+        if post_errors:
             errors.extend(post_errors)
             return CSVExportResponse(
                 success=False,
                 validation_errors=errors,
                 warnings=warnings,
-                row_count=len(rows),
+                row_count=row_count,
                 message=f'CSV validation failed: {len(post_errors)} error(s)'
             )
         
-        # Generate filename
-        safe_name = ''.join(c for c in request.campaign_name if c.isalnum() or c in (' ', '-', '_')).strip()
-        filename = f"{safe_name}_{datetime.now().strftime('%Y%m%d')}.csv"
+        filename = export_filename(campaign_name)
         
         return CSVExportResponse(
             success=True,
@@ -670,8 +1109,8 @@ def export_campaign_to_csv(request: CampaignExportRequest) -> CSVExportResponse:
             filename=filename,
             validation_errors=[],
             warnings=warnings,
-            row_count=len(rows),
-            message=f'CSV exported successfully: {len(rows)} rows'
+            row_count=row_count,
+            message=f'CSV exported successfully: {row_count} rows'
         )
         
     except Exception as e:
@@ -685,3 +1124,142 @@ def export_campaign_to_csv(request: CampaignExportRequest) -> CSVExportResponse:
             message=f'Export error: {str(e)}'
         )
 
+
+# ============================================================================
+# STREAMING EXPORT
+# ============================================================================
+
+# Sidecar validation reports for streamed exports (JSON, one file per export id),
+# deleted EXPORT_REPORT_TTL seconds after they are written (default: EXPORT_JOB_TTL)
+EXPORT_REPORT_DIR = os.environ.get(
+    'EXPORT_REPORT_DIR', os.path.join(tempfile.gettempdir(), 'adiology_export_reports')
+)
+EXPORT_REPORT_TTL = float(os.environ.get('EXPORT_REPORT_TTL', EXPORT_JOB_TTL))
+STREAM_CHUNK_ROWS = 500
+
+
+def iter_csv_chunks(rows: Iterable[CSVRow], chunk_rows: int = STREAM_CHUNK_ROWS,
+                    errors: Optional[List[ValidationError]] = None,
+                    campaign_name: Optional[str] = None) -> Iterator[str]:
+    """
+    Encode rows incrementally: BOM + header first, then CRLF-terminated chunks
+    of up to `chunk_rows` rows. Concatenated output equals generate_csv_content().
+    """
+    buffer = io.StringIO()
+    writer = CSVRowWriter(buffer, errors, campaign_name=campaign_name)
+    writer.writeheader()
+    yield '\ufeff' + buffer.getvalue()
+
+    pending = 0
+    buffer.seek(0)
+    buffer.truncate(0)
+    for row in rows:
+        if not writer.writerow(row):
+            continue
+        pending += row_count_of(row)
+        if pending >= chunk_rows:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            pending = 0
+    if pending:
+        yield buffer.getvalue()
+
+
+def export_report_path(export_id: str) -> str:
+    """Sidecar report location; export ids are UUIDs (anything else raises ValueError)"""
+    return os.path.join(EXPORT_REPORT_DIR, f"{uuid.UUID(export_id)}.json")
+
+
+def load_export_report(export_id: str) -> Optional[Dict[str, Any]]:
+    """Sidecar report for a streamed export, or None if unknown/expired/not written yet"""
+    try:
+        with open(export_report_path(export_id), 'r', encoding='utf-8') as f:
+            if os.fstat(f.fileno()).st_mtime < time.time() - EXPORT_REPORT_TTL:
+                return None
+            return json.load(f)
+    except (ValueError, OSError):
+        return None
+
+
+def evict_expired_reports() -> int:
+    """Delete sidecar reports (and abandoned .tmp files) older than EXPORT_REPORT_TTL; returns how many"""
+    cutoff = time.time() - EXPORT_REPORT_TTL
+    evicted = 0
+    try:
+        entries = list(os.scandir(EXPORT_REPORT_DIR))
+    except OSError:
+        return 0
+    for entry in entries:
+        try:
+            if entry.name.endswith(('.json', '.tmp')) and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                evicted += 1
+        except OSError:
+            pass  # removed by another worker, or unreadable
+    return evicted
+
+
+class StreamingCSVExport:
+    """
+    Constant-memory export: rows are generated, validated and encoded chunk by
+    chunk while the response is being sent.
+
+    Because bytes leave before the end of the campaign is reached, validation
+    cannot veto the file the way export_campaign_to_csv does: ads with fatal
+    errors are dropped (as in generate_csv_rows) and every error/warning goes
+    into the report, available from report() after iteration and written as a
+    JSON sidecar (see load_export_report) when iteration ends.
+    """
+
+    def __init__(self, request: CampaignExportRequest, chunk_rows: int = STREAM_CHUNK_ROWS,
+                 export_id: Optional[str] = None, write_report: bool = True):
+        self.request = request
+        self.chunk_rows = chunk_rows
+        self.export_id = export_id or str(uuid.uuid4())
+        self.filename = export_filename(request.campaign_name)
+        self.write_report = write_report
+        self.row_count = 0
+        self.complete = False
+        self.validation_errors: List[ValidationError] = []
+
+    def _rows(self) -> Iterator[CSVRow]:
+        for row in iter_csv_rows(self.request, self.validation_errors):
+            self.row_count += row_count_of(row)
+            yield row
+
+    def __iter__(self) -> Iterator[str]:
+        try:
+            yield from iter_csv_chunks(self._rows(), self.chunk_rows, self.validation_errors,
+                                       self.request.campaign_name)
+            self.complete = True
+        finally:
+            if self.write_report:
+                self._write_report()
+
+    def report(self) -> CSVExportResponse:
+        errors = [e for e in self.validation_errors if e.severity == 'error']
+        warnings = [e for e in self.validation_errors if e.severity == 'warning']
+        if not self.complete:
+            message = f'Export interrupted after {self.row_count} rows'
+        elif errors:
+            message = f'CSV streamed with {len(errors)} validation error(s); affected rows were skipped'
+        else:
+            message = f'CSV exported successfully: {self.row_count} rows'
+        return CSVExportResponse(
+            success=self.complete and not errors,
+            filename=self.filename,
+            validation_errors=errors,
+            warnings=warnings,
+            row_count=self.row_count,
+            message=message
+        )
+
+    def _write_report(self) -> None:
+        os.makedirs(EXPORT_REPORT_DIR, exist_ok=True)
+        path = export_report_path(self.export_id)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'export_id': self.export_id, 'complete': self.complete, **self.report().dict()}, f)
+        os.replace(tmp_path, path)
+        evict_expired_reports()
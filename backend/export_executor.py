@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Export execution layer
+Keeps CPU-bound CSV exports off the event loop: small exports run in a thread
+pool and are awaited, large background jobs run in a process pool. Both pools
+report queue depth and latency.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+EXPORT_THREAD_WORKERS = int(os.environ.get('EXPORT_THREAD_WORKERS', '4'))  # small, awaited exports
+EXPORT_PROCESS_WORKERS = int(os.environ.get('EXPORT_PROCESS_WORKERS', '2'))  # large background jobs, 0 = threads
+LATENCY_WINDOW = 1000  # most recent tasks kept for percentiles
+
+
+def _timed_call(fn: Callable, *args) -> tuple:
+    # Runs in the worker (thread or process): wall-clock start/end travel back with the result
+    started = time.time()
+    result = fn(*args)
+    return started, time.time(), result
+
+
+def _percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+class PoolMetrics:
+    """Queue depth and wait/run latency for one pool"""
+
+    def __init__(self):
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self._wait = deque(maxlen=LATENCY_WINDOW)
+        self._run = deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def submit(self) -> None:
+        with self._lock:
+            self.submitted += 1
+
+    def record(self, submitted_at: float, started: Optional[float], finished: Optional[float], ok: bool) -> None:
+        with self._lock:
+            if ok:
+                self.completed += 1
+                self._wait.append(max(0.0, started - submitted_at))
+                self._run.append(finished - started)
+            else:
+                self.failed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            wait, run = list(self._wait), list(self._run)
+            queue_depth = self.submitted - self.completed - self.failed
+        return {
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "queue_depth": queue_depth,  # submitted, not finished (waiting or running)
+            "wait_p50_s": round(_percentile(wait, 0.5), 4),
+            "wait_p99_s": round(_percentile(wait, 0.99), 4),
+            "run_p50_s": round(_percentile(run, 0.5), 4),
+            "run_p99_s": round(_percentile(run, 0.99), 4),
+        }
+
+
+class ExportExecutor:
+    """
+    Thread pool for exports a request waits on, process pool for background
+    jobs (threads when process_workers is 0). Pools are created on first use
+    and a broken process pool is replaced on the next submit.
+    """
+
+    def __init__(self, thread_workers: int = EXPORT_THREAD_WORKERS, process_workers: int = EXPORT_PROCESS_WORKERS):
+        self.thread_workers = thread_workers
+        self.process_workers = process_workers
+        self.metrics = {"thread": PoolMetrics(), "process": PoolMetrics()}
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _pool(self, kind: str):
+        with self._lock:
+            if kind == "process":
+                if self._processes is None or getattr(self._processes, "_broken", False):
+                    self._processes = ProcessPoolExecutor(max_workers=self.process_workers)
+                return self._processes
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(max_workers=self.thread_workers, thread_name_prefix="export")
+            return self._threads
+
+    def _submit(self, kind: str, fn: Callable, *args) -> Future:
+        metrics = self.metrics[kind]
+        submitted_at = time.time()
+        inner = self._pool(kind).submit(_timed_call, fn, *args)
+        metrics.submit()
+
+        outer: Future = Future()
+
+        def done(f: Future) -> None:
+            error = f.exception()
+            if error is not None:
+                metrics.record(submitted_at, None, None, ok=False)
+                outer.set_exception(error)
+                return
+            started, finished, result = f.result()
+            metrics.record(submitted_at, started, finished, ok=True)
+            outer.set_result(result)
+
+        inner.add_done_callback(done)
+        return outer
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """Await fn(*args) from a coroutine without blocking the event loop (thread pool)"""
+        return await asyncio.wrap_future(self._submit("thread", fn, *args))
+
+    def submit_job(self, fn: Callable, *args, processes: bool = True) -> Future:
+        """
+        Start a background job. fn and args must be picklable when it goes to
+        the process pool; pass processes=False when fn reports through
+        process-local state (e.g. the in-memory job store).
+        """
+        kind = "process" if processes and self.process_workers > 0 else "thread"
+        return self._submit(kind, fn, *args)
+
+    def stats(self) -> Dict[str, Any]:
+        return {kind: metrics.stats() for kind, metrics in self.metrics.items()}
+
+    def shutdown(self, wait: bool = False) -> None:
+        with self._lock:
+            for pool in (self._threads, self._processes):
+                if pool is not None:
+                    pool.shutdown(wait=wait, cancel_futures=not wait)
+            self._threads = self._processes = None
+
+
+_executor: Optional[ExportExecutor] = None
+
+
+def get_export_executor() -> ExportExecutor:
+    """Process-wide executor (configured by EXPORT_THREAD_WORKERS / EXPORT_PROCESS_WORKERS)"""
+    global _executor
+    if _executor is None:
+        _executor = ExportExecutor()
+    return _executor
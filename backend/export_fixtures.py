@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Campaign fixtures for the export tests and benchmarks
+fixtures/zip_campaign.csv is the shipped 10k ZIP campaign (../10k-zip-campaign.csv)
+cut down to its first 1000 ZIP targets
+
+Import: from export_fixtures import large_request, zip_campaign_payload
+"""
+
+import csv
+import os
+
+from export_csv_fix import CampaignExportRequest
+
+
+def large_request(ad_groups: int = 1000, keywords: int = 20, ads: int = 2, zips: int = 10000) -> CampaignExportRequest:
+    """SKAG-style campaign: many ad groups with keywords, ads and negatives, plus ZIP targeting"""
+    return CampaignExportRequest(
+        campaign_name="Bench Campaign",
+        ad_groups=[
+            {
+                "name": f"Ad Group {g}",
+                "keywords": [f"plumber {g} keyword {k}" for k in range(keywords)],
+                "ads": [
+                    {
+                        "type": "rsa",
+                        "headline1": f"Plumber {g}",
+                        "headline2": "Licensed & Insured",
+                        "headline3": "Call Today, Save 10%",
+                        "description1": "Professional plumbing services you can trust.",
+                        "description2": "Fast, reliable service available 24/7.",
+                        "finalUrl": f"https://example.com/{g}",
+                    }
+                    for _ in range(ads)
+                ],
+                "negativeKeywords": ["free", "jobs"],
+            }
+            for g in range(ad_groups)
+        ],
+        location_targeting={"locations": [{"type": "ZIP", "code": f"{10000 + z:05d}"} for z in range(zips)]},
+    )
+
+
+ZIP_CAMPAIGN_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "zip_campaign.csv")
+
+
+def zip_campaign_payload(path: str = ZIP_CAMPAIGN_CSV) -> dict:
+    """
+    Frontend export payload (map_frontend_to_backend kwargs) rebuilt from a
+    ZIP campaign export: ad group, keywords, ads, negatives and ZIP targets
+    """
+    payload = {"campaign_name": "", "ad_groups": [], "generated_ads": [], "negative_keywords": [],
+               "location_targeting": {"zipCodes": []}}
+    keywords = {}
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        header = None
+        for record in csv.reader(f):
+            if not any(record):
+                header = None
+                continue
+            if header is None:
+                header = record
+                continue
+            row = dict(zip(header, record))
+            payload["campaign_name"] = payload["campaign_name"] or row.get("Campaign", "")
+            if "Location Target" in row and row.get("Target Type") == "Postal Code":
+                payload["location_targeting"]["zipCodes"].append(row["Location Target"])
+            elif "Keyword" in row:
+                keywords.setdefault(row["Ad Group"], []).append(row["Keyword"])
+            elif "Ad Group Status" in row:
+                keywords.setdefault(row["Ad Group"], [])
+            elif "Negative Keyword" in row and "Ad Group" not in row:
+                payload["negative_keywords"].append(row["Negative Keyword"])
+            elif row.get("Ad Type") == "Responsive search ad":
+                ad = {"adGroup": row["Ad Group"], "type": "rsa", "finalUrl": row["Final URL"]}
+                ad.update({key.replace(" ", "").lower(): value for key, value in row.items()
+                           if key.startswith(("Headline", "Description", "Path")) and value})
+                payload["generated_ads"].append(ad)
+    payload["ad_groups"] = [{"name": name, "keywords": kws} for name, kws in keywords.items()]
+    return payload
+
+
+def large_frontend_payload(ad_groups: int = 2000, keywords: int = 20, ads: int = 3) -> dict:
+    """Frontend export payload (map_frontend_to_backend kwargs) for a large SKAG-style campaign"""
+    return {
+        "campaign_name": "Bench Campaign",
+        "ad_groups": [{"name": f"Ad Group {g}", "keywords": [f"plumber {g} keyword {k}" for k in range(keywords)],
+                       "negativeKeywords": ["free", "jobs"]} for g in range(ad_groups)],
+        "generated_ads": [{"adGroup": f"Ad Group {g}", "type": "rsa", "headline1": f"Plumber {g}",
+                           "headline2": "Licensed & Insured", "headline3": "Call Today, Save 10%",
+                           "description1": "Professional plumbing services you can trust.",
+                           "description2": "Fast, reliable service available 24/7.",
+                           "finalUrl": f"https://example.com/{g}"}
+                          for g in range(ad_groups) for _ in range(ads)],
+        "location_targeting": {"zipCodes": [f"{10000 + z:05d}" for z in range(10000)]},
+        "negative_keywords": ["diy"],
+    }
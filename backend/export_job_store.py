@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Async CSV export job store
+Small status records per job plus one CSV result file per job, shared by all
+API workers on the host (SQLite backend) or kept in-process (memory backend)
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+EXPORT_JOB_STORE = os.environ.get('EXPORT_JOB_STORE', 'sqlite')  # "sqlite" or "memory"
+EXPORT_JOB_DIR = os.environ.get('EXPORT_JOB_DIR', os.path.join(tempfile.gettempdir(), 'adiology_exports'))
+EXPORT_JOB_TTL = float(os.environ.get('EXPORT_JOB_TTL', '86400'))  # seconds after last update
+EXPORT_PROGRESS_INTERVAL = float(os.environ.get('EXPORT_PROGRESS_INTERVAL', '1.0'))  # min seconds between progress writes
+
+# Validation issues kept on a failed job's record (the rest are only counted)
+MAX_RECORDED_ISSUES = 50
+
+
+def summarize_issues(issues: List[Any]) -> List[Dict[str, Any]]:
+    """First MAX_RECORDED_ISSUES validation errors as plain dicts, for status records"""
+    return [issue.dict() if hasattr(issue, 'dict') else dict(issue) for issue in issues[:MAX_RECORDED_ISSUES]]
+
+
+def job_progress(record: Dict[str, Any], now: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Progress of a job from its record: rows written out of the estimate, measured
+    rows/sec and an ETA from that rate (None until the worker has reported once).
+    Workers record rows_written, elapsed_s (seconds spent so far) and progress_at.
+    """
+    now = time.time() if now is None else now
+    written = record.get('rows_written', 0)
+    estimated = max(record.get('estimated_rows') or 0, written)
+    elapsed = record.get('elapsed_s') or 0.0
+    rate = written / elapsed if elapsed > 0 else None
+    done = record.get('status') == 'completed'
+
+    eta = None
+    if done:
+        eta = 0.0
+    elif rate:
+        since_report = max(0.0, now - record.get('progress_at', now))
+        eta = max(0.0, (estimated - written) / rate - since_report)
+    percent = 100.0 if done else (min(99.9, 100.0 * written / estimated) if estimated else 0.0)
+    return {
+        'rows_written': written,
+        'estimated_rows': estimated,
+        'percent': round(percent, 1),
+        'rows_per_sec': round(rate, 1) if rate else None,
+        'eta_seconds': round(eta, 1) if eta is not None else None,
+    }
+
+
+class ExportJobStore(ABC):
+    """
+    Job records are small JSON-able dicts (status, counts, filename, first
+    errors); CSV results live in `result_dir` as <job_id>.csv and are never
+    held in the record. Records and their files expire `ttl` seconds after
+    the last update.
+
+    Backends implement _load/_save/_delete/_expired. `persistent` tells
+    whether other processes see the same jobs.
+    """
+
+    persistent = False
+
+    def __init__(self, result_dir: str = EXPORT_JOB_DIR, ttl: float = EXPORT_JOB_TTL):
+        self.result_dir = result_dir
+        self.ttl = ttl
+        os.makedirs(result_dir, exist_ok=True)
+
+    # backend hooks ---------------------------------------------------------
+
+    @abstractmethod
+    def _load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Stored record, or None if unknown"""
+
+    @abstractmethod
+    def _save(self, job_id: str, record: Dict[str, Any], expires_at: float) -> None:
+        """Insert or replace the record; it expires at `expires_at` (epoch seconds)"""
+
+    @abstractmethod
+    def _delete(self, job_id: str) -> None:
+        """Remove the record (no-op if unknown)"""
+
+    @abstractmethod
+    def _expired(self, now: float) -> List[str]:
+        """Ids of records that expired at or before `now`"""
+
+    # public API ------------------------------------------------------------
+
+    def result_path(self, job_id: str) -> str:
+        """Result file location; job ids are UUIDs (anything else raises ValueError)"""
+        return os.path.join(self.result_dir, f"{uuid.UUID(job_id)}.csv")
+
+    def create(self, job_id: str, **fields) -> Dict[str, Any]:
+        self.evict_expired()
+        now = datetime.now().isoformat()
+        record = {'job_id': job_id, 'status': 'processing', 'started_at': now, 'updated_at': now, **fields}
+        self._save(job_id, record, time.time() + self.ttl)
+        return record
+
+    def update(self, job_id: str, **fields) -> Optional[Dict[str, Any]]:
+        record = self._load(job_id)
+        if record is None:
+            return None
+        record.update(fields, updated_at=datetime.now().isoformat())
+        self._save(job_id, record, time.time() + self.ttl)
+        return record
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            uuid.UUID(job_id)
+        except ValueError:
+            return None
+        return self._load(job_id)
+
+    def delete(self, job_id: str) -> None:
+        self._delete(job_id)
+        for path in (self.result_path(job_id), self.result_path(job_id) + '.part'):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def evict_expired(self) -> int:
+        """Drop expired records and their result files; returns how many"""
+        expired = self._expired(time.time())
+        for job_id in expired:
+            self.delete(job_id)
+        return len(expired)
+
+
+class MemoryExportJobStore(ExportJobStore):
+    """Records in a process-local dict (single worker / tests); results still go to files"""
+
+    def __init__(self, result_dir: str = EXPORT_JOB_DIR, ttl: float = EXPORT_JOB_TTL):
+        super().__init__(result_dir, ttl)
+        self._records: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, job_id):
+        with self._lock:
+            entry = self._records.get(job_id)
+        return dict(entry[0]) if entry and entry[1] > time.time() else None
+
+    def _save(self, job_id, record, expires_at):
+        with self._lock:
+            self._records[job_id] = (dict(record), expires_at)
+
+    def _delete(self, job_id):
+        with self._lock:
+            self._records.pop(job_id, None)
+
+    def _expired(self, now):
+        with self._lock:
+            return [job_id for job_id, (_, expires_at) in self._records.items() if expires_at <= now]
+
+
+class SQLiteExportJobStore(ExportJobStore):
+    """Records in a SQLite file next to the results, shared by every worker process on the host"""
+
+    persistent = True
+
+    def __init__(self, result_dir: str = EXPORT_JOB_DIR, ttl: float = EXPORT_JOB_TTL, path: Optional[str] = None):
+        super().__init__(result_dir, ttl)
+        self.path = path or os.path.join(result_dir, 'jobs.db')
+        self._lock = threading.Lock()
+        self._db = None
+        self._db_pid = None
+
+    def _conn(self):
+        # reopen after fork: worker processes must not share the parent's handle
+        if self._db is None or self._db_pid != os.getpid():
+            db = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS export_jobs ("
+                " job_id TEXT PRIMARY KEY, record TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS export_jobs_expiry ON export_jobs (expires_at)")
+            db.commit()
+            self._db, self._db_pid = db, os.getpid()
+        return self._db
+
+    def _load(self, job_id):
+        with self._lock:
+            row = self._conn().execute(
+                "SELECT record FROM export_jobs WHERE job_id = ? AND expires_at > ?", (job_id, time.time())
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _save(self, job_id, record, expires_at):
+        with self._lock:
+            db = self._conn()
+            db.execute(
+                "INSERT OR REPLACE INTO export_jobs (job_id, record, expires_at) VALUES (?, ?, ?)",
+                (job_id, json.dumps(record), expires_at),
+            )
+            db.commit()
+
+    def _delete(self, job_id):
+        with self._lock:
+            db = self._conn()
+            db.execute("DELETE FROM export_jobs WHERE job_id = ?", (job_id,))
+            db.commit()
+
+    def _expired(self, now):
+        with self._lock:
+            rows = self._conn().execute("SELECT job_id FROM export_jobs WHERE expires_at <= ?", (now,)).fetchall()
+        return [row[0] for row in rows]
+
+
+_job_store: Optional[ExportJobStore] = None
+
+
+def get_export_job_store() -> ExportJobStore:
+    """Process-wide store selected by EXPORT_JOB_STORE"""
+    global _job_store
+    if _job_store is None:
+        if EXPORT_JOB_STORE == 'memory':
+            _job_store = MemoryExportJobStore()
+        else:
+            _job_store = SQLiteExportJobStore()
+    return _job_store
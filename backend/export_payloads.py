@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Fast ingestion for large export payloads
+Request bodies are decoded with orjson when it is installed (stdlib json
+otherwise) into slot-backed payload objects. Top-level fields are checked up
+front, as the Pydantic request models do; ad groups and generated ads are
+checked one at a time when the export reaches them instead of in a full walk
+of the body before any work starts.
+"""
+
+import json
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:  # optional: several times faster decoding of multi-MB bodies
+    import orjson
+except ImportError:
+    orjson = None
+
+_MISSING = object()
+
+
+class PayloadError(ValueError):
+    """Body does not match the export schema; `loc` is the path of the offending value"""
+
+    def __init__(self, loc: Tuple[Any, ...], message: str):
+        super().__init__(f"{'.'.join(map(str, loc)) or 'body'}: {message}")
+        self.loc = loc
+        self.message = message
+
+    def errors(self) -> List[Dict[str, Any]]:
+        """Detail for a 422 response, shaped like FastAPI's request validation errors"""
+        return [{"loc": ["body", *self.loc], "msg": self.message, "type": "value_error"}]
+
+
+def decode_json(body: bytes) -> Any:
+    """Decoded request body; PayloadError if it is not JSON"""
+    try:
+        return orjson.loads(body) if orjson is not None else json.loads(body)
+    except ValueError as e:  # orjson.JSONDecodeError and json.JSONDecodeError are ValueErrors
+        raise PayloadError((), f"invalid JSON: {e}")
+
+
+# ============================================================================
+# FIELD CHECKS
+# ============================================================================
+
+def _field(data: Dict[str, Any], key: str, expected: type, default: Any = _MISSING, nullable: bool = True) -> Any:
+    # Missing -> default (required when there is none); explicit null allowed for Optional fields
+    if key not in data:
+        if default is _MISSING:
+            raise PayloadError((key,), "field required")
+        return default
+    value = data[key]
+    if value is None and nullable:
+        return None
+    if not isinstance(value, expected) or (isinstance(value, bool) and expected is not bool):
+        raise PayloadError((key,), f"must be of type {expected.__name__}")
+    return value
+
+
+def _campaign_name(data: Dict[str, Any]) -> str:
+    name = _field(data, "campaign_name", str, nullable=False)
+    if not 1 <= len(name) <= 255:
+        raise PayloadError(("campaign_name",), "must be 1-255 characters")
+    return name
+
+
+def _non_empty_list(data: Dict[str, Any], key: str) -> list:
+    items = _field(data, key, list, nullable=False)
+    if not items:
+        raise PayloadError((key,), "must contain at least 1 item")
+    return items
+
+
+def _budget(data: Dict[str, Any], minimum: Optional[float] = None) -> Optional[float]:
+    value = data.get("budget")
+    if value is None:
+        return None
+    try:
+        if isinstance(value, bool):
+            raise ValueError
+        budget = float(value)
+    except (TypeError, ValueError):
+        raise PayloadError(("budget",), "must be a number")
+    if minimum is not None and budget < minimum:
+        raise PayloadError(("budget",), f"must be greater than or equal to {minimum}")
+    return budget
+
+
+def check_object(item: Any, loc: Tuple[Any, ...]) -> None:
+    if not isinstance(item, dict):
+        raise PayloadError(loc, "must be an object")
+
+
+def check_campaign_ad_group(group: Any, loc: Tuple[Any, ...]) -> None:
+    """Backend ad group: the fields the row builders read must have the types they expect"""
+    check_object(group, loc)
+    if "name" in group and not isinstance(group["name"], str):
+        raise PayloadError(loc + ("name",), "must be of type str")
+    for key in ("keywords", "ads", "negativeKeywords"):
+        if key in group and not isinstance(group[key], list):
+            raise PayloadError(loc + (key,), "must be of type list")
+    for index, ad in enumerate(group.get("ads", ())):
+        check_object(ad, loc + ("ads", index))
+
+
+def check_frontend_ad_group(group: Any, loc: Tuple[Any, ...]) -> None:
+    """Frontend ad group: an object with a string name (other fields are normalized by the adapter)"""
+    check_object(group, loc)
+    if "name" in group and not isinstance(group["name"], str):
+        raise PayloadError(loc + ("name",), "must be of type str")
+
+
+class CheckedList:
+    """
+    Read-only list view whose items are checked when they are reached
+    (iteration, indexing, slicing) rather than when the payload is decoded.
+    Slices stay checked and keep absolute positions in error locations;
+    instances pickle with their items (process pool shards).
+    """
+
+    __slots__ = ("_items", "_check", "_key", "_start")
+
+    def __init__(self, items: list, check: Callable[[Any, Tuple[Any, ...]], None], key: str, start: int = 0):
+        self._items = items
+        self._check = check
+        self._key = key
+        self._start = start
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Any]:
+        check, key = self._check, self._key
+        for index, item in enumerate(self._items, self._start):
+            check(item, (key, index))
+            yield item
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            positions = range(len(self._items))[index]
+            if positions.step != 1:
+                return [self[i] for i in positions]
+            return CheckedList(self._items[index], self._check, self._key, self._start + positions.start)
+        item = self._items[index]
+        self._check(item, (self._key, self._start + range(len(self._items))[index]))
+        return item
+
+    def validate(self) -> None:
+        """Check every item now (for callers that cannot fail half-way, e.g. streamed responses)"""
+        for _ in self:
+            pass
+
+    def unchecked(self) -> list:
+        """Items without running the checks (size estimates; may hold invalid items)"""
+        return self._items
+
+
+# ============================================================================
+# PAYLOADS
+# ============================================================================
+
+class CampaignPayload:
+    """
+    Backend export request decoded without the Pydantic model: the fields of
+    CampaignExportRequest, usable wherever the export functions take one
+    """
+
+    __slots__ = ("campaign_name", "ad_groups", "location_targeting", "budget", "bidding_strategy")
+
+    def __init__(self, campaign_name: str, ad_groups: CheckedList, location_targeting: Optional[Dict[str, Any]] = None,
+                 budget: Optional[float] = None, bidding_strategy: Optional[str] = "MANUAL_CPC"):
+        self.campaign_name = campaign_name
+        self.ad_groups = ad_groups
+        self.location_targeting = location_targeting
+        self.budget = budget
+        self.bidding_strategy = bidding_strategy
+
+
+class FrontendPayload:
+    """Campaign Builder export body (the ExportRequestModel fields) decoded without the Pydantic model"""
+
+    __slots__ = ("campaign_name", "ad_groups", "generated_ads", "location_targeting", "budget",
+                 "bidding_strategy", "negative_keywords", "all_ad_groups_value")
+
+    def __init__(self, campaign_name: str, ad_groups: CheckedList, generated_ads: Optional[CheckedList] = None,
+                 location_targeting: Optional[Dict[str, Any]] = None, budget: Optional[float] = None,
+                 bidding_strategy: Optional[str] = "MANUAL_CPC", negative_keywords: Optional[List[str]] = None,
+                 all_ad_groups_value: Optional[str] = "ALL_AD_GROUPS"):
+        self.campaign_name = campaign_name
+        self.ad_groups = ad_groups
+        self.generated_ads = generated_ads
+        self.location_targeting = location_targeting
+        self.budget = budget
+        self.bidding_strategy = bidding_strategy
+        self.negative_keywords = negative_keywords
+        self.all_ad_groups_value = all_ad_groups_value
+
+    def export_kwargs(self) -> Dict[str, Any]:
+        """Keyword arguments for map_frontend_to_backend / export_frontend_to_csv"""
+        return dict(
+            campaign_name=self.campaign_name,
+            ad_groups=self.ad_groups,
+            generated_ads=self.generated_ads or [],
+            all_ad_groups_value=self.all_ad_groups_value or "ALL_AD_GROUPS",
+            location_targeting=self.location_targeting,
+            budget=self.budget,
+            bidding_strategy=self.bidding_strategy or "MANUAL_CPC",
+            negative_keywords=self.negative_keywords or []
+        )
+
+
+def parse_campaign_payload(body: bytes) -> CampaignPayload:
+    """Decode a /export-csv body (CampaignExportRequest schema); raises PayloadError"""
+    data = decode_json(body)
+    check_object(data, ())
+    campaign_name = _campaign_name(data).strip()
+    if not campaign_name:
+        raise PayloadError(("campaign_name",), "Campaign name cannot be empty")
+    return CampaignPayload(
+        campaign_name=campaign_name,
+        ad_groups=CheckedList(_non_empty_list(data, "ad_groups"), check_campaign_ad_group, "ad_groups"),
+        location_targeting=_field(data, "location_targeting", dict, None),
+        budget=_budget(data),
+        bidding_strategy=_field(data, "bidding_strategy", str, "MANUAL_CPC")
+    )
+
+
+def parse_frontend_payload(body: bytes) -> FrontendPayload:
+    """Decode an /api/export-csv body (ExportRequestModel schema); raises PayloadError"""
+    data = decode_json(body)
+    check_object(data, ())
+    generated_ads = _field(data, "generated_ads", list, [])
+    negative_keywords = _field(data, "negative_keywords", list, [])
+    for index, keyword in enumerate(negative_keywords or ()):
+        if not isinstance(keyword, str):
+            raise PayloadError(("negative_keywords", index), "must be of type str")
+    return FrontendPayload(
+        campaign_name=_campaign_name(data),
+        ad_groups=CheckedList(_non_empty_list(data, "ad_groups"), check_frontend_ad_group, "ad_groups"),
+        generated_ads=CheckedList(generated_ads, check_object, "generated_ads") if generated_ads is not None else None,
+        location_targeting=_field(data, "location_targeting", dict, None),
+        budget=_budget(data, minimum=0),
+        bidding_strategy=_field(data, "bidding_strategy", str, "MANUAL_CPC"),
+        negative_keywords=negative_keywords,
+        all_ad_groups_value=_field(data, "all_ad_groups_value", str, "ALL_AD_GROUPS")
+    )
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for Google's suggestqueries endpoint
+Used by the keyword generator tests and benchmarks instead of the real service
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+
+def default_suggestions(query: str) -> List[str]:
+    """Deterministic fake suggestions: '<query> one', '<query> two'"""
+    return [f"{query} one", f"{query} two"]
+
+
+class SuggestStubServer:
+    """
+    Threaded HTTP server answering GET /complete/search?q=... with the
+    firefox-client JSON shape: [query, [suggestion, ...]]
+
+    Tracks request count, accepted connections and peak in-flight requests.
+    The first `errors` requests are answered with 503 to exercise retries.
+    """
+
+    def __init__(self, suggestions: Optional[Callable[[str], List[str]]] = None,
+                 delay: float = 0.0, keep_alive: bool = True, errors: int = 0):
+        self.suggestions = suggestions or default_suggestions
+        self.delay = delay
+        self.errors = errors
+        self.request_count = 0
+        self.connection_count = 0
+        self.max_in_flight = 0
+        self.queries: List[str] = []
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler(keep_alive))
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/complete/search"
+
+    def _make_handler(self, keep_alive: bool):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1" if keep_alive else "HTTP/1.0"
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connection_count += 1
+
+            def do_GET(self):
+                params = parse_qs(urlparse(self.path).query)
+                query = params.get("q", [""])[0]
+                with stub._lock:
+                    stub.request_count += 1
+                    stub.queries.append(query)
+                    stub._in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub._in_flight)
+                    failing = stub.errors > 0
+                    if failing:
+                        stub.errors -= 1
+                try:
+                    if stub.delay:
+                        time.sleep(stub.delay)
+                    body = json.dumps([query, stub.suggestions(query)]).encode("utf-8")
+                    self.send_response(503 if failing else 200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with stub._lock:
+                        stub._in_flight -= 1
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "SuggestStubServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "SuggestStubServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
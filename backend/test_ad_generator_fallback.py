@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for fallback ad copy (ad_generator_fallback.py)
+fixtures/fallback_ads_golden.json holds the output of the f-string generators
+the compiled templates replaced
+
+Run: cd backend && python -m pytest test_ad_generator_fallback.py -q
+"""
+
+import json
+import os
+import random
+
+import pytest
+
+import ad_generator_fallback as fallback
+
+GOLDEN_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "fallback_ads_golden.json")
+
+with open(GOLDEN_PATH, encoding="utf-8") as f:
+    GOLDEN = json.load(f)
+
+
+def ad_copy_sets(keyword, business_name, location):
+    return {
+        "service_headlines": fallback.generate_service_headlines(keyword, business_name, location),
+        "service_descriptions": fallback.generate_service_descriptions(keyword, business_name, location),
+        "product_headlines": fallback.generate_product_headlines(keyword, business_name),
+        "product_descriptions": fallback.generate_product_descriptions(keyword, business_name),
+        "emergency_headlines": fallback.generate_emergency_headlines(keyword, business_name),
+        "emergency_descriptions": fallback.generate_emergency_descriptions(keyword, business_name, location),
+    }
+
+
+@pytest.mark.parametrize("warm", [False, True])
+def test_compiled_templates_match_golden_copy(warm):
+    if not warm:
+        fallback.clear_ad_copy_caches()
+    for key, expected in GOLDEN["copy"].items():
+        assert ad_copy_sets(*json.loads(key)) == expected, key
+
+    for key, expected in GOLDEN["ads"].items():
+        business_type, ad_type = key.split("/")
+        random.seed(7)  # final URLs and long-keyword display paths are picked at random
+        ads = fallback.generate_ads(GOLDEN["keywords"][:4], business_type, "ABC Plumbing", "New York", "",
+                                    "https://example.com", ad_type, 4)
+        assert ads == expected, key
+
+
+def test_cached_copy_is_shared_but_callers_get_copies():
+    fallback.clear_ad_copy_caches()
+    headlines = fallback.generate_service_headlines("plumber", "ABC Plumbing", "Austin")
+    headlines.append("changed by caller")
+    assert "changed by caller" not in fallback.generate_service_headlines("plumber", "ABC Plumbing", "Austin")
+
+    # product headlines ignore location: one cache entry whatever it is
+    fallback.generate_product_headlines("drill")
+    before = fallback._render_copy.cache_info()
+    assert fallback.PRODUCT_HEADLINES.cached("drill", "", "Austin") == tuple(fallback.generate_product_headlines("drill"))
+    after = fallback._render_copy.cache_info()
+    assert after.hits == before.hits + 2 and after.misses == before.misses
+
+    headlines, descriptions = fallback.ad_copy("plumber", "local", "ABC Plumbing", "Austin")
+    assert list(headlines) == fallback.generate_service_headlines("plumber", "ABC Plumbing", "Austin")
+    assert list(descriptions) == fallback.generate_service_descriptions("plumber", "ABC Plumbing", "Austin")
+    assert fallback.normalize_keyword.cache_info().maxsize == fallback.KEYWORD_CACHE_SIZE
+
+
+def test_template_splits_literals_and_slots():
+    template = fallback.Template("{kw} in {location}{in_location} - {KeyWord:x}")
+    assert template.slots == ["kw", "location", "in_location"]
+    assert template.render({"kw": "Plumber", "location": "Austin", "in_location": ""}) == "Plumber in Austin - {KeyWord:x}"
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
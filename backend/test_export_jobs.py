@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Tests for async CSV export jobs (export_job_store.py, ad_generator_api.py)
+
+Run: cd backend && python -m pytest test_export_jobs.py -q
+"""
+
+import asyncio
+import os
+import time
+import uuid
+
+import pytest
+
+import ad_generator_api
+import export_api_handler
+import export_csv_fix
+import export_executor
+import export_job_store
+from export_csv_fix import export_campaign_to_csv
+from export_executor import ExportExecutor
+from export_fixtures import large_request
+from export_job_store import ExportJobStore, MemoryExportJobStore, SQLiteExportJobStore, job_progress
+from test_export_pipeline import GOLDEN_PATH, sample_request
+
+
+@pytest.fixture
+def store(monkeypatch, tmp_path):
+    job_store = SQLiteExportJobStore(str(tmp_path))
+    monkeypatch.setattr(export_job_store, "_job_store", job_store)
+    return job_store
+
+
+@pytest.mark.parametrize("backend", [MemoryExportJobStore, SQLiteExportJobStore])
+def test_store_records_and_ttl_eviction(backend, tmp_path):
+    job_store = backend(str(tmp_path), ttl=60)
+    job_id = str(uuid.uuid4())
+    job_store.create(job_id, estimated_rows=10)
+    assert job_store.update(job_id, status="completed", row_count=9)["row_count"] == 9
+    assert job_store.get(job_id)["status"] == "completed"
+    assert job_store.get("../jobs") is None
+    assert job_store.update(str(uuid.uuid4()), status="failed") is None
+
+    expiring = backend(str(tmp_path / "short"), ttl=0.05)
+    old_id = str(uuid.uuid4())
+    expiring.create(old_id)
+    with open(expiring.result_path(old_id), "w") as f:
+        f.write("csv")
+    time.sleep(0.1)
+    assert expiring.get(old_id) is None
+    expiring.create(str(uuid.uuid4()))  # creating a job evicts expired ones
+    assert not os.path.exists(expiring.result_path(old_id))
+
+
+def test_sqlite_store_is_shared_between_instances(tmp_path):
+    job_id = str(uuid.uuid4())
+    SQLiteExportJobStore(str(tmp_path)).create(job_id, estimated_rows=5)
+    other_worker = SQLiteExportJobStore(str(tmp_path))
+    assert other_worker.get(job_id)["estimated_rows"] == 5
+
+
+def test_store_backends_must_implement_every_hook(tmp_path):
+    class LoadOnlyStore(ExportJobStore):
+        def _load(self, job_id):
+            return None
+
+    with pytest.raises(TypeError):
+        LoadOnlyStore(str(tmp_path))
+
+
+def test_async_export_writes_result_file_and_serves_it(store):
+    job_id = str(uuid.uuid4())
+    store.create(job_id, estimated_rows=20)
+    ad_generator_api.process_async_export(job_id, sample_request())
+
+    record = store.get(job_id)
+    assert record["status"] == "completed" and record["row_count"] == 18
+    assert "csv_content" not in record
+    with open(GOLDEN_PATH, "rb") as golden, open(store.result_path(job_id), "rb") as result:
+        assert result.read() == golden.read()
+
+    response = asyncio.run(ad_generator_api.get_async_export(job_id, None, None))
+    assert response.path == store.result_path(job_id)
+    assert response.headers["content-disposition"].startswith("attachment;")
+
+
+def test_async_export_with_validation_errors_fails_without_file(store):
+    request = sample_request()
+    request.ad_groups[0]["ads"][0]["finalUrl"] = ""
+    job_id = str(uuid.uuid4())
+    store.create(job_id)
+    ad_generator_api.process_async_export(job_id, request)
+
+    status = asyncio.run(ad_generator_api.get_async_export(job_id, None, None))
+    assert status["status"] == "failed" and status["error_count"] == 1
+    assert status["validation_errors"][0]["field"] == "Final URL"
+    assert not any(name.endswith((".csv", ".part")) for name in os.listdir(store.result_dir))
+
+
+def body_of(response):
+    async def collect():
+        return b"".join([chunk async for chunk in response.body_iterator])
+    return asyncio.run(collect())
+
+
+def test_job_progress_reports_rate_and_eta():
+    record = {"status": "processing", "estimated_rows": 1000, "rows_written": 250, "elapsed_s": 0.5,
+              "progress_at": 100.0}
+    progress = job_progress(record, now=100.2)
+    assert progress["percent"] == 25.0 and progress["rows_per_sec"] == 500.0
+    assert progress["eta_seconds"] == 1.3  # 750 rows at 500/s, reported 0.2s ago
+    assert job_progress({"status": "processing", "estimated_rows": 10})["eta_seconds"] is None
+    assert job_progress({"status": "processing", "estimated_rows": 10, "rows_written": 12, "elapsed_s": 1})["percent"] == 99.9
+    assert job_progress(dict(record, status="completed"))["percent"] == 100.0
+
+
+def test_async_export_records_progress_while_running(monkeypatch, store):
+    monkeypatch.setattr(ad_generator_api, "EXPORT_PROGRESS_INTERVAL", 0)
+    updates = []
+    real_update = store.update
+    monkeypatch.setattr(store, "update", lambda job_id, **fields: updates.append(fields) or real_update(job_id, **fields))
+    request = large_request(ad_groups=60, zips=0)
+    job_id = str(uuid.uuid4())
+    store.create(job_id, estimated_rows=ad_generator_api.estimate_export_size(request))
+    ad_generator_api.process_async_export(job_id, request)
+
+    written = [fields["rows_written"] for fields in updates if "rows_written" in fields]
+    assert len(written) >= 3 and written == sorted(written)
+    status = asyncio.run(ad_generator_api.get_async_export_status(job_id))
+    assert status["status"] == "completed" and status["percent"] == 100.0
+    assert status["rows_written"] == status["row_count"] == written[-1]
+    assert status["rows_per_sec"] > 0 and status["eta_seconds"] == 0.0
+
+
+def test_completed_export_resumes_with_range_requests(store):
+    job_id = str(uuid.uuid4())
+    store.create(job_id)
+    ad_generator_api.process_async_export(job_id, sample_request())
+    with open(GOLDEN_PATH, "rb") as golden:
+        expected = golden.read()
+
+    full = asyncio.run(ad_generator_api.get_async_export(job_id, None, None))
+    assert full.status_code == 200 and full.headers["accept-ranges"] == "bytes"
+    etag = full.headers["etag"]
+
+    partial = asyncio.run(ad_generator_api.get_async_export(job_id, "bytes=100-", etag))
+    assert partial.status_code == 206
+    assert partial.headers["content-range"] == f"bytes 100-{len(expected) - 1}/{len(expected)}"
+    assert expected[:100] + body_of(partial) == expected
+
+    tail = asyncio.run(ad_generator_api.get_async_export(job_id, "bytes=-10", None))
+    assert body_of(tail) == expected[-10:]
+    stale = asyncio.run(ad_generator_api.get_async_export(job_id, "bytes=100-", '"other"'))
+    assert stale.status_code == 200  # file changed since the first part: send it whole
+    unsatisfiable = asyncio.run(ad_generator_api.get_async_export(job_id, f"bytes={len(expected)}-", None))
+    assert unsatisfiable.status_code == 416
+
+
+def test_parse_byte_range():
+    parse = ad_generator_api.parse_byte_range
+    assert parse("bytes=0-9", 100) == (0, 9)
+    assert parse("bytes=90-200", 100) == (90, 99)
+    assert parse("bytes=-5", 100) == (95, 99)
+    assert parse("bytes=100-", 100) == "unsatisfiable"
+    for header in (None, "", "bytes=0-1,5-6", "items=0-1", "bytes=9-1", "bytes=-"):
+        assert parse(header, 100) is None, header
+
+
+def test_executor_keeps_event_loop_responsive_during_export():
+    executor = ExportExecutor(thread_workers=2, process_workers=0)
+    request = large_request(ad_groups=1000, zips=0)
+
+    async def scenario():
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.005)
+
+        task = asyncio.ensure_future(ticker())
+        await asyncio.sleep(0)
+        started = time.monotonic()
+        result = await executor.run(export_campaign_to_csv, request)
+        elapsed = time.monotonic() - started
+        task.cancel()
+        return result, ticks, elapsed
+
+    result, ticks, elapsed = asyncio.run(scenario())
+    executor.shutdown()
+    assert result.success
+    # the loop kept ticking while the export ran (a blocked loop shows one gap as long as the export)
+    assert max(b - a for a, b in zip(ticks, ticks[1:])) < elapsed / 3
+    stats = executor.stats()["thread"]
+    assert stats["completed"] == 1 and stats["queue_depth"] == 0 and stats["run_p99_s"] > 0
+
+
+def test_large_job_runs_in_worker_process_with_shared_store(monkeypatch, store):
+    executor = ExportExecutor(thread_workers=1, process_workers=1)
+    monkeypatch.setattr(export_executor, "_executor", executor)
+    job_id = str(uuid.uuid4())
+    store.create(job_id)
+    ad_generator_api.start_export_job(job_id, sample_request()).result(timeout=30)
+    executor.shutdown(wait=True)
+
+    assert store.get(job_id)["status"] == "completed"
+    assert executor.stats()["process"]["completed"] == 1
+
+
+def test_frontend_stream_export_is_built_in_executor(monkeypatch, tmp_path):
+    monkeypatch.setattr(export_csv_fix, "EXPORT_REPORT_DIR", str(tmp_path))
+    executor = ExportExecutor(thread_workers=1, process_workers=0)
+    monkeypatch.setattr(export_executor, "_executor", executor)
+    fields = {"campaign_name": "C", "ad_groups": [{"name": "G", "keywords": ["plumber"]}],
+              "generated_ads": [{"adGroup": "G", "headline1": "Plumber", "headline2": "Licensed", "headline3": "Call Now",
+                                 "description1": "Fast.", "description2": "24/7.", "finalUrl": "https://example.com"}]}
+
+    streamed = asyncio.run(export_api_handler.export_frontend_campaign(dict(fields), stream=True))
+    whole = asyncio.run(export_api_handler.export_frontend_campaign(dict(fields)))
+    executor.shutdown(wait=True)
+    async def collect():
+        return "".join([chunk async for chunk in streamed.body_iterator])
+    assert asyncio.run(collect()).encode("utf-8") == whole.body
+    assert executor.stats()["thread"]["completed"] == 2  # mapping for the stream, export for the file
+
+
+def test_executor_counts_failures():
+    executor = ExportExecutor(thread_workers=1, process_workers=0)
+    job = executor.submit_job(int, "not a number")
+    with pytest.raises(ValueError):
+        job.result(timeout=5)
+    executor.shutdown(wait=True)
+    assert executor.stats()["thread"]["failed"] == 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Tests for fast export payload ingestion (export_payloads.py and the /fast routes)
+
+Run: cd backend && python -m pytest test_export_payloads.py -q
+"""
+
+import asyncio
+import json
+import pickle
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+import ad_generator_api
+import export_api_handler
+from csv_export_adapter import export_frontend_to_csv, map_frontend_to_backend
+from export_csv_fix import estimate_export_size, export_campaign_to_csv
+from export_fixtures import zip_campaign_payload
+from export_payloads import PayloadError, parse_campaign_payload, parse_frontend_payload
+from test_export_pipeline import GOLDEN_PATH, sample_request
+
+
+def http_request(body: bytes) -> Request:
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+    return Request({"type": "http", "method": "POST", "headers": [], "query_string": b""}, receive)
+
+
+def test_campaign_payload_exports_like_the_request_model():
+    body = json.dumps(sample_request().model_dump()).encode()
+    payload = parse_campaign_payload(body)
+    with open(GOLDEN_PATH, "rb") as f:
+        golden = f.read().decode("utf-8")
+
+    assert export_campaign_to_csv(payload).csv_content == golden
+    assert export_campaign_to_csv(pickle.loads(pickle.dumps(payload))).csv_content == golden
+
+
+def test_frontend_payload_exports_like_the_request_model():
+    fields = zip_campaign_payload()
+    fields.update(budget=20, negative_keywords=["free"])
+    payload = parse_frontend_payload(json.dumps(fields).encode())
+    assert export_frontend_to_csv(**payload.export_kwargs()) == export_campaign_to_csv(map_frontend_to_backend(**fields))
+
+
+@pytest.mark.parametrize("body, loc", [
+    (b"{not json", ()),
+    (b"[]", ()),
+    (b'{"ad_groups": [{}]}', ("campaign_name",)),
+    (b'{"campaign_name": "  ", "ad_groups": [{}]}', ("campaign_name",)),
+    (b'{"campaign_name": "C", "ad_groups": []}', ("ad_groups",)),
+    (b'{"campaign_name": "C", "ad_groups": [{}], "budget": "lots"}', ("budget",)),
+    (b'{"campaign_name": "C", "ad_groups": [{}], "location_targeting": []}', ("location_targeting",)),
+])
+def test_top_level_fields_are_checked_up_front(body, loc):
+    with pytest.raises(PayloadError) as raised:
+        parse_campaign_payload(body)
+    assert raised.value.loc == loc
+    assert raised.value.errors()[0]["loc"] == ["body", *loc]
+
+
+def test_ad_groups_are_checked_when_reached():
+    groups = [{"name": "A"}, {"name": "B"}, {"name": "C", "keywords": "not a list"}, {"name": "D"}]
+    payload = parse_campaign_payload(json.dumps({"campaign_name": "C", "ad_groups": groups}).encode())
+
+    assert payload.ad_groups[0] == {"name": "A"}
+    assert payload.ad_groups[1:2][0] == {"name": "B"}
+    with pytest.raises(PayloadError) as raised:
+        payload.ad_groups[1:][1]  # slices report absolute positions
+    assert raised.value.loc == ("ad_groups", 2, "keywords")
+
+    result = export_campaign_to_csv(payload)
+    assert not result.success and "ad_groups.2.keywords" in result.validation_errors[0].message
+    lazy = parse_frontend_payload(b'{"campaign_name": "C", "ad_groups": [{"name": 1}]}')  # accepted until reached
+    with pytest.raises(PayloadError):
+        export_frontend_to_csv(**lazy.export_kwargs())
+
+
+def test_fast_routes_match_the_model_routes():
+    body = json.dumps(sample_request().model_dump()).encode()
+    with open(GOLDEN_PATH, "rb") as f:
+        golden = f.read()
+    response = asyncio.run(ad_generator_api.export_csv_fast_endpoint(http_request(body)))
+    assert response.body == golden
+
+    fields = zip_campaign_payload()
+    fast = asyncio.run(export_api_handler.export_csv_fast_handler(http_request(json.dumps(fields).encode())))
+    model = asyncio.run(export_api_handler.export_csv_handler(export_api_handler.ExportRequestModel(**fields)))
+    assert fast.body == model.body and fast.headers["x-row-count"] == model.headers["x-row-count"]
+
+    bad = json.dumps({"campaign_name": "C", "ad_groups": [{"name": "A", "ads": [1]}]}).encode()
+    for stream in (True, False):
+        with pytest.raises(HTTPException) as raised:
+            asyncio.run(ad_generator_api.export_csv_fast_endpoint(http_request(bad), stream=stream))
+        assert raised.value.status_code == 422
+        assert raised.value.detail[0]["loc"] == ["body", "ad_groups", 0, "ads", 0]
+
+
+def test_estimate_does_not_check_ad_groups():
+    groups = [{"name": "A", "keywords": ["k"] * 3, "ads": [1, 2]}, "not a group", {"name": "B", "keywords": "k"}]
+    payload = parse_campaign_payload(json.dumps({"campaign_name": "C", "ad_groups": groups}).encode())
+    assert estimate_export_size(payload) == 1 + 3 + 3 + 2  # campaign, 3 ad groups, keywords, ads
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+Tests for the Google Ads Editor CSV export pipeline (export_csv_fix.py)
+Output is compared byte-for-byte against fixtures/export_golden.csv
+
+Run: cd backend && python -m pytest test_export_pipeline.py -q
+"""
+
+import csv
+import io
+import os
+import random
+import time
+
+import export_csv_fix
+from csv_export_adapter import (
+    AD_FIELD_ALIASES,
+    export_frontend_to_csv,
+    map_ad,
+    map_frontend_to_backend,
+    resolve_ad_fields,
+)
+from export_csv_fix import (
+    CampaignExportRequest,
+    RowEncoder,
+    StreamingCSVExport,
+    _encode_field,
+    estimate_export_size,
+    export_campaign_to_csv,
+    generate_csv_content,
+    generate_csv_content_parallel,
+    generate_csv_rows,
+    iter_bulk_location_chunks,
+    load_export_report,
+    validate_csv_content,
+)
+from export_fixtures import zip_campaign_payload
+
+GOLDEN_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "export_golden.csv")
+
+
+def sample_request() -> CampaignExportRequest:
+    """Campaign touching every row type plus quoting, unicode and truncation edge cases"""
+    return CampaignExportRequest(
+        campaign_name='Plumbing "Pros", Inc.',
+        budget=125.5,
+        bidding_strategy="MAXIMIZE_CLICKS",
+        ad_groups=[
+            {
+                "name": "Emergency, 24/7",
+                "defaultMaxCPC": 2.75,
+                "keywords": [
+                    "emergency plumber",
+                    '"plumber near me"',
+                    "[24 hour plumber]",
+                    {"text": "burst pipe repair", "matchType": "PHRASE", "maxCPC": 3.1, "finalURL": "https://example.com/burst"},
+                    {"keyword": "fontanero de emergencia"},
+                ],
+                "ads": [
+                    {
+                        "type": "rsa",
+                        "headline1": "Emergency Plumber",
+                        "headline2": 'The "Best" Plumbers, Period',
+                        "headline3": "A headline that is far too long to fit in thirty characters",
+                        "headline4": "Café Crème Plumbing",
+                        "description1": "Line one\nline two, with comma",
+                        "description2": "A description that keeps going and going well past the ninety character limit set by Google Ads",
+                        "path1": "emergency-plumbing-now",
+                        "path2": "call",
+                        "finalUrl": "https://example.com/?a=1,b=2",
+                    },
+                    {
+                        "type": "callonly",
+                        "headline1": "Call A Plumber",
+                        "headline2": "Fast Response",
+                        "headline3": "Licensed Pros",
+                        "description1": "Available day and night.",
+                        "description2": "Call now for help.",
+                        "final_url": "https://example.com",
+                    },
+                ],
+                "negativeKeywords": ["free", '-"diy plumbing"', {"text": "-[plumber jobs]"}, ""],
+            },
+            {
+                "name": "Drain Cleaning",
+                "keywords": ["drain cleaning", "clogged drain"],
+                "ads": [],
+                "negativeKeywords": [],
+            },
+        ],
+        location_targeting={
+            "locations": [
+                {"type": "country", "code": "US"},
+                {"type": "CITY", "value": "New York, NY"},
+                {"type": "ZIP", "code": " 10001 "},
+                {"type": "ZIP", "code": ""},
+            ]
+        },
+    )
+
+
+def test_rows_match_golden_csv():
+    errors = []
+    content = generate_csv_content(generate_csv_rows(sample_request(), errors))
+    with open(GOLDEN_PATH, "rb") as f:
+        assert content.encode("utf-8") == f.read()
+    assert all(e.severity == "warning" for e in errors)
+
+
+def test_export_campaign_to_csv_matches_golden_csv():
+    result = export_campaign_to_csv(sample_request())
+    assert result.success, result.validation_errors
+    with open(GOLDEN_PATH, "rb") as f:
+        assert result.csv_content.encode("utf-8") == f.read()
+    assert result.row_count == 18
+
+
+def test_ad_keep_drop_is_per_ad_and_issues_carry_row_index():
+    good = {"headline1": "One", "headline2": "Two", "headline3": "Three",
+            "description1": "First.", "description2": "Second.", "finalUrl": "https://example.com"}
+    long_good = dict(good, headline4="x" * 40)
+    no_url = dict(good, finalUrl="")
+    request = CampaignExportRequest(campaign_name="C", ad_groups=[
+        {"name": "G", "keywords": ["k"], "ads": [no_url, good, long_good, dict(no_url, headline5="y" * 40), good]},
+    ])
+    errors = []
+    rows = generate_csv_rows(request, errors)
+
+    # campaign, ad group, keyword, then the three valid ads; a clean ad right
+    # after a rejected one is kept (the old last-3-errors check dropped it)
+    assert [row[0] for row in rows] == ["CAMPAIGN", "ADGROUP", "KEYWORD", "AD", "AD", "AD"]
+    assert [(e.row_index, e.severity, e.field) for e in errors] == [
+        (5, "error", "Final URL"),       # line 5 then goes to the next ad
+        (6, "warning", "Headline 4"),
+        (7, "warning", "Headline 5"),
+        (7, "error", "Final URL"),
+    ]
+
+
+def test_parallel_generation_matches_serial_output_and_issues():
+    request = sample_request()
+    request.ad_groups.append({"name": "Broken", "keywords": ["k"], "ads": [{"headline1": "x" * 31}]})
+    request.ad_groups.append({"name": "", "keywords": ["orphan"]})
+    request.ad_groups.append(dict(request.ad_groups[0], name="Emergency copy"))
+    serial_issues = []
+    serial = generate_csv_content(generate_csv_rows(request, serial_issues))
+
+    for pool in ("thread", "process"):
+        issues = []
+        content, row_count = generate_csv_content_parallel(request, issues, workers=2, pool=pool, shard_size=1)
+        assert content == serial
+        assert row_count == serial.count("\r\n") - 1
+        assert [(e.row_index, e.field, e.message, e.severity) for e in issues] == \
+            [(e.row_index, e.field, e.message, e.severity) for e in serial_issues]
+
+        # every export reuses one pool per kind and worker count
+        executor = export_csv_fix.get_shard_pool(pool, 2)
+        assert generate_csv_content_parallel(request, [], workers=2, pool=pool, shard_size=1)[0] == serial
+        assert export_csv_fix.get_shard_pool(pool, 2) is executor
+
+
+def test_export_campaign_to_csv_parallel_mode(monkeypatch):
+    monkeypatch.setattr(export_csv_fix, "CSV_EXPORT_SHARD_SIZE", 1)
+    result = export_campaign_to_csv(sample_request(), workers=2)
+    assert result.success and result.row_count == 18
+    with open(GOLDEN_PATH, "rb") as f:
+        assert result.csv_content.encode("utf-8") == f.read()
+
+
+def test_bulk_locations_match_per_row_locations_deduplicated():
+    codes = {"ZIP": [" 10001 ", "10002", "10001", "", None, "10003"],
+             "CITY": ["New York, NY", 'Say "Cheese"', "New York, NY"]}
+    bulk = CampaignExportRequest(campaign_name="C, Inc.", ad_groups=[{"name": "G"}],
+                                 location_targeting={"bulk": codes})
+    per_row = CampaignExportRequest(campaign_name="C, Inc.", ad_groups=[{"name": "G"}], location_targeting={
+        "locations": [{"type": t, "code": c} for t, c in
+                      [("ZIP", "10001"), ("ZIP", "10002"), ("ZIP", "10003"), ("CITY", "New York, NY"), ("CITY", 'Say "Cheese"')]]
+    })
+
+    result = export_campaign_to_csv(bulk)
+    assert result.success and result.row_count == 7
+    assert result.csv_content == export_campaign_to_csv(per_row).csv_content
+    assert estimate_export_size(bulk) == 11
+
+    chunks = list(iter_bulk_location_chunks("C, Inc.", codes, chunk_rows=2))
+    assert [c.row_count for c in chunks] == [2, 1, 2]
+    assert "".join(c.text for c in chunks) == "".join(result.csv_content.splitlines(keepends=True)[3:])
+
+
+def test_encode_field_matches_csv_writer():
+    rng = random.Random(11)
+    alphabet = 'ab ,"\r\n\t;\'é'
+    for _ in range(2000):
+        value = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 6)))
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\r\n").writerow(["x", value])
+        assert "x," + _encode_field(value) + "\r\n" == buffer.getvalue(), repr(value)
+
+
+def test_row_encoder_matches_csv_writer_for_builder_rows():
+    rng = random.Random(17)
+    alphabet = 'ab ,"\r\n{}é'
+
+    def text():
+        return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 8)))
+
+    for campaign_name in ('Plumbing "Pros", Inc.', "{0} {name}", "Plain"):
+        request = CampaignExportRequest(campaign_name=campaign_name, ad_groups=[
+            {"name": text() or "g", "defaultMaxCPC": 1.5,
+             "keywords": [text() for _ in range(10)] + [{"text": text(), "matchType": "EXACT", "finalURL": text()}],
+             "ads": [{"headline1": "H1 " + text(), "headline2": "H2", "headline3": text() + "H3", "headline7": text(),
+                      "description1": "D1" + text(), "description2": "D2", "path1": text(), "finalUrl": text() + "u"}],
+             "negativeKeywords": [text() for _ in range(5)]}
+            for _ in range(20)
+        ], location_targeting={"locations": [{"type": "CITY", "code": text()} for _ in range(10)]})
+        rows = generate_csv_rows(request, [])
+        assert {row[0] for row in rows} >= {"CAMPAIGN", "ADGROUP", "KEYWORD", "AD", "NEGATIVE_KEYWORD", "LOCATION"}
+
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\r\n").writerows(rows)
+        encode = RowEncoder(request.campaign_name).encode
+        assert "".join(encode(row) for row in rows) == buffer.getvalue()
+        assert generate_csv_content(rows, campaign_name=request.campaign_name) == generate_csv_content(rows)
+
+
+def test_adapter_maps_location_lists_to_bulk_codes():
+    request = map_frontend_to_backend(
+        campaign_name="C", ad_groups=[{"name": "G", "keywords": ["k"]}], generated_ads=[],
+        location_targeting={"country": "US", "cities": ["Austin, TX"], "zipCodes": ["73301", " 73301", ""]},
+    )
+    assert request.location_targeting == {"bulk": {"COUNTRY": ["US"], "CITY": ["Austin, TX"], "ZIP": ["73301", " 73301", ""]}}
+    rows = export_campaign_to_csv(request).csv_content.splitlines()[-3:]
+    assert [row.split(",")[10:12] for row in rows] == [["COUNTRY", "US"], ["CITY", '"Austin'], ["ZIP", "73301"]]
+
+
+def test_adapter_ad_index_matches_per_group_scan():
+    rng = random.Random(5)
+    groups = ["G1", "G2", "ALL_AD_GROUPS", "G1", "Lonely"]
+    generated_ads = []
+    for i in range(200):
+        ad = {"adGroup": rng.choice(["G1", "G2", "ALL_AD_GROUPS", "Unknown"]), "headline1": f"H{i}",
+              "description1": f"D{i}", "finalUrl": f"https://example.com/{i}"}
+        if i % 17 == 0:
+            ad["extensionType"] = "callout"
+        if i % 23 == 0:
+            del ad["headline1"], ad["description1"]
+        generated_ads.append(ad)
+    generated_ads += [{"adGroup": "ALL_AD_GROUPS", "headline1": "Shared"}]
+
+    request = map_frontend_to_backend(campaign_name="C", ad_groups=[{"name": name} for name in groups],
+                                      generated_ads=generated_ads)
+    for name, ad_group in zip(groups, request.ad_groups):
+        scanned = [map_ad(ad) for ad in generated_ads
+                   if ad["adGroup"] in (name, "ALL_AD_GROUPS") and not ad.get("extensionType")]
+        assert ad_group["ads"] == [ad for ad in scanned if ad is not None], name
+    shared = [ad_group["ads"] for ad_group in request.ad_groups if ad_group["name"] not in ("G1", "G2")]
+    assert shared[0] is shared[1]  # ALL_AD_GROUPS ads are mapped once and shared
+
+
+def test_adapter_logs_empty_shared_ads_against_target_group(caplog):
+    generated_ads = [{"adGroup": "ALL_AD_GROUPS", "finalUrl": "https://example.com"},
+                     {"adGroup": "G1", "headline1": "Own", "description1": "Ad"}]
+    with caplog.at_level("WARNING", logger="csv_export_adapter"):
+        request = map_frontend_to_backend(campaign_name="C", ad_groups=[{"name": "G1"}, {"name": "G2"}],
+                                          generated_ads=generated_ads)
+    assert len(request.ad_groups[0]["ads"]) == 1 and request.ad_groups[1]["ads"] == []
+    assert "Skipping empty ad in group 'G1'" in caplog.text
+    assert "ALL_AD_GROUPS" not in caplog.text
+
+
+def test_alias_resolver_matches_probing_each_spelling():
+    def probing(ad):
+        def get_field(*keys):
+            for key in keys:
+                if key in ad and ad[key]:
+                    return str(ad[key]).strip()
+            return ''
+        fields = {field: get_field(*keys) for field, keys in AD_FIELD_ALIASES.items()}
+        for prefix, array_key, count in (("headline", "headlines", 3), ("description", "descriptions", 2)):
+            values = ad.get(array_key)
+            if not fields[prefix + "1"] and isinstance(values, list) and len(values) > 0:
+                for n in range(count):
+                    fields[f"{prefix}{n + 1}"] = str(values[n]).strip() if len(values) > n else ""
+        return fields
+
+    rng = random.Random(11)
+    spellings = [key for keys in AD_FIELD_ALIASES.values() for key in keys] + ["headlines", "descriptions", "other"]
+    values = ["", " ", "  Text  ", 0, 7, None, "Ünïcode", ["a"], [], [" x ", 2, "y", "z"], "x, y"]
+    for _ in range(3000):
+        ad = {key: rng.choice(values) for key in rng.sample(spellings, rng.randint(0, 12))}
+        assert resolve_ad_fields(ad) == probing(ad), ad
+
+
+def test_direct_frontend_export_matches_request_path():
+    payload = zip_campaign_payload()
+    payload["ad_groups"][0]["negativeKeywords"] = ["diy", "free"]
+    payload.update(budget=50, negative_keywords=["jobs", "free"], all_ad_groups_value="ALL_AD_GROUPS")
+    payload["generated_ads"].append({"adGroup": "ALL_AD_GROUPS", "headlines": ["Shared", "Ad", "Everywhere"],
+                                     "descriptions": ["Everywhere " * 12, "Two"], "final_url": "https://example.com"})
+    payload["location_targeting"].update(country="US", cities=["Austin, TX"])
+    broken = dict(payload, generated_ads=payload["generated_ads"] + [
+        {"adGroup": payload["ad_groups"][-1]["name"], "headline1": "No URL", "description1": "Missing"}])
+
+    results = []
+    for case in (payload, broken):
+        direct = export_frontend_to_csv(**case)
+        assert direct == export_campaign_to_csv(map_frontend_to_backend(**case))
+        results.append(direct)
+    ok, failed = results
+    assert ok.success and ok.warnings and ok.csv_content.count("\r\n") == ok.row_count + 1
+    assert not failed.success and failed.validation_errors[0].field == "Final URL"
+
+
+def test_streaming_export_matches_golden_csv_and_writes_report(monkeypatch, tmp_path):
+    monkeypatch.setattr(export_csv_fix, "EXPORT_REPORT_DIR", str(tmp_path))
+    export = StreamingCSVExport(sample_request(), chunk_rows=4)
+    chunks = list(export)
+
+    assert len(chunks) == 6  # BOM + header, then 18 rows in chunks of 4
+    with open(GOLDEN_PATH, "rb") as f:
+        assert "".join(chunks).encode("utf-8") == f.read()
+    report = load_export_report(export.export_id)
+    assert report["complete"] and report["success"]
+    assert report["row_count"] == 18
+    assert report["warnings"] and not report["validation_errors"]
+    assert load_export_report("../../etc/passwd") is None
+
+
+def test_streaming_export_reports_interrupted_download(monkeypatch, tmp_path):
+    monkeypatch.setattr(export_csv_fix, "EXPORT_REPORT_DIR", str(tmp_path))
+    export = StreamingCSVExport(sample_request(), chunk_rows=4)
+    stream = iter(export)
+    next(stream)
+    next(stream)
+    stream.close()  # client went away
+
+    report = load_export_report(export.export_id)
+    assert not report["complete"] and not report["success"]
+    assert report["row_count"] == 4
+
+
+def test_streaming_export_reports_expire(monkeypatch, tmp_path):
+    monkeypatch.setattr(export_csv_fix, "EXPORT_REPORT_DIR", str(tmp_path))
+    monkeypatch.setattr(export_csv_fix, "EXPORT_REPORT_TTL", 60)
+    old = StreamingCSVExport(sample_request())
+    list(old)
+    stale = time.time() - 120
+    os.utime(export_csv_fix.export_report_path(old.export_id), (stale, stale))
+    assert load_export_report(old.export_id) is None  # expired, even before eviction runs
+
+    new = StreamingCSVExport(sample_request())
+    list(new)  # writing a report evicts expired ones
+    assert sorted(os.listdir(tmp_path)) == [f"{new.export_id}.json"]
+    assert load_export_report(new.export_id)["complete"]
+
+
+def test_export_debug_validation_accepts_golden_output():
+    result = export_campaign_to_csv(sample_request(), debug_validate=True)
+    assert result.success, result.validation_errors
+    assert validate_csv_content(result.csv_content) == (True, [])
+
+
+def test_writer_rejects_malformed_rows_as_they_are_encoded():
+    rows = generate_csv_rows(sample_request(), [])
+    rows[2] = rows[2][:-1]
+    rows[5][export_csv_fix.COL_ROW_TYPE] = None
+    rows[6][export_csv_fix.COL_ROW_TYPE] = ""
+    errors = []
+    content = generate_csv_content(rows, errors)
+
+    assert [(e.row_index, e.message) for e in errors] == [
+        (4, "Row 4 has 51 fields, expected 52"),
+        (7, "Row 7 has Row Type None, expected a row type name"),
+        (8, "Row 8 has Row Type '', expected a row type name"),
+    ]
+    assert validate_csv_content(content) == (True, [])  # skipped rows never reach the file
+    assert content.count("\r\n") == 16
+
+
+def test_writer_stringifies_non_str_fields_like_csv_writer():
+    rows = generate_csv_rows(sample_request(), [])
+    rows[0][export_csv_fix.COL_CAMPAIGN_BUDGET] = 125.5
+    rows[1][export_csv_fix.COL_DEFAULT_MAX_CPC] = 2
+    rows[3][export_csv_fix.COL_KEYWORD_MAX_CPC] = None
+    rows[4][export_csv_fix.COL_KEYWORD_MAX_CPC] = 3.5
+    rows[7][export_csv_fix.COL_FINAL_URL] = 1234
+    expected = io.StringIO()
+    expected.write("\ufeff")
+    csv.writer(expected, lineterminator="\r\n").writerows([export_csv_fix.GOOGLE_ADS_EDITOR_HEADERS] + rows)
+
+    for campaign_name in (None, 'Plumbing "Pros", Inc.'):
+        errors = []
+        assert generate_csv_content(rows, errors, campaign_name=campaign_name) == expected.getvalue()
+        assert errors == []
+
+
+def test_validate_csv_content_handles_multiline_fields():
+    rows = generate_csv_rows(sample_request(), [])
+    rows[1][0] = "first line\r\nsecond, line"
+    content = generate_csv_content(rows)
+    assert validate_csv_content(content) == (True, [])
+
+    ok, errors = validate_csv_content(content + 'Keyword,"only, two"\r\n')
+    assert not ok
+    assert [(e.row_index, e.message) for e in errors] == [(20, "Row 20 has 2 fields, expected 52")]
+
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Tests for keyword generation (backend.py)
+Runs against a local stub of the suggest endpoint - no network needed
+
+Run: cd backend && python -m pytest test_keyword_generation.py -q
+"""
+
+import random
+import time
+
+import backend
+from suggest_stub import SuggestStubServer
+
+
+def use_stub(monkeypatch, stub, rate=0):
+    """Point the generator at the stub server with pacing disabled and an empty cache"""
+    monkeypatch.setattr(backend, "SUGGEST_URL", stub.url)
+    monkeypatch.setattr(backend, "suggest_rate_limiter", backend.TokenBucket(rate, 40))
+    monkeypatch.setattr(backend, "autocomplete_cache", backend.AutocompleteCache(ttl=60, max_entries=1000))
+
+
+def test_a_to_z_expansion_fans_out_concurrently(monkeypatch):
+    with SuggestStubServer(delay=0.2) as stub:
+        use_stub(monkeypatch, stub)
+        started = time.monotonic()
+        out = backend.a_to_z_expansion("plumber", concurrency=36)
+        elapsed = time.monotonic() - started
+
+    assert stub.request_count == 36
+    assert stub.max_in_flight > 1
+    assert set(out) == {f"plumber {ch} {n}" for ch in "abcdefghijklmnopqrstuvwxyz0123456789" for n in ("one", "two")}
+    # sequential would be ~36 * 0.2s = 7.2s
+    assert elapsed < 2.0
+
+
+def test_fetch_autocomplete_many_keeps_input_order_and_dedupes(monkeypatch):
+    with SuggestStubServer() as stub:
+        use_stub(monkeypatch, stub)
+        res = backend.fetch_autocomplete_many(["b", "a", "b"], concurrency=4)
+
+    assert list(res) == ["b", "a"]
+    assert res["a"] == ["a one", "a two"]
+    assert stub.request_count == 2
+
+
+def test_per_request_timeout_returns_empty(monkeypatch):
+    with SuggestStubServer(delay=1.0) as stub:
+        use_stub(monkeypatch, stub)
+        started = time.monotonic()
+        assert backend.fetch_google_autocomplete("slow", timeout=0.2) == []
+        assert time.monotonic() - started < 0.9
+
+
+def test_token_bucket_paces_after_burst():
+    bucket = backend.TokenBucket(rate=20, capacity=5)
+    started = time.monotonic()
+    for _ in range(15):
+        bucket.acquire()
+    # 5 immediate, then 10 more at 20/sec
+    assert time.monotonic() - started >= 0.45
+
+
+def test_cache_serves_repeated_queries_without_upstream_calls(monkeypatch):
+    with SuggestStubServer() as stub:
+        use_stub(monkeypatch, stub)
+        first = backend.a_to_z_expansion("roofer", concurrency=8)
+        second = backend.a_to_z_expansion("roofer", concurrency=8)
+        backend.fetch_google_autocomplete("roofer a", geo="GB")
+
+    assert sorted(first) == sorted(second)
+    # 36 for the first expansion, 1 for the different geo, 0 for the repeat
+    assert stub.request_count == 37
+    stats = backend.autocomplete_cache.stats()
+    assert stats["hits"] == 36
+    assert stats["misses"] == 37
+
+
+def test_cache_ttl_and_lru_eviction():
+    cache = backend.AutocompleteCache(ttl=60, max_entries=2)
+    cache.set("a", None, ["a1"])
+    cache.set("b", None, ["b1"])
+    assert cache.get("a") == ["a1"]  # a is now most recently used
+    cache.set("c", None, ["c1"])
+    assert cache.get("b") is None
+    assert cache.get("a") == ["a1"]
+    assert cache.stats()["evictions"] == 1
+
+    expired = backend.AutocompleteCache(ttl=0, max_entries=10)
+    expired.set("a", None, ["a1"])
+    assert expired.get("a") is None
+
+
+def test_disk_tier_is_shared_between_cache_instances(tmp_path):
+    path = str(tmp_path / "suggest.db")
+    writer = backend.AutocompleteCache(ttl=60, max_entries=10, path=path)
+    writer.set("plumber a", "US", ["plumber austin"])
+
+    reader = backend.AutocompleteCache(ttl=60, max_entries=10, path=path)
+    assert reader.get("plumber a", "US") == ["plumber austin"]
+    assert reader.get("plumber a", "GB") is None
+    assert reader.stats()["disk_hits"] == 1
+
+
+def test_session_reuses_keep_alive_connections(monkeypatch):
+    monkeypatch.setattr(backend, "_suggest_session", None)
+    with SuggestStubServer() as stub:
+        use_stub(monkeypatch, stub)
+        for seed in ("electrician", "roofer", "painter"):
+            backend.a_to_z_expansion(seed, concurrency=4)
+
+    assert stub.request_count == 108
+    # one connection per pool slot, not one per request
+    assert stub.connection_count <= 4
+
+
+def test_session_retries_transient_errors(monkeypatch):
+    monkeypatch.setattr(backend, "_suggest_session", None)
+    monkeypatch.setattr(backend, "AUTOCOMPLETE_BACKOFF", 0)
+    with SuggestStubServer(errors=1) as stub:
+        use_stub(monkeypatch, stub)
+        assert backend.fetch_google_autocomplete("hvac") == ["hvac one", "hvac two"]
+
+    assert stub.request_count == 2
+
+
+def test_batch_scorer_matches_heuristic_score():
+    rng = random.Random(7)
+    words = ["plumber", "plumbing", "service", "near", "me", "24/7", "Emergency", "drain",
+             "water-heater", "cost", "best", "ñandú", "a", "", "zzz"]
+    candidates = ["", "a", "plumber service", "PLUMBER  Service", "x" * 250]
+    candidates += [" ".join(rng.choice(words) for _ in range(rng.randint(1, 10))) for _ in range(3000)]
+    candidates += ["plumber service near me"[:n] for n in range(24)] + candidates[:50]  # prefix chains, repeats
+
+    for seed in ("plumber service", "24/7 emergency plumber near me", "a", "", "plumber " * 30):
+        scores = backend.score_keywords(candidates, seed)
+        assert scores == [backend.heuristic_score(c, seed) for c in candidates], seed
+
+
+def test_intent_automaton_matches_pattern_scan():
+    def reference(keyword):
+        k = keyword.lower()
+        tags = [name for name, patterns in backend.INTENT_PATTERNS.items() if any(p in k for p in patterns)]
+        return tags or ["general"]
+
+    samples = ["plumber near me", "Book Appointment Today", "free trial sign up now", "buy cheap hoses",
+               "emergency phone number", "call for a quote", "plumber", "", "signup", "24/7 help desk"]
+    for kw in samples:
+        tags, commercial = backend.classify_keyword(kw)
+        assert tags == reference(kw) == backend.detect_intent(kw), kw
+        assert commercial == any(m in kw.lower() for m in backend.COMMERCIAL_MODIFIERS), kw
+
+
+def test_pattern_automaton_overlapping_patterns():
+    ac = backend.PatternAutomaton([("he", 1), ("she", 2), ("his", 3), ("hers", 4), ("s", 5)])
+    assert ac.scan("ushers") == {1, 2, 4, 5}
+    assert ac.scan("hi") == set()
+    assert ac.search("this") and not ac.search("ha")
+    assert backend.PatternAutomaton([("", "any")]).scan("x") == {"any"}
+
+
+def test_top_k_ranker_matches_full_sort_including_ties():
+    rng = random.Random(3)
+    pairs = [(rng.randint(60, 70), "k" * rng.randint(3, 6) + str(i)) for i in range(5000)]
+    expected = sorted(pairs, key=lambda x: (x[0], -len(x[1])), reverse=True)
+    for k in (0, 1, 50, 4999, 5000, 6000):
+        ranker = backend.TopKRanker(k)
+        ranker.extend(pairs)
+        assert ranker.top() == expected[:k]
+        assert ranker.seen == len(pairs)
+
+
+def test_negative_index_substring_mode_matches_legacy_filter():
+    negatives = ["cheap", "Free ", "job", "diy"]
+    candidates = ["cheap plumber", "plumber jobs", "freelance plumber", "plumber near me", "plumbers", "diyer"]
+    legacy = {k for k in candidates if not any(backend.normalize_kw(n) in k for n in negatives)}
+    assert backend.NegativeKeywordIndex(negatives).filter(candidates) == legacy == {"plumber near me", "plumbers"}
+
+
+def test_negative_index_google_semantics():
+    index = backend.NegativeKeywordIndex(["free", "-repair cost", '"near me"', "[plumber]"], mode="google")
+    assert index.matches("free plumber")
+    assert not index.matches("freelance plumber")              # broad matches whole words only
+    assert index.matches("cost of pipe repair")                # broad: any order
+    assert index.matches("plumber near me now")                # phrase: contiguous, in order
+    assert not index.matches("me near plumber")
+    assert index.matches("plumber")                            # exact
+    assert not index.matches("plumber service")
+
+
+def test_negative_index_is_reused_for_same_list():
+    first = backend.get_negative_index(["job", "free"], "google")
+    assert backend.get_negative_index(["free", "job", "job"], "google") is first
+    assert backend.get_negative_index(["free", "job"], "substring") is not first
+
+
+def test_generate_keywords_core_streams_batches_before_ranking(monkeypatch):
+    with SuggestStubServer() as stub:
+        use_stub(monkeypatch, stub)
+        batches = []
+        streamed = backend.generate_keywords_core("plumber", max_results=50, negative_keywords=["two"],
+                                                  on_batch=batches.append)
+        plain = backend.generate_keywords_core("plumber", max_results=50, negative_keywords=["two"])
+
+    assert streamed == plain
+    assert len(batches) == 37  # direct lookup + 36 A-Z queries, each with new suggestions
+    keywords = [kw for batch in batches for kw in batch["keywords"]]
+    assert len({kw["keyword"] for kw in keywords}) == len(keywords)  # nothing streamed twice
+    assert all("two" not in kw["keyword"] for kw in keywords)
+    assert all(kw["score"] == backend.heuristic_score(kw["keyword"], "plumber") for kw in keywords)
+
+
+def test_batch_generation_matches_per_seed_runs_and_shares_fetches(monkeypatch):
+    with SuggestStubServer() as stub:
+        use_stub(monkeypatch, stub)
+        batch = backend.generate_keywords_batch_core(["plumber", " Plumber", "plumber repair"], max_results=40)
+        batch_requests = stub.request_count
+        singles = {seed: backend.generate_keywords_core(seed, max_results=40) for seed in ("plumber", "plumber repair")}
+
+    assert batch_requests == 74  # 2 distinct seeds x 37 queries; the duplicate seed costs nothing
+    assert batch["seeds"] == singles
+    merged = {r["keyword"]: r for r in batch["merged"]}
+    assert len(merged) == len(batch["merged"])
+    shared = {r["keyword"] for r in singles["plumber"]["results"]} & {r["keyword"] for r in singles["plumber repair"]["results"]}
+    for kw in shared & set(merged):
+        assert merged[kw]["seeds"] == ["plumber", "plumber repair"]
+
+
+def test_deep_expansion_is_best_first_bounded_and_deterministic(monkeypatch):
+    def suggestions(q):
+        return [f"{q} repair", f"{q} emergency near me"] if len(q.split()) < 5 else []
+
+    runs = []
+    for _ in range(2):
+        with SuggestStubServer(suggestions=suggestions) as stub:
+            use_stub(monkeypatch, stub)
+            scorer = backend.SeedScorer("plumber")
+            deep = backend.deep_expansion("plumber", None, scorer, budget=120, max_depth=3, wave_size=2)
+            runs.append((deep, sorted(stub.queries)))
+
+    (deep, queries), (again, queries_again) = runs
+    assert deep == again and queries == queries_again
+    assert deep["requests"] == len(queries) == 120
+    assert len(set(queries)) == len(queries)  # no prefix expanded twice
+    assert deep["expanded"][0] == "plumber"
+    level_one = {backend.normalize_kw(s) for q in backend.seed_queries("plumber") for s in suggestions(q)}
+    best = max(scorer.score(k) for k in level_one)
+    assert scorer.score(deep["expanded"][1]) == best
+
+
+def test_generate_keywords_core_deep_mode_reports_budget(monkeypatch):
+    with SuggestStubServer() as stub:
+        use_stub(monkeypatch, stub)
+        out = backend.generate_keywords_core("plumber", max_results=20, depth="deep", request_budget=80)
+
+    assert stub.request_count == out["counts"]["upstream_requests"] == 80
+    assert out["counts"]["expanded_prefixes"] == 3  # seed + 2 suggestions (37 + 37 + 6 calls)
+
+
+def test_batch_generation_honours_depth_and_include_related(monkeypatch):
+    def suggestions(q):
+        return [f"{q} repair", f"{q} emergency near me"] if len(q.split()) < 5 else []
+
+    with SuggestStubServer(suggestions=suggestions) as stub:
+        use_stub(monkeypatch, stub)
+        seeds = ["plumber", "roofer"]
+        shallow = backend.generate_keywords_batch_core(seeds, max_results=200)
+        deep = backend.generate_keywords_batch_core(seeds, max_results=200, depth="deep", request_budget=80)
+        unrelated = backend.generate_keywords_batch_core(seeds, max_results=200, depth="deep", use_related=False)
+        singles = {seed: backend.generate_keywords_core(seed, max_results=200, depth="deep", request_budget=80)
+                   for seed in seeds}
+
+    assert deep["seeds"] == singles
+    assert deep["seeds"] != shallow["seeds"]
+    assert deep["counts"]["queries"] == 160  # 80 suggest calls per seed
+    assert unrelated["seeds"] == shallow["seeds"]  # deep expansion needs related suggestions
+
+
+def test_chunked_batch_counts_shared_candidates_once(monkeypatch):
+    params = {"max_results": 50}
+    with SuggestStubServer() as stub:
+        use_stub(monkeypatch, stub)
+        whole = backend.generate_keywords_batch_core(["plumber", "plumber a"], **params)
+        chunks = [backend.celery_generate_keywords_chunk([seed], params) for seed in ("plumber", "plumber a")]
+    merged = backend.celery_merge_keyword_chunks(chunks, 50)
+
+    # "plumber a one" etc. are candidates of both seeds
+    assert merged["counts"]["unique_normalized"] == whole["counts"]["unique_normalized"]
+    assert merged["counts"]["unique_normalized"] < sum(c["counts"]["unique_normalized"] for c in chunks)
+    assert merged["counts"]["seeds"] == 2 and merged["counts"]["chunks"] == 2
+    assert "normalized" not in whole and "normalized" not in merged
+
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, "-q"]))